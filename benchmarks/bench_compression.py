@@ -0,0 +1,66 @@
+# ======================================================================
+#  bench_compression.py
+# ======================================================================
+"""
+Benchmark: response compression of callback payloads
+====================================================
+Sends a synthetic IQ‑blob figure (``--qubits`` cells, ``--shots`` ground +
+excited shots each) through a Flask app with ``ResponseCompressor``
+installed – the same ``after_request`` hook as the dashboard – and reports
+response size and compression time per encoding and level, for the
+figure as decimal lists and as ``figure_json`` typed arrays.
+
+Usage :  python benchmarks/bench_compression.py [--qubits 21] [--shots 2000]
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import argparse, sys, time
+from pathlib import Path
+
+import numpy as np
+from flask import Flask, Response
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from bench_figure_json import as_lists, blob_figure, copy_traces, raw_dict   # noqa: E402
+from experiments import figure_json                            # noqa: E402
+from response_compression import ResponseCompressor, brotli   # noqa: E402
+
+
+def serve(payload: str, encoding: str, level: int):
+    app = Flask(__name__)
+    app.add_url_rule("/fig", "fig", lambda: Response(payload, mimetype="application/json"))
+    comp = ResponseCompressor(encoding, level, min_bytes=1400).install(app)
+    return app.test_client(), comp
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--qubits", type=int, default=21)
+    ap.add_argument("--shots", type=int, default=2000)
+    args = ap.parse_args()
+
+    fig = raw_dict(blob_figure(args.qubits, args.shots, np.random.default_rng(0)))
+    payloads = {"lists": as_lists(fig), "typed": figure_json.dumps(copy_traces(fig))}
+    settings = [("gzip", 1), ("gzip", 6)]
+    if brotli is not None:
+        settings += [("br", 1), ("br", 4)]
+    else:
+        print("(brotli not installed – gzip only)")
+    print(f"{args.qubits} qubits × 2 × {args.shots} shots\n")
+    print(f"  {'payload':8s} {'encoding':10s} {'size':>9s} {'ratio':>7s} {'compress':>9s}")
+    for name, payload in payloads.items():
+        print(f"  {name:8s} {'identity':10s} {len(payload) / 1e6:7.2f}MB")
+        for enc, level in settings:
+            client, comp = serve(payload, enc, level)
+            t0 = time.perf_counter()
+            r = client.get("/fig", headers={"Accept-Encoding": enc})
+            assert r.headers.get("Content-Encoding") == enc, r.headers
+            st = comp.stats()
+            print(f"  {'':8s} {f'{enc} {level}':10s} {len(r.data) / 1e6:7.2f}MB "
+                  f"{st['bytes_in'] / st['bytes_out']:6.1f}× {st['seconds'] * 1e3:7.1f}ms"
+                  f"   (request {(time.perf_counter() - t0) * 1e3:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# ======================================================================
+#  bench_figure_json.py
+# ======================================================================
+"""
+Benchmark: figure payloads – decimal lists vs. float64 vs. figure_json
+======================================================================
+Builds a shot‑heavy IQ‑blob view (``--qubits`` cells, ``--shots`` ground +
+excited shots each, drawn with ``GridFigure``) and serialises it three ways
+
+  • lists   : every array as a list of decimal numbers (plotly < 6, or
+              any figure built from ``.tolist()`` data)
+  • float64 : Plotly 6 default – ``to_json_plotly`` of float64 typed arrays
+  • compact : ``experiments/figure_json.dumps`` – float32 / narrowed int
+              typed arrays, ``orjson`` if installed
+
+reporting payload size, encode time and the largest decoded deviation
+relative to each array's span.
+
+Usage :  python benchmarks/bench_figure_json.py [--qubits 8] [--shots 20000]
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import argparse, base64, json, sys, time
+from pathlib import Path
+
+import numpy as np
+from plotly.io.json import to_json_plotly
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from theme import dashboard_dark                           # noqa: E402
+from experiments import figure_json                        # noqa: E402
+from experiments.grid_figure import GridFigure             # noqa: E402
+
+
+def blob_figure(n_q: int, shots: int, rng) -> GridFigure:
+    """Ground / excited IQ clouds per qubit, as the IQ module draws them (no encoding yet)."""
+    n_rows = int(np.ceil(n_q / 2))
+    fig = GridFigure(n_rows, 2, subplot_titles=[f"q{i}" for i in range(n_q)])
+    for i in range(n_q):
+        row, col = i // 2 + 1, i % 2 + 1
+        for state, centre, colour in (("g", (-0.4e-3, 0.1e-3), "blue"), ("e", (0.3e-3, -0.2e-3), "red")):
+            iq = rng.normal(centre, 0.15e-3, size=(shots, 2)) * 1e3        # mV
+            fig.add_trace(dict(type="scattergl", x=iq[:, 0], y=iq[:, 1], mode="markers",
+                               marker=dict(size=2, color=colour), name=state), row=row, col=col)
+    fig.update_layout(height=350 * n_rows, template=dashboard_dark)
+    return fig
+
+
+def raw_dict(fig: GridFigure) -> dict:
+    """``fig.to_dict()`` with the numpy arrays still in place."""
+    saved, figure_json.encode_arrays = figure_json.encode_arrays, lambda obj: obj
+    try:
+        return fig.to_dict()
+    finally:
+        figure_json.encode_arrays = saved
+
+
+def copy_traces(fig: dict) -> dict:
+    return {"data": [dict(t) for t in fig["data"]], "layout": fig["layout"]}
+
+
+def as_lists(fig: dict) -> str:
+    data = [{k: (v.tolist() if isinstance(v, np.ndarray) else v) for k, v in t.items()}
+            for t in fig["data"]]
+    return json.dumps({"data": data, "layout": fig["layout"]})
+
+
+def as_float64(fig: dict) -> str:
+    from _plotly_utils.utils import convert_to_base64
+    fig = copy_traces(fig)
+    convert_to_base64(fig["data"])
+    return to_json_plotly(fig)
+
+
+def as_compact(fig: dict) -> str:
+    return figure_json.dumps(copy_traces(fig))
+
+
+def decoded(payload: str) -> list[np.ndarray]:
+    out = []
+    for t in json.loads(payload)["data"]:
+        for key in ("x", "y"):
+            v = t[key]
+            if isinstance(v, dict):
+                v = np.frombuffer(base64.b64decode(v["bdata"]), dtype="<" + v["dtype"])
+            out.append(np.asarray(v, dtype=float))
+    return out
+
+
+def timed(fn, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--qubits", type=int, default=8)
+    ap.add_argument("--shots", type=int, default=20000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    fig = raw_dict(blob_figure(args.qubits, args.shots, np.random.default_rng(0)))
+    reference = [np.asarray(t[k], dtype=float) for t in fig["data"] for k in ("x", "y")]
+    print(f"{args.qubits} qubits × 2 × {args.shots} shots, JSON engine "
+          f"{figure_json.JSON_ENGINE}, best of {args.repeat}\n")
+    print(f"  {'encoding':8s} {'payload':>10s} {'encode':>9s} {'max error / span':>17s}")
+    base = None
+    for label, fn in (("lists", as_lists), ("float64", as_float64), ("compact", as_compact)):
+        t, payload = timed(lambda: fn(fig), args.repeat)
+        err = max(np.max(np.abs(a - b)) / np.ptp(a) for a, b in zip(reference, decoded(payload)))
+        gain = (f"   ({base[0] / len(payload):.1f}× smaller, {base[1] / t:.1f}× faster than lists)"
+                if base else "")
+        base = base or (len(payload), t)
+        print(f"  {label:8s} {len(payload) / 1e6:8.2f}MB {t * 1e3:7.1f}ms {err:17.1e}{gain}")
+
+
+if __name__ == "__main__":
+    main()
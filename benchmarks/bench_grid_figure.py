@@ -0,0 +1,125 @@
+# ======================================================================
+#  bench_grid_figure.py
+# ======================================================================
+"""
+Benchmark: per‑qubit subplot grids – make_subplots vs. GridFigure
+=================================================================
+Builds the figure every module draws (2 columns, one cell per qubit:
+data + fit trace, a vertical marker line, axis titles on the outer
+cells) for ``--qubits`` qubits
+
+  • graph_objs : ``make_subplots`` + ``add_trace(go.Scatter)`` /
+                 ``add_vline`` / ``update_xaxes`` per cell
+  • GridFigure : ``experiments/grid_figure.py`` (plain dicts)
+
+and times building it and serialising it as Dash does, then checks that
+both payloads are the same figure (arrays compared at float32, which
+GridFigure sends).  Above 64 qubits the graph_objs path
+is timed once (it takes minutes there).
+
+Usage :  python benchmarks/bench_grid_figure.py [--qubits 16 64 256] [--points 200]
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import argparse, base64, json, sys, time
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly import subplots
+from plotly.io.json import to_json_plotly
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from theme import dashboard_dark                           # noqa: E402
+from experiments.grid_figure import GridFigure             # noqa: E402
+
+N_COLS = 2
+
+
+def grid_args(n_q: int) -> dict:
+    n_rows = int(np.ceil(n_q / N_COLS))
+    return dict(rows=n_rows, cols=N_COLS, subplot_titles=[f"q{i}" for i in range(n_q)],
+                vertical_spacing=min(0.03, 0.5 / n_rows), horizontal_spacing=0.07)
+
+
+def build(fig, n_q: int, x, ys, fits, marks, trace):
+    n_rows = int(np.ceil(n_q / N_COLS))
+    for i in range(n_q):
+        row, col = i // N_COLS + 1, i % N_COLS + 1
+        fig.add_trace(trace(type="scatter", x=x, y=ys[i], mode="lines",
+                            line=dict(color="blue", width=1),
+                            name="Data" if i == 0 else None, showlegend=(i == 0)),
+                      row=row, col=col)
+        fig.add_trace(trace(type="scatter", x=x, y=fits[i], mode="lines",
+                            line=dict(color="red", dash="dash", width=1),
+                            name="Fit" if i == 0 else None, showlegend=(i == 0)),
+                      row=row, col=col)
+        fig.add_vline(x=marks[i], line=dict(color="black", dash="dash"), row=row, col=col)
+        if row == n_rows:
+            fig.update_xaxes(title_text="Idle time [ns]", row=row, col=col)
+        if col == 1:
+            fig.update_yaxes(title_text="|IQ| [mV]", row=row, col=col)
+    fig.update_layout(title="Benchmark grid", height=350 * n_rows, template=dashboard_dark,
+                      legend=dict(orientation="h", yanchor="bottom", y=1.02,
+                                  xanchor="right", x=1))
+    return fig
+
+
+def with_graph_objs(n_q, *data):
+    def scatter(type, **kw):
+        return go.Scatter(**kw)
+    return build(subplots.make_subplots(**grid_args(n_q)), n_q, *data, scatter)
+
+
+def with_grid_figure(n_q, *data):
+    return build(GridFigure(**grid_args(n_q)), n_q, *data, dict).to_dict()
+
+
+def as_float32(obj):
+    """Decoded JSON with every typed array as float32 values (GridFigure sends float32)."""
+    if isinstance(obj, dict):
+        if "bdata" in obj:
+            a = np.frombuffer(base64.b64decode(obj["bdata"]), dtype="<" + obj["dtype"])
+            return a.astype(np.float32).tolist()
+        return {k: as_float32(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [as_float32(v) for v in obj]
+    return obj
+
+
+def timed(fn, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--qubits", type=int, nargs="+", default=[16, 64, 256])
+    ap.add_argument("--points", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{args.points} points per trace, best of {args.repeat}\n")
+    print(f"  {'qubits':>6s} {'graph_objs':>11s} {'+ json':>9s} {'GridFigure':>11s} {'+ json':>9s} "
+          f"{'speed‑up':>9s}  same")
+    rng = np.random.default_rng(0)
+    for n_q in args.qubits:
+        x = np.linspace(0, 1e5, args.points)
+        data = (x, rng.normal(size=(n_q, args.points)), rng.normal(size=(n_q, args.points)),
+                rng.uniform(0, 1e5, n_q))
+        t_go, fig_go = timed(lambda: with_graph_objs(n_q, *data), args.repeat if n_q <= 64 else 1)
+        t_go_js, js_go = timed(lambda: to_json_plotly(fig_go), args.repeat)
+        t_gf, fig_gf = timed(lambda: with_grid_figure(n_q, *data), args.repeat)
+        t_gf_js, js_gf = timed(lambda: to_json_plotly(fig_gf), args.repeat)
+        same = as_float32(json.loads(js_go)) == as_float32(json.loads(js_gf))
+        print(f"  {n_q:6d} {t_go * 1e3:9.1f}ms {t_go_js * 1e3:7.1f}ms {t_gf * 1e3:9.1f}ms "
+              f"{t_gf_js * 1e3:7.1f}ms {(t_go + t_go_js) / (t_gf + t_gf_js):8.1f}×  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# ======================================================================
+#  bench_io.py
+# ======================================================================
+"""
+Benchmark: serial vs. concurrent experiment‑file reads
+======================================================
+For one sample run of every experiment type, times the module's
+``load_*_data`` (result cache bypassed) with
+
+  • serial     : ``DATASET_IO_WORKERS = 1`` – files read one after another
+  • concurrent : ``--workers`` I/O threads (``read_files``)
+
+``--latency-ms`` adds an artificial delay to every dataset open and JSON
+read to mimic a network mount, where overlapping the reads pays off most.
+
+Usage :  python benchmarks/bench_io.py [--data data/QPU_Project] [--latency-ms 20] [--repeat 5]
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import argparse, glob, os, sys, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from experiment_classifier import ExperimentClassifier   # noqa: E402
+from experiments import dataset_io                        # noqa: E402
+from experiments.registry import EXPERIMENTS, load_module  # noqa: E402
+
+
+def with_latency(func, seconds: float):
+    def slow(*args, **kwargs):
+        time.sleep(seconds)
+        return func(*args, **kwargs)
+    return slow
+
+
+def loader_of(typ: str):
+    mod = load_module(typ)
+    name = next(n for n in dir(mod) if n.startswith("load_") and n.endswith("_data"))
+    return name, getattr(mod, name).__wrapped__          # bypass @cached_loader
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--data", default=str(ROOT / "data" / "QPU_Project"))
+    ap.add_argument("--latency-ms", type=float, default=20.0)
+    ap.add_argument("--workers", type=int, default=dataset_io.DATASET_IO_WORKERS)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    classify = ExperimentClassifier(EXPERIMENTS)
+    runs = {}
+    for folder in sorted(glob.glob(os.path.join(args.data, "*", "*"))):
+        typ = classify(os.path.basename(folder))
+        if typ is not None and os.path.isdir(folder):
+            runs.setdefault(typ, folder)
+
+    lat = args.latency_ms / 1e3
+    dataset_io.read_json = with_latency(dataset_io.read_json, lat)
+    dataset_io._open_with_engines = with_latency(dataset_io._open_with_engines, lat)
+    print(f"latency {args.latency_ms:g} ms per file, {args.workers} I/O workers\n")
+    print(f"  {'type':<7s} {'loader':<18s} {'serial':>9s} {'concurrent':>11s} {'speed‑up':>9s}")
+    for typ, folder in runs.items():
+        name, load = loader_of(typ)
+        load(folder)                                       # learn engines, import lazily
+        times = []
+        for workers in (1, args.workers):
+            dataset_io.DATASET_IO_WORKERS = workers
+            times.append(best_of(lambda: load(folder), args.repeat))
+        ok = load(folder) is not None
+        print(f"  {typ:<7s} {name:<18s} {times[0] * 1e3:7.1f}ms {times[1] * 1e3:9.1f}ms "
+              f"{times[0] / times[1]:8.2f}×" + ("" if ok else "   (load failed)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# ======================================================================
+#  bench_mmap.py
+# ======================================================================
+"""
+Benchmark: memory‑mapped vs. copied single‑shot arrays
+======================================================
+Writes a synthetic IQ‑blob run (``--qubits`` × ``--shots`` rotated I/Q
+shots for |g⟩ and |e⟩, float64) as netCDF‑3 and netCDF‑4/HDF5, then for
+each format and each mode ( copy : ``DATASET_MMAP=0`` / mmap ) runs, in a
+fresh process,
+
+  • load : ``load_iq_data(folder, "blob")`` (cold, no result cache)
+  • page : indexing the first page of qubits, as ``plotblob`` does
+  • RSS  : resident set size growth after load / after page
+
+Usage :  python benchmarks/bench_mmap.py [--qubits 64] [--shots 100000]
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import argparse, json, os, shutil, subprocess, sys, tempfile, time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def rss_mb() -> float:
+    """Current resident set size [MB] (Linux; NaN elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return float("nan")
+
+
+def write_run(folder: Path, fmt: str, n_q: int, shots: int):
+    import xarray as xr
+    folder.mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    dims = ("qubit", "n_runs")
+    coords = dict(qubit=[f"q{i}" for i in range(n_q)], n_runs=np.arange(shots, dtype=float))
+    per_q = {k: (("qubit",), rng.random(n_q)) for k in
+             ("rus_threshold", "ge_threshold", "readout_fidelity", "gg", "ge", "eg", "ee")}
+    per_q["success"] = (("qubit",), np.ones(n_q, bool))
+    shots_ = {k: (dims, rng.normal(size=(n_q, shots)) * 1e-3)
+              for k in ("Ig_rot", "Qg_rot", "Ie_rot", "Qe_rot")}
+    xr.Dataset({**shots_, **per_q}, coords=coords).to_netcdf(folder / "ds_fit.h5", format=fmt)
+    xr.Dataset(coords=coords).to_netcdf(folder / "ds_raw.h5", format=fmt)
+    for name in ("data.json", "node.json"):
+        (folder / name).write_text("{}")
+
+
+def child(folder: str):
+    """One measurement in a fresh process; prints a JSON line."""
+    from experiments import iq_dashboard as iq
+    from experiments.iq_dashboard import PER_PAGE
+    base = rss_mb()
+    t0 = time.perf_counter()
+    data = iq.load_iq_data(folder, "blob")
+    t_load = time.perf_counter() - t0
+    rss_load = rss_mb() - base
+    t0 = time.perf_counter()
+    page = iq.slice_data_for_page(data, 1)
+    for i in range(min(PER_PAGE, page["n"])):
+        for k in ("Ig", "Qg", "Ie", "Qe"):
+            page[k][i]
+    t_page = time.perf_counter() - t0
+    print(json.dumps(dict(load=t_load, page=t_page, rss_load=rss_load,
+                          rss_page=rss_mb() - base, kind=repr(data["Ig"]))))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--qubits", type=int, default=64)
+    ap.add_argument("--shots", type=int, default=100_000)
+    ap.add_argument("--child")
+    args = ap.parse_args()
+    if args.child:
+        return child(args.child)
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_mmap_"))
+    try:
+        mb = 4 * args.qubits * args.shots * 8 / 2**20
+        print(f"{args.qubits} qubits × {args.shots} shots – {mb:.0f} MB of shots per run\n")
+        print(f"  {'format':<22s} {'mode':<5s} {'load':>9s} {'page':>9s} "
+              f"{'RSS load':>10s} {'RSS page':>10s}")
+        for fmt in ("NETCDF3_64BIT", "NETCDF4"):
+            folder = tmp / fmt
+            write_run(folder, fmt, args.qubits, args.shots)
+            for mode, env in (("copy", "0"), ("mmap", "1")):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--child", str(folder)],
+                    env={**os.environ, "DATASET_MMAP": env, "DATASET_SIDECAR": "0"},
+                    capture_output=True, text=True, check=True).stdout
+                r = json.loads(out.strip().splitlines()[-1])
+                print(f"  {fmt:<22s} {mode:<5s} {r['load'] * 1e3:7.1f}ms {r['page'] * 1e3:7.1f}ms "
+                      f"{r['rss_load']:8.1f}MB {r['rss_page']:8.1f}MB")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# ======================================================================
+#  bench_out_of_core.py
+# ======================================================================
+"""
+Benchmark: rendering an oversized IQ‑blob run in‑memory vs. out‑of‑core
+=======================================================================
+Writes a synthetic run (``--qubits`` × ``--shots``, zlib‑compressed
+netCDF‑4 → cannot be memory‑mapped) and renders the histogram and blob
+views of page 1 in a fresh process per mode
+
+  • in‑memory   : ``DATASET_OUT_OF_CORE_MB`` huge – shots loaded whole
+  • out‑of‑core : ``DATASET_OUT_OF_CORE_MB=0``   – rows read when drawn
+
+reporting wall time and peak resident memory of each process.
+
+Usage :  python benchmarks/bench_out_of_core.py [--qubits 100] [--shots 100000]
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import argparse, json, os, resource, shutil, subprocess, sys, tempfile, time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def write_run(folder: Path, n_q: int, shots: int):
+    import xarray as xr
+    folder.mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    coords = dict(qubit=[f"q{i}" for i in range(n_q)], n_runs=np.arange(shots, dtype=float))
+    data = {k: (("qubit",), rng.random(n_q)) for k in
+            ("rus_threshold", "ge_threshold", "readout_fidelity", "gg", "ge", "eg", "ee")}
+    data["success"] = (("qubit",), np.ones(n_q, bool))
+    for k in ("Ig_rot", "Qg_rot", "Ie_rot", "Qe_rot"):
+        data[k] = (("qubit", "n_runs"), rng.normal(size=(n_q, shots)).astype(np.float64) * 1e-3)
+    enc = {k: dict(zlib=True, complevel=1, chunksizes=(1, shots))
+           for k in ("Ig_rot", "Qg_rot", "Ie_rot", "Qe_rot")}
+    xr.Dataset(data, coords=coords).to_netcdf(folder / "ds_fit.h5", engine="netcdf4",
+                                              encoding=enc)
+    xr.Dataset(coords=coords).to_netcdf(folder / "ds_raw.h5", engine="netcdf4")
+    for name in ("data.json", "node.json"):
+        (folder / name).write_text("{}")
+
+
+def child(folder: str):
+    import plotly.io as pio
+    from plotly.io.json import to_json_plotly
+    from theme import dashboard_dark
+    pio.templates["dashboard_dark"] = dashboard_dark           # the name the modules' figures use
+    from experiments import iq_dashboard as iq
+    out = {}
+    for view in ("hist", "blob"):
+        t0 = time.perf_counter()
+        fig = iq.update_iq_plot(view, 1, {"folder": folder})
+        out[view] = time.perf_counter() - t0
+        out[view + "_kb"] = len(to_json_plotly(fig)) / 1024
+    out["peak_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(out))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--qubits", type=int, default=100)
+    ap.add_argument("--shots", type=int, default=100_000)
+    ap.add_argument("--child")
+    args = ap.parse_args()
+    if args.child:
+        return child(args.child)
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_ooc_"))
+    try:
+        folder = tmp / "run"
+        write_run(folder, args.qubits, args.shots)
+        mb = 4 * args.qubits * args.shots * 8 / 2**20
+        print(f"{args.qubits} qubits × {args.shots} shots – {mb:.0f} MB of shots "
+              f"({os.path.getsize(folder / 'ds_fit.h5') / 2**20:.0f} MB compressed)\n")
+        print(f"  {'mode':<12s} {'hist':>8s} {'blob':>8s} {'hist fig':>10s} {'blob fig':>10s} {'peak RSS':>10s}")
+        for mode, limit in (("in‑memory", "1e9"), ("out‑of‑core", "0")):
+            env = {**os.environ, "DATASET_OUT_OF_CORE_MB": limit, "PYTHONPATH": str(ROOT)}
+            res = subprocess.run([sys.executable, __file__, "--child", str(folder)], env=env,
+                                 capture_output=True, text=True, check=True, cwd=ROOT)
+            r = json.loads(res.stdout.strip().splitlines()[-1])
+            print(f"  {mode:<12s} {r['hist']:7.2f}s {r['blob']:7.2f}s {r['hist_kb']:8.0f}kB "
+                  f"{r['blob_kb']:8.0f}kB {r['peak_mb']:8.0f}MB")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
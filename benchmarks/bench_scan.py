@@ -0,0 +1,146 @@
+# ======================================================================
+#  bench_scan.py
+# ======================================================================
+"""
+Benchmark: experiment‑archive scanning
+======================================
+Builds a synthetic archive (default 40 date folders × 300 runs = 12 000
+experiment folders) and times
+
+  • legacy   : the former serial Path.iterdir / exists / glob walk
+  • scandir  : ExperimentIndex cold scan, 1 thread and N threads
+  • no‑change: ExperimentIndex refresh with nothing modified
+
+``--latency-ms`` adds an artificial delay to every stat/listing call to
+mimic a network mount, where the parallel scan pays off most.
+
+Usage :  python benchmarks/bench_scan.py [--dates 40] [--runs 300] [--latency-ms 0]
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import argparse, os, re, shutil, sys, tempfile, time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from experiment_index import ExperimentIndex          # noqa: E402
+
+TYPES = {
+    "ramsey": ["ramsey"], "t1": ["t1_relax"], "echo": ["t2echo"],
+    "iq": ["iq_blobs"], "prabi": ["power_rabi"], "res": ["resonator"],
+}
+FILES = ("ds_raw.h5", "ds_fit.h5", "data.json", "node.json")
+
+
+def classify(name: str, path: str | None = None):
+    for t, pats in TYPES.items():
+        if any(p in name for p in pats):
+            return t
+    return None
+
+
+def build_archive(root: Path, n_dates: int, n_runs: int):
+    names = [pats[0] for pats in TYPES.values()]
+    run = 0
+    for d in range(n_dates):
+        day = root / f"2025-{1 + d // 28:02d}-{1 + d % 28:02d}"
+        day.mkdir(parents=True)
+        for _ in range(n_runs):
+            run += 1
+            exp = day / f"#{run}_{names[run % len(names)]}_{run % 24:02d}{run % 60:02d}00"
+            exp.mkdir()
+            for f in FILES:
+                (exp / f).touch()
+
+
+def legacy_scan(base_path: str):
+    """The serial walk find_experiments used before the index existed."""
+    exps: dict[str, list] = {}
+    date_re = re.compile(r"^\d{4}[-_]\d{2}[-_]\d{2}$")
+    for dname in [d for d in os.listdir(base_path)
+                  if date_re.match(d) and os.path.isdir(Path(base_path, d))]:
+        y, m, d = map(int, re.split(r"[-_]", dname))
+        for exp_dir in Path(base_path, dname).iterdir():
+            if not exp_dir.is_dir():
+                continue
+            fname = exp_dir.name.lower()
+            if not (all((exp_dir / f).exists() for f in ("ds_raw.h5", "ds_fit.h5"))
+                    and len(list(exp_dir.glob("*.json"))) >= 2):
+                continue
+            typ = classify(fname)
+            if typ is None:
+                continue
+            m_t = re.search(r"(\d{6})$", fname)
+            hh, mm, ss = (int(m_t.group(1)[:2]), int(m_t.group(1)[2:4]),
+                          int(m_t.group(1)[4:])) if m_t else (0, 0, 0)
+            exps.setdefault(typ, []).append(dict(
+                path=str(exp_dir), name=exp_dir.name, date_folder=dname,
+                timestamp=datetime(y, m, d, hh, mm, ss).timestamp()))
+    return exps
+
+
+@contextmanager
+def fs_latency(ms: float):
+    """Delay os.stat / os.scandir / os.listdir by ``ms`` to mimic NFS round trips."""
+    if ms <= 0:
+        yield
+        return
+    originals = {n: getattr(os, n) for n in ("stat", "scandir", "listdir")}
+
+    def slow(fn):
+        def wrapper(*a, **kw):
+            time.sleep(ms / 1e3)
+            return fn(*a, **kw)
+        return wrapper
+
+    for n, fn in originals.items():
+        setattr(os, n, slow(fn))
+    try:
+        yield
+    finally:
+        for n, fn in originals.items():
+            setattr(os, n, fn)
+
+
+def timed(label: str, fn, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    n = sum(len(v) for v in result.values())
+    print(f"  {label:<28s} {best * 1e3:9.1f} ms   ({n} experiments)")
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--dates", type=int, default=40)
+    ap.add_argument("--runs", type=int, default=300, help="runs per date folder")
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    args = ap.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix="bench_scan_"))
+    try:
+        build_archive(root, args.dates, args.runs)
+        print(f"archive: {args.dates} dates × {args.runs} runs "
+              f"= {args.dates * args.runs} folders, latency {args.latency_ms} ms")
+        with fs_latency(args.latency_ms):
+            repeat = 1 if args.latency_ms > 0 else 3
+            timed("legacy serial walk", lambda: legacy_scan(str(root)), repeat)
+            timed("scandir, 1 thread",
+                  lambda: ExperimentIndex(str(root), classify, workers=1).refresh(), repeat)
+            timed(f"scandir, {args.workers} threads",
+                  lambda: ExperimentIndex(str(root), classify, workers=args.workers).refresh(),
+                  repeat)
+            index = ExperimentIndex(str(root), classify, workers=args.workers)
+            index.refresh()
+            timed("no‑change refresh", index.refresh, repeat)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
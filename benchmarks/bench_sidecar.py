@@ -0,0 +1,76 @@
+# ======================================================================
+#  bench_sidecar.py
+# ======================================================================
+"""
+Benchmark: HDF5 / netCDF open vs. .npy sidecar
+==============================================
+Copies the sample runs (default ``data/QPU_Project``) to a temporary
+folder and, for every ``ds_raw.h5`` / ``ds_fit.h5``, times reading all
+variables into memory
+
+  • cold h5 : first open in the process (engine not yet known → fallbacks)
+  • warm h5 : later opens, engine remembered (best of ``--repeat``)
+  • sidecar : Dataset rebuilt from the .npy sidecar (best of ``--repeat``)
+
+Usage :  python benchmarks/bench_sidecar.py [--data data/QPU_Project] [--repeat 5]
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import argparse, glob, os, shutil, sys, tempfile, time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from experiments import dataset_io                      # noqa: E402
+
+
+def read_all(ds):
+    """Copy every variable into memory (touches memory‑mapped pages too)."""
+    for name in ds.variables:
+        np.array(ds[name].values)
+    ds.close()
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--data", default=str(ROOT / "data" / "QPU_Project"))
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_sidecar_"))
+    try:
+        shutil.copytree(args.data, tmp / "data")
+        files = sorted(glob.glob(str(tmp / "data" / "*" / "*" / "ds_*.h5")))
+        print(f"{len(files)} files from {args.data}\n")
+        print(f"  {'file':<52s} {'MB':>6s} {'cold h5':>9s} {'warm h5':>9s} {'sidecar':>9s}")
+        totals = np.zeros(3)
+        for path in files:
+            dataset_io._engine_for.clear()             # forget engines → true first open
+            cold = best_of(lambda: read_all(dataset_io.open_xr_dataset(path, sidecar=False)), 1)
+            warm = best_of(lambda: read_all(dataset_io.open_xr_dataset(path, sidecar=False)),
+                           args.repeat)
+            dataset_io.write_sidecar(path, dataset_io.open_xr_dataset(path, sidecar=False))
+            side = best_of(lambda: read_all(dataset_io.read_sidecar(path)), args.repeat)
+            totals += (cold, warm, side)
+            name = os.path.relpath(path, tmp / "data")
+            print(f"  {name[-52:]:<52s} {os.path.getsize(path) / 2**20:6.2f} "
+                  f"{cold * 1e3:7.1f}ms {warm * 1e3:7.1f}ms {side * 1e3:7.1f}ms")
+        print(f"\n  {'total':<52s} {'':>6s} {totals[0] * 1e3:7.1f}ms "
+              f"{totals[1] * 1e3:7.1f}ms {totals[2] * 1e3:7.1f}ms")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
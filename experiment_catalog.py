@@ -0,0 +1,277 @@
+# ======================================================================
+#  experiment_catalog.py
+# ======================================================================
+"""
+Persistent SQLite catalog of experiments and fit summaries
+==========================================================
+* Mirrors the ExperimentIndex (date‑folder mtimes, experiment records,
+  pending folders) so a restarted dashboard starts from the catalog and
+  only stats the date folders instead of a cold rescan
+* Adds per‑experiment metadata from ``node.json`` and per‑qubit
+  ``fit_results`` from ``data.json`` – read once, when a run first appears
+* Indexed on type, timestamp and qubit → one fast query layer for views
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import json, os, re, sqlite3, threading
+
+SCHEMA_VERSION = 1
+RUN_ID_RE = re.compile(r"^#(\d+)")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS date_dirs (
+    base     TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (base, name)
+);
+CREATE TABLE IF NOT EXISTS experiments (
+    path        TEXT PRIMARY KEY,
+    base        TEXT NOT NULL,
+    date_folder TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    type        TEXT NOT NULL,
+    timestamp   REAL NOT NULL,
+    run_id      INTEGER,
+    node_name   TEXT,
+    description TEXT,
+    run_start   TEXT,
+    run_end     TEXT
+);
+CREATE TABLE IF NOT EXISTS pending (
+    path        TEXT PRIMARY KEY,
+    base        TEXT NOT NULL,
+    date_folder TEXT NOT NULL,
+    mtime_ns    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fit_results (
+    path    TEXT NOT NULL REFERENCES experiments(path) ON DELETE CASCADE,
+    qubit   TEXT NOT NULL,
+    success INTEGER,
+    results TEXT,
+    PRIMARY KEY (path, qubit)
+);
+CREATE INDEX IF NOT EXISTS idx_exp_type      ON experiments(type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_exp_timestamp ON experiments(timestamp);
+CREATE INDEX IF NOT EXISTS idx_exp_date      ON experiments(base, date_folder);
+CREATE INDEX IF NOT EXISTS idx_fit_qubit     ON fit_results(qubit);
+"""
+
+
+# ────────────────────────────────────────────────────────────────────
+# Metadata extraction (data.json / node.json)
+# ────────────────────────────────────────────────────────────────────
+def _read_json(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def read_experiment_metadata(folder: str) -> dict:
+    """node.json metadata + data.json → fit_results of one experiment folder."""
+    node = _read_json(os.path.join(folder, "node.json"))
+    data = _read_json(os.path.join(folder, "data.json"))
+    meta = node.get("metadata", {}) if isinstance(node, dict) else {}
+    fits = data.get("fit_results", {}) if isinstance(data, dict) else {}
+    if not isinstance(fits, dict):
+        fits = {}
+    if not fits:        # no fits → still record which qubits were measured
+        model = node.get("data", {}).get("parameters", {}).get("model", {}) \
+            if isinstance(node, dict) else {}
+        fits = {str(q): {} for q in model.get("qubits") or []}
+    return dict(
+        node_name=meta.get("name"),
+        description=(meta.get("description") or "").strip() or None,
+        run_start=meta.get("run_start"),
+        run_end=meta.get("run_end"),
+        fit_results=fits,
+    )
+
+
+# ────────────────────────────────────────────────────────────────────
+# Catalog
+# ────────────────────────────────────────────────────────────────────
+class ExperimentCatalog:
+    """
+    Thread‑safe wrapper around one SQLite file.
+
+    ``classifier`` is a signature of the type classifier that produced the
+    stored types; when it changes the stored index is dropped and rebuilt.
+    """
+
+    def __init__(self, db_path: str, classifier: str | None = None):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+            row = self._conn.execute("SELECT value FROM meta WHERE key='schema'").fetchone()
+            if row is None or int(row["value"]) != SCHEMA_VERSION:
+                self._reset()
+            row = self._conn.execute("SELECT value FROM meta WHERE key='classifier'").fetchone()
+            if classifier is not None and (row is None or row["value"] != classifier):
+                self._reset()
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('classifier', ?)",
+                                   (classifier,))
+
+    def _reset(self):
+        for table in ("fit_results", "pending", "experiments", "date_dirs"):
+            self._conn.execute(f"DELETE FROM {table}")
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)",
+                           (str(SCHEMA_VERSION),))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ── ExperimentIndex state ────────────────────────────────────────
+    def load_dates(self, base: str) -> dict[str, tuple[int, list, dict]]:
+        """{date_folder: (mtime_ns, [(type, record)], {pending path: mtime_ns})}"""
+        with self._lock:
+            out = {r["name"]: (r["mtime_ns"], [], {}) for r in self._conn.execute(
+                "SELECT name, mtime_ns FROM date_dirs WHERE base=?", (base,))}
+            for r in self._conn.execute(
+                    "SELECT path, name, date_folder, type, timestamp FROM experiments "
+                    "WHERE base=?", (base,)):
+                if r["date_folder"] in out:
+                    out[r["date_folder"]][1].append((r["type"], dict(
+                        path=r["path"], name=r["name"],
+                        date_folder=r["date_folder"], timestamp=r["timestamp"])))
+            for r in self._conn.execute(
+                    "SELECT path, date_folder, mtime_ns FROM pending WHERE base=?", (base,)):
+                if r["date_folder"] in out:
+                    out[r["date_folder"]][2][r["path"]] = r["mtime_ns"]
+        return out
+
+    def save_dates(self, base: str, entries: dict[str, tuple[int, list, dict]],
+                   removed=(), meta: dict[str, dict] | None = None):
+        """
+        Upsert changed date folders.  ``meta`` : {path: ``read_experiment_metadata``}
+        of new runs, read by the caller; runs missing from it are read here,
+        before the transaction – file I/O never happens under the lock.
+        """
+        meta = dict(meta or {})
+        with self._lock:
+            known = {dname: {r["path"]: r["type"] for r in self._conn.execute(
+                         "SELECT path, type FROM experiments WHERE base=? AND date_folder=?",
+                         (base, dname))}
+                     for dname in entries}
+        for dname, (_, records, _) in entries.items():
+            for _, rec in records:
+                if rec["path"] not in known[dname] and rec["path"] not in meta:
+                    meta[rec["path"]] = read_experiment_metadata(rec["path"])
+
+        with self._lock, self._conn:
+            c = self._conn
+            for dname in removed:
+                c.execute("DELETE FROM experiments WHERE base=? AND date_folder=?", (base, dname))
+                c.execute("DELETE FROM pending WHERE base=? AND date_folder=?", (base, dname))
+                c.execute("DELETE FROM date_dirs WHERE base=? AND name=?", (base, dname))
+
+            for dname, (mtime_ns, records, pending) in entries.items():
+                current = {rec["path"] for _, rec in records}
+                c.executemany("DELETE FROM experiments WHERE path=?",
+                              [(p,) for p in known[dname].keys() - current])
+
+                for typ, rec in records:
+                    if rec["path"] in known[dname]:
+                        if known[dname][rec["path"]] != typ:
+                            c.execute("UPDATE experiments SET type=? WHERE path=?",
+                                      (typ, rec["path"]))
+                        continue
+                    self._insert_experiment(base, typ, rec, meta[rec["path"]])
+
+                c.execute("DELETE FROM pending WHERE base=? AND date_folder=?", (base, dname))
+                c.executemany("INSERT OR REPLACE INTO pending VALUES (?, ?, ?, ?)",
+                              [(p, base, dname, m) for p, m in pending.items()])
+                c.execute("INSERT OR REPLACE INTO date_dirs VALUES (?, ?, ?)",
+                          (base, dname, mtime_ns))
+
+    def _insert_experiment(self, base: str, typ: str, rec: dict, meta: dict):
+        m_id = RUN_ID_RE.match(rec["name"])
+        self._conn.execute(
+            "INSERT OR REPLACE INTO experiments VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+            (rec["path"], base, rec["date_folder"], rec["name"], typ, rec["timestamp"],
+             int(m_id.group(1)) if m_id else None,
+             meta["node_name"], meta["description"], meta["run_start"], meta["run_end"]),
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO fit_results VALUES (?, ?, ?, ?)",
+            [(rec["path"], str(q),
+              None if not isinstance(res, dict) or "success" not in res else int(bool(res["success"])),
+              json.dumps(res, default=str))
+             for q, res in meta["fit_results"].items()],
+        )
+
+    # ── Query layer ──────────────────────────────────────────────────
+    def experiments(self, typ: str | None = None, qubit: str | None = None,
+                    since: float | None = None, until: float | None = None,
+                    limit: int | None = None) -> list[dict]:
+        """Experiment rows, newest first, filtered by type / qubit / time range."""
+        sql, args = ["SELECT e.* FROM experiments e"], []
+        where = []
+        if qubit is not None:
+            sql.append("JOIN fit_results f ON f.path = e.path")
+            where.append("f.qubit = ?"); args.append(qubit)
+        if typ is not None:
+            where.append("e.type = ?"); args.append(typ)
+        if since is not None:
+            where.append("e.timestamp >= ?"); args.append(since)
+        if until is not None:
+            where.append("e.timestamp <= ?"); args.append(until)
+        if where:
+            sql.append("WHERE " + " AND ".join(where))
+        sql.append("ORDER BY e.timestamp DESC")
+        if limit is not None:
+            sql.append("LIMIT ?"); args.append(int(limit))
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(" ".join(sql), args)]
+
+    def search(self, base: str, typ: str, terms: list[str], limit: int,
+               date_from: str | None = None, date_to: str | None = None) -> list[dict]:
+        """
+        Experiments of one type whose run id / name, date, HH:MM:SS time or a
+        measured qubit match every term (case‑insensitive), newest first.
+        ``date_from`` / ``date_to`` ('YYYY-MM-DD', inclusive) bound the date folder.
+        """
+        sql = ["SELECT path, name, date_folder, timestamp FROM experiments e "
+               "WHERE e.base = ? AND e.type = ?"]
+        args: list = [base, typ]
+        if date_from:
+            sql.append("AND replace(e.date_folder, '_', '-') >= ?"); args.append(date_from[:10])
+        if date_to:
+            sql.append("AND replace(e.date_folder, '_', '-') <= ?"); args.append(date_to[:10])
+        for term in terms:
+            like = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            sql.append(
+                "AND (e.name LIKE ? ESCAPE '\\' OR e.date_folder LIKE ? ESCAPE '\\' "
+                "OR strftime('%H:%M:%S', e.timestamp, 'unixepoch', 'localtime') LIKE ? ESCAPE '\\' "
+                "OR EXISTS (SELECT 1 FROM fit_results f "
+                "WHERE f.path = e.path AND lower(f.qubit) = ?))")
+            args += [like, like, like, term.lower()]
+        sql.append("ORDER BY e.timestamp DESC LIMIT ?")
+        args.append(int(limit))
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(" ".join(sql), args)]
+
+    def fit_results(self, path: str) -> dict[str, dict]:
+        """{qubit: fit‑result dict} of one experiment (as stored in data.json)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT qubit, results FROM fit_results WHERE path=? ORDER BY rowid",
+                (path,)).fetchall()
+        return {r["qubit"]: json.loads(r["results"]) if r["results"] else {} for r in rows}
+
+    def qubits(self, path: str) -> list[str]:
+        with self._lock:
+            return [r["qubit"] for r in self._conn.execute(
+                "SELECT qubit FROM fit_results WHERE path=? ORDER BY rowid", (path,))]
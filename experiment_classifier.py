@@ -0,0 +1,111 @@
+# ======================================================================
+#  experiment_classifier.py
+# ======================================================================
+"""
+Compiled experiment‑type classifier
+===================================
+* All folder‑name patterns of all experiment types are compiled into one
+  alternation regex → one pass over the name instead of a loop over types
+* Every pattern occurrence is a candidate; the winner is decided by explicit
+  rules, not by dict order:
+    1. type ``priority``            (higher wins, default 0)
+    2. whole‑token match            ("iq" in "iq_blobs" beats "iq" in "unique")
+    3. longer pattern               ("power_rabi" beats "rabi")
+    4. earlier position in the name
+* Short patterns (``SHORT_PATTERN`` characters or fewer: "iq", "t1", "tof",
+  "rpo" …) only count as whole tokens – "unique_thing" is no IQ run
+* Optionally the authoritative node name (``node.json → metadata.name``) is
+  classified first; results are cached per experiment folder
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import hashlib, json, os, re, threading
+
+SHORT_PATTERN = 3       # patterns this short must be a whole token of the name
+
+
+class ExperimentClassifier:
+    """
+    ``classifier(name, path=None)`` → experiment type key or None.
+
+    ``types`` maps a type key to ``{"patterns": [...], "priority": int}``
+    (extra keys are ignored, so ``experiment_modules`` can be passed as is).
+    With ``use_node_json`` the folder's node.json name is tried before the
+    folder name; the answer is then cached per ``path``.
+    """
+
+    def __init__(self, types: dict[str, dict], use_node_json: bool = False):
+        self.use_node_json = use_node_json
+        self._owner: dict[str, tuple[str, int]] = {}          # pattern → (type, priority)
+        for typ, info in types.items():
+            prio = int(info.get("priority", 0))
+            for pat in info["patterns"]:
+                pat = pat.lower()
+                if pat not in self._owner or prio > self._owner[pat][1]:
+                    self._owner[pat] = (typ, prio)
+        # longest first so the alternation prefers the longest pattern at a position;
+        # the look‑ahead makes every start position a candidate (overlaps included)
+        alternation = "|".join(re.escape(p) for p in sorted(self._owner, key=len, reverse=True))
+        self._regex = re.compile(f"(?=({alternation}))") if self._owner else None
+        self._cache: dict[str, str | None] = {}
+        self._lock = threading.Lock()
+        self.signature = hashlib.sha1(json.dumps(
+            [sorted(self._owner.items()), use_node_json, SHORT_PATTERN]).encode()).hexdigest()[:12]
+
+    def __call__(self, name: str, path: str | None = None) -> str | None:
+        if path is not None and self.use_node_json:
+            with self._lock:
+                if path in self._cache:
+                    return self._cache[path]
+            node_name = _node_name(path)
+            typ = self.classify_name(node_name) if node_name else None
+            if typ is None:
+                typ = self.classify_name(name)
+            if node_name is not None:          # node.json not written yet → ask again later
+                with self._lock:
+                    self._cache[path] = typ
+            return typ
+        return self.classify_name(name)
+
+    def classify_name(self, name: str) -> str | None:
+        if self._regex is None:
+            return None
+        name = name.lower()
+        best, best_key = None, None
+        for m in self._regex.finditer(name):
+            pat = m.group(1)
+            start, end = m.start(1), m.start(1) + len(pat)
+            typ, prio = self._owner[pat]
+            whole = (start == 0 or not _is_token_char(name[start - 1])) and \
+                    (end == len(name) or not _is_token_char(name[end]))
+            if not whole and len(pat) <= SHORT_PATTERN:
+                continue
+            key = (prio, whole, len(pat), -start)
+            if best_key is None or key > best_key:
+                best, best_key = typ, key
+        return best
+
+    def candidates(self, name: str) -> list[tuple[str, str]]:
+        """Every (pattern, type) occurring in ``name`` – for debugging."""
+        if self._regex is None:
+            return []
+        return [(m.group(1), self._owner[m.group(1)][0])
+                for m in self._regex.finditer(name.lower())]
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+
+def _is_token_char(c: str) -> bool:
+    return c.isascii() and c.isalnum()
+
+
+def _node_name(folder: str) -> str | None:
+    """``metadata.name`` of ``folder/node.json`` ("" if absent, None if unreadable)."""
+    from experiments.metadata import json_get
+    try:
+        name = json_get(os.path.join(folder, "node.json"), "metadata", "name")
+    except (OSError, ValueError):
+        return None
+    return name if isinstance(name, str) else ""
@@ -0,0 +1,390 @@
+# ======================================================================
+#  experiment_index.py
+# ======================================================================
+"""
+Incremental, mtime‑keyed index of the experiment archive
+========================================================
+* Remembers every date folder's mtime together with the experiments in it
+* A refresh re‑lists only the date folders whose mtime changed
+  → a no‑change poll costs one ``stat`` per date folder, not a tree walk
+* Experiment folders that are still being written (data files missing)
+  are kept as *pending* and re‑checked (by their own mtime) until complete
+* Changed date folders are rescanned with ``os.scandir`` (one listing per
+  folder, DirEntry type info reused) on a bounded thread pool
+* Optionally mirrored to an ExperimentCatalog so the state survives restarts
+* Optional scan ``window``: only the newest N date folders are watched;
+  older ones are loaded on demand (``backfill``) and then kept as cached
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import hashlib, os, re, stat, threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable
+
+from experiment_catalog import read_experiment_metadata
+
+DATE_RE        = re.compile(r"^\d{4}[-_]\d{2}[-_]\d{2}$")
+TIME_RE        = re.compile(r"(\d{6})$")
+REQUIRED_H5    = ("ds_raw.h5", "ds_fit.h5")
+MIN_JSON_FILES = 2
+SCAN_WORKERS   = 8      # threads used to rescan date folders in parallel
+CHANGELOG_LEN  = 256    # index versions for which a delta can still be served
+
+
+def date_key(dname: str) -> str:
+    """YYYY_MM_DD / YYYY-MM-DD → 'YYYY-MM-DD' (sorts chronologically)."""
+    return dname.replace("_", "-")
+
+
+@dataclass
+class _DateEntry:
+    mtime_ns: int
+    records: list[tuple[str, dict]] = field(default_factory=list)   # (type, record)
+    pending: dict[str, int] = field(default_factory=dict)           # exp path → mtime_ns
+    meta: dict[str, dict] = field(default_factory=dict)             # new run path → catalog metadata
+
+
+# ────────────────────────────────────────────────────────────────────
+# Single‑folder helpers
+# ────────────────────────────────────────────────────────────────────
+def _files_complete(exp_path: str) -> bool:
+    """True when ds_raw.h5, ds_fit.h5 and at least two *.json files exist (one scandir)."""
+    h5, n_json = set(), 0
+    with os.scandir(exp_path) as it:
+        for e in it:
+            if e.name in REQUIRED_H5:
+                h5.add(e.name)
+            elif e.name.endswith(".json"):
+                n_json += 1
+    return len(h5) == len(REQUIRED_H5) and n_json >= MIN_JSON_FILES
+
+
+def _digest(snapshot: dict[str, list]) -> str:
+    """Content hash of an index result – equal in every process that sees the same runs."""
+    h = hashlib.blake2b(digest_size=8)
+    for typ in sorted(snapshot):
+        for rec in sorted(snapshot[typ], key=lambda r: r["path"]):
+            h.update(repr((typ, sorted(rec.items()))).encode())
+    return h.hexdigest()
+
+
+def make_record(exp_path: str, name: str, dname: str) -> dict:
+    y, m, d = map(int, re.split(r"[-_]", dname))
+    m_t = TIME_RE.search(name.lower())
+    hh, mm, ss = (
+        int(m_t.group(1)[:2]),
+        int(m_t.group(1)[2:4]),
+        int(m_t.group(1)[4:]),
+    ) if m_t else (0, 0, 0)
+    ts = datetime(y, m, d, hh, mm, ss).timestamp()
+    return dict(path=exp_path, name=name, date_folder=dname, timestamp=ts)
+
+
+# ────────────────────────────────────────────────────────────────────
+# Index
+# ────────────────────────────────────────────────────────────────────
+class ExperimentIndex:
+    """
+    Persistent in‑process index of ``base_path``.
+
+    ``classify(name, path)`` maps an experiment folder (name and full path)
+    to an experiment type key (or None to ignore the folder).
+    ``refresh()`` returns ``{type: [record, …]}`` sorted newest first, the
+    same structure ``find_experiments`` always produced.  ``version`` is
+    bumped every time that result changes and the added / removed records
+    are kept in a short changelog, so clients can be sent deltas
+    (``token`` / ``sync``).  The token is a digest of the result itself, so
+    every worker process indexing the same archive hands out the same one.
+    With a ``catalog`` the first refresh starts from the persisted state and
+    every changed date folder is written back.
+    With a ``window`` only the newest ``window`` date folders are stat'ed and
+    rescanned on refresh.  Older folders enter the index through
+    ``backfill(start, end)`` and are then served from memory / catalog
+    without being stat'ed again (``invalidate`` forces the next backfill to
+    re‑read them).
+    """
+
+    def __init__(self, base_path: str, classify: Callable[[str, str], str | None],
+                 catalog=None, workers: int = SCAN_WORKERS, window: int | None = None):
+        self.base_path = os.path.normpath(base_path)
+        self.classify  = classify
+        self.catalog   = catalog
+        self.workers   = max(1, workers)
+        self.window    = window if window and window > 0 else None
+        self._loaded   = catalog is None
+        self._dates: dict[str, _DateEntry] = {}
+        self._snapshot: dict[str, list] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+        self._digest = _digest({})
+        self._changes: deque = deque(maxlen=CHANGELOG_LEN)   # (version, digest, added, removed)
+
+    # ── public ───────────────────────────────────────────────────────
+    def refresh(self) -> dict[str, list]:
+        with self._lock:
+            if not self._loaded:
+                self._load_catalog()
+            if self._update():
+                snap = self._build_snapshot()
+                if snap != self._snapshot:
+                    self._record_change(self._snapshot, snap)
+                    self._snapshot = snap
+            return {t: list(lst) for t, lst in self._snapshot.items()}
+
+    def backfill(self, start: str | None = None, end: str | None = None) -> int:
+        """
+        Load the date folders between ``start`` and ``end`` ('YYYY-MM-DD',
+        inclusive, None = open) that are not in the index yet.  Returns the
+        number of folders scanned; already loaded dates cost nothing.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load_catalog()
+            lo, hi = (start or "")[:10], (end or "")[:10]
+            to_scan = {}
+            for de in self._list_dates():
+                key = date_key(de.name)
+                if (lo and key < lo) or (hi and key > hi):
+                    continue
+                entry = self._dates.get(de.name)
+                if entry is not None and entry.mtime_ns >= 0:
+                    continue
+                try:
+                    st = de.stat()
+                except OSError:
+                    continue
+                if stat.S_ISDIR(st.st_mode):
+                    to_scan[de.name] = st.st_mtime_ns
+            if not to_scan:
+                return 0
+            scanned = self._scan_many(to_scan)
+            self._dates.update(scanned)
+            self._persist(set(scanned), set())
+            snap = self._build_snapshot()
+            if snap != self._snapshot:
+                self._record_change(self._snapshot, snap)
+                self._snapshot = snap
+            return len(scanned)
+
+    def loaded_dates(self) -> list[str]:
+        """Date folders currently in the index, oldest first."""
+        with self._lock:
+            return sorted(self._dates, key=date_key)
+
+    def snapshot(self) -> tuple[int, dict[str, list]]:
+        """(version, data) of the last refresh – no filesystem access."""
+        with self._lock:
+            return self.version, {t: list(lst) for t, lst in self._snapshot.items()}
+
+    @property
+    def token(self) -> str:
+        """Opaque token handed to clients: digest of the current result."""
+        return self._digest
+
+    def sync(self, token: str | None):
+        """
+        ``(token, data, delta)`` for a client currently at ``token``, taken
+        atomically.  ``delta`` is the net ``(added, removed)`` change – lists
+        of ``(type, record)`` – or None when the client needs the full data
+        (unknown token, a state this process never had, history dropped).
+        """
+        with self._lock:
+            data = {t: list(lst) for t, lst in self._snapshot.items()}
+            return self.token, data, self._changes_since(token)
+
+    def _changes_since(self, token: str | None):
+        if token == self._digest:
+            return [], []
+        version = next((c[0] for c in reversed(self._changes) if c[1] == token), None)
+        if version is None:
+            return None
+        entries = [c for c in self._changes if c[0] > version]
+        if not entries or entries[0][0] != version + 1:
+            return None
+
+        added, removed = {}, {}
+        for _, _, add, rem in entries:
+            for typ, rec in rem:
+                if added.pop(rec["path"], None) is None:
+                    removed[rec["path"]] = (typ, rec)
+            for typ, rec in add:
+                added[rec["path"]] = (typ, rec)
+        return list(added.values()), list(removed.values())
+
+    def invalidate(self, dname: str | None = None):
+        """Force a rescan of one date folder (or all) on the next refresh."""
+        with self._lock:
+            for name, entry in self._dates.items():
+                if dname is None or name == dname:
+                    entry.mtime_ns = -1
+
+    def clear(self):
+        with self._lock:
+            self._dates.clear()
+            self._record_change(self._snapshot, {})
+            self._snapshot = {}
+
+    # ── internals ────────────────────────────────────────────────────
+    def _load_catalog(self):
+        try:
+            stored = self.catalog.load_dates(self.base_path)
+        except Exception as e:
+            print(f"[index] catalog load failed: {e}")
+            stored = {}
+        for dname, (mtime_ns, records, pending) in stored.items():
+            self._dates[dname] = _DateEntry(mtime_ns, records, pending)
+        self._snapshot = self._build_snapshot()
+        self._loaded = True
+
+    def _persist(self, dirty: set[str], removed: set[str]):
+        if self.catalog is None or not (dirty or removed):
+            return
+        entries = {d: (self._dates[d].mtime_ns, self._dates[d].records, self._dates[d].pending)
+                   for d in dirty}
+        meta = {}
+        for d in dirty:
+            meta.update(self._dates[d].meta)
+            self._dates[d].meta = {}
+        try:
+            self.catalog.save_dates(self.base_path, entries, removed, meta)
+        except Exception as e:
+            print(f"[index] catalog write failed: {e}")
+
+    def _list_dates(self) -> list[os.DirEntry]:
+        """Date‑named entries of ``base_path``, newest first (raises OSError)."""
+        with os.scandir(self.base_path) as it:
+            entries = [e for e in it if DATE_RE.match(e.name)]
+        entries.sort(key=lambda e: date_key(e.name), reverse=True)
+        return entries
+
+    def _scan_many(self, to_scan: dict[str, int]) -> dict[str, _DateEntry]:
+        if len(to_scan) > 1 and self.workers > 1:
+            with ThreadPoolExecutor(min(self.workers, len(to_scan))) as pool:
+                return dict(zip(to_scan, pool.map(self._scan_date, to_scan, to_scan.values())))
+        return {d: self._scan_date(d, m) for d, m in to_scan.items()}
+
+    def _update(self) -> bool:
+        """Bring ``_dates`` up to date; return True if anything changed."""
+        try:
+            date_entries = self._list_dates()
+        except OSError:
+            removed = set(self._dates)
+            self._dates.clear()
+            self._persist(set(), removed)
+            return bool(removed)
+
+        listed = {de.name for de in date_entries}
+        live = date_entries[:self.window] if self.window else date_entries
+        dirty, seen, to_scan = set(), set(), {}
+        for de in live:
+            try:
+                st = de.stat()
+            except OSError:
+                continue
+            if not stat.S_ISDIR(st.st_mode):
+                continue
+            seen.add(de.name)
+
+            entry = self._dates.get(de.name)
+            if entry is None or entry.mtime_ns != st.st_mtime_ns:
+                to_scan[de.name] = st.st_mtime_ns
+            elif entry.pending and self._recheck_pending(de.name, entry):
+                dirty.add(de.name)
+
+        scanned = self._scan_many(to_scan)
+        self._dates.update(scanned)
+        dirty.update(scanned)
+
+        # outside the window: keep what is loaded (backfilled / cached) unless deleted
+        older = listed.difference(de.name for de in live)
+        seen.update(d for d in self._dates if d in older)
+        removed = set(self._dates) - seen
+        for gone in removed:
+            del self._dates[gone]
+        self._persist(dirty, removed)
+        return bool(dirty or removed)
+
+    def _classify_dir(self, exp_path: str, name: str, dname: str) -> tuple[str | None, dict | None]:
+        """(type, record) for a complete folder, (type, None) if still incomplete."""
+        typ = self.classify(name, exp_path)
+        if typ is None:
+            return None, None
+        try:
+            complete = _files_complete(exp_path)
+        except OSError:
+            return None, None
+        if not complete:
+            return typ, None
+        return typ, make_record(exp_path, name, dname)
+
+    def _new_run(self, entry: _DateEntry, rec: dict):
+        """Read a new run's node.json / data.json for the catalog (here, not under its lock)."""
+        if self.catalog is not None:
+            entry.meta[rec["path"]] = read_experiment_metadata(rec["path"])
+
+    def _scan_date(self, dname: str, mtime_ns: int) -> _DateEntry:
+        entry = _DateEntry(mtime_ns)
+        old = self._dates.get(dname)
+        known = {rec["path"] for _, rec in old.records} if old else set()
+        try:
+            with os.scandir(os.path.join(self.base_path, dname)) as it:
+                children = [e for e in it if e.is_dir()]
+        except OSError:
+            return entry
+
+        for de in children:
+            typ, rec = self._classify_dir(de.path, de.name, dname)
+            if typ is None:
+                continue
+            if rec is None:
+                try:
+                    entry.pending[de.path] = de.stat().st_mtime_ns
+                except OSError:
+                    pass
+                continue
+            entry.records.append((typ, rec))
+            if rec["path"] not in known:
+                self._new_run(entry, rec)
+        return entry
+
+    def _recheck_pending(self, dname: str, entry: _DateEntry) -> bool:
+        """Re‑examine incomplete folders whose own mtime moved."""
+        changed = False
+        for path, old_mtime in list(entry.pending.items()):
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                del entry.pending[path]
+                continue
+            if mtime == old_mtime:
+                continue
+            typ, rec = self._classify_dir(path, os.path.basename(path), dname)
+            if rec is None:
+                entry.pending[path] = mtime
+                continue
+            del entry.pending[path]
+            entry.records.append((typ, rec))
+            self._new_run(entry, rec)
+            changed = True
+        return changed
+
+    def _record_change(self, old: dict[str, list], new: dict[str, list]):
+        old_recs = {r["path"]: (t, r) for t, lst in old.items() for r in lst}
+        new_recs = {r["path"]: (t, r) for t, lst in new.items() for r in lst}
+        added   = [v for p, v in new_recs.items() if old_recs.get(p) != v]
+        removed = [v for p, v in old_recs.items() if new_recs.get(p) != v]
+        self.version += 1
+        self._digest = _digest(new)
+        self._changes.append((self.version, self._digest, added, removed))
+
+    def _build_snapshot(self) -> dict[str, list]:
+        exps: dict[str, list] = {}
+        for entry in self._dates.values():
+            for typ, rec in entry.records:
+                exps.setdefault(typ, []).append(rec)
+        for typ in exps:
+            exps[typ].sort(key=lambda e: e["timestamp"], reverse=True)
+        return exps
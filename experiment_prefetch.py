@@ -0,0 +1,132 @@
+# ======================================================================
+#  experiment_prefetch.py
+# ======================================================================
+"""
+Speculative background loading of the runs an operator opens next
+=================================================================
+* ``schedule([(type, path), …])`` queues loads (most likely first) on a
+  small pool of background threads → their results land in the dataset
+  cache, so selecting one of them later is a cache hit
+* A new ``schedule`` / ``cancel`` drops every queued load of the previous
+  batch; a load that already started finishes (it cannot be interrupted)
+* Memory budget : the estimated size (``.h5`` bytes on disk) of one batch
+  stays below ``budget_bytes``; runs that do not fit are skipped
+* ``claim(path)`` before loading a run in the foreground: a queued
+  prefetch of it is dropped, a running one is waited for (→ cache hit
+  instead of loading the same files twice)
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import os, threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_size(path: str) -> int:
+    """Bytes of the ``.h5`` files directly in ``path`` (0 if unreadable)."""
+    total = 0
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                if e.name.endswith(".h5") and e.is_file():
+                    total += e.stat().st_size
+    except OSError:
+        pass
+    return total
+
+
+class Prefetcher:
+    """
+    ``load(typ, path)`` runs in the background for scheduled runs.
+
+    ``workers`` threads (default 1, so foreground requests keep the CPU);
+    ``estimate(path)`` → bytes a run will take in the cache.
+    """
+
+    def __init__(self, load, budget_bytes: int, workers: int = 1, estimate=run_size):
+        self.load = load
+        self.budget_bytes = budget_bytes
+        self.estimate = estimate
+        self._pool = ThreadPoolExecutor(max(1, workers), thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._queued: dict[str, object] = {}          # path → Future (not started yet)
+        self._running: dict[str, threading.Event] = {}
+        self.loaded = self.skipped = self.cancelled = self.failed = 0
+
+    def schedule(self, items) -> int:
+        """Replace the queued batch by ``items`` (most likely first); number queued."""
+        budget, batch, skipped = self.budget_bytes, [], 0
+        seen = set()
+        for typ, path in items:
+            if not typ or not path or path in seen:
+                continue
+            seen.add(path)
+            size = self.estimate(path)
+            if size > budget:
+                skipped += 1
+                continue
+            budget -= size
+            batch.append((typ, path))
+        with self._lock:                      # sizes were read without it (disk I/O)
+            self.skipped += skipped
+            self._cancel_queued()
+            self._generation += 1
+            gen = self._generation
+            for typ, path in batch:
+                if path not in self._running:
+                    self._queued[path] = self._pool.submit(self._run, gen, typ, path)
+        return len(batch)
+
+    def cancel(self):
+        with self._lock:
+            self._cancel_queued()
+            self._generation += 1
+
+    def claim(self, path: str, timeout: float = 30.0):
+        """The caller is about to load ``path`` itself (see module doc)."""
+        with self._lock:
+            fut = self._queued.pop(path, None)
+            if fut is not None and fut.cancel():
+                self.cancelled += 1
+            running = self._running.get(path)
+        if running is not None:
+            running.wait(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(queued=len(self._queued), running=len(self._running),
+                        loaded=self.loaded, skipped=self.skipped,
+                        cancelled=self.cancelled, failed=self.failed)
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False)
+
+    # ── internals ────────────────────────────────────────────────────
+    def _cancel_queued(self):
+        """Caller holds ``_lock``."""
+        for fut in self._queued.values():
+            if fut.cancel():
+                self.cancelled += 1
+        self._queued.clear()
+
+    def _run(self, gen: int, typ: str, path: str):
+        with self._lock:
+            if gen != self._generation or self._queued.pop(path, None) is None:
+                self.cancelled += 1                   # superseded while queued
+                return
+            done = self._running[path] = threading.Event()
+        ok = False
+        try:
+            self.load(typ, path)
+            ok = True
+        except Exception as e:
+            print(f"[prefetch] {path}: {e}")
+        finally:
+            with self._lock:
+                del self._running[path]
+                if ok:
+                    self.loaded += 1
+                else:
+                    self.failed += 1
+            done.set()
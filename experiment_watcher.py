@@ -0,0 +1,106 @@
+# ======================================================================
+#  experiment_watcher.py
+# ======================================================================
+"""
+Server‑side watcher that keeps one shared ExperimentIndex up to date
+===================================================================
+* ``inotify`` backend : filesystem events via *watchdog* (optional package)
+* ``poll``    backend : one background thread refreshing every few seconds
+* Browser polls then only compare the index version – O(1) per client,
+  independent of archive size and of how many dashboards are open
+--------------------------------------------------------------------
+Backends : "auto" (inotify if watchdog is installed, else poll), "inotify", "poll"
+"""
+from __future__ import annotations
+import os, threading, time
+
+from experiment_index import ExperimentIndex, REQUIRED_H5
+
+try:                                    # optional: pip install watchdog
+    from watchdog.observers import Observer
+except ImportError:                     # pragma: no cover
+    Observer = None
+
+POLL_INTERVAL   = 5.0     # [s] refresh period of the polling backend
+SAFETY_INTERVAL = 60.0    # [s] periodic refresh even with inotify (missed events, NFS)
+DEBOUNCE        = 0.5     # [s] coalesce bursts of events into one refresh
+EVENT_TYPES     = ("created", "moved", "deleted", "closed")
+
+
+class _EventHandler:
+    """Minimal watchdog handler: wake the refresher on relevant events."""
+
+    def __init__(self, wake: threading.Event):
+        self._wake = wake
+
+    def dispatch(self, event):
+        if event.event_type not in EVENT_TYPES:
+            return
+        paths = (event.src_path, getattr(event, "dest_path", "") or "")
+        if event.is_directory or any(
+            os.path.basename(p) in REQUIRED_H5 or p.endswith(".json") for p in paths if p
+        ):
+            self._wake.set()
+
+
+class ExperimentWatcher:
+    """Refresh ``index`` in the background; ``snapshot()`` never touches the disk."""
+
+    def __init__(self, index: ExperimentIndex, backend: str = "auto",
+                 interval: float = POLL_INTERVAL):
+        if backend not in ("auto", "inotify", "poll"):
+            raise ValueError(f"unknown watcher backend: {backend!r}")
+        self.index    = index
+        self.interval = interval
+        self.backend  = "inotify" if backend != "poll" and Observer is not None else "poll"
+        if backend == "inotify" and self.backend != "inotify":
+            print("[watcher] watchdog not installed – falling back to polling")
+        self._wake     = threading.Event()
+        self._stop     = threading.Event()
+        self._thread   = None
+        self._observer = None
+
+    # ── lifecycle ────────────────────────────────────────────────────
+    def start(self):
+        if self._thread is not None:
+            return
+        self.index.refresh()
+        if self.backend == "inotify":
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_EventHandler(self._wake),
+                                        self.index.base_path, recursive=True)
+                self._observer.start()
+            except OSError as e:                # missing path, inotify limits …
+                print(f"[watcher] inotify unavailable ({e}) – falling back to polling")
+                self._observer, self.backend = None, "poll"
+        self._thread = threading.Thread(target=self._run, name="experiment-watcher",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        if self._thread is not None:
+            self._thread.join()
+
+    # ── queries ──────────────────────────────────────────────────────
+    def snapshot(self) -> tuple[int, dict[str, list]]:
+        return self.index.snapshot()
+
+    # ── worker ───────────────────────────────────────────────────────
+    def _run(self):
+        timeout = self.interval if self.backend == "poll" else SAFETY_INTERVAL
+        while not self._stop.is_set():
+            if self._wake.wait(timeout):
+                time.sleep(DEBOUNCE)
+                self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.index.refresh()
+            except Exception as e:              # keep the thread alive
+                print(f"[watcher] refresh failed: {e}")
@@ -0,0 +1,58 @@
+# ======================================================================
+#  chunked.py
+# ======================================================================
+"""
+Streaming reductions over (qubit × shot) arrays
+===============================================
+* Works on anything indexable like ``a[i, start:stop]`` – ndarrays,
+  memory‑mapped / lazily read ``ScaledArray``s – and reads at most
+  ``CHUNK_BYTES`` per step, so peak memory does not grow with shot count
+* ``minmax``    : min / max over the given rows (axis ranges, bin edges)
+* ``histogram`` : counts of one row in fixed bins
+* ``thin_step`` : k such that every k‑th element of a row is at most
+  ``max_points`` (scatter plots of out‑of‑core runs – the browser cannot
+  draw millions of markers anyway)
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import math
+
+import numpy as np
+
+CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def _step(arr) -> int:
+    return max(1, CHUNK_BYTES // max(1, np.dtype(arr.dtype).itemsize))
+
+
+def row_chunks(arr, i: int):
+    """Consecutive pieces of row ``i`` as ndarrays, ≤ ``CHUNK_BYTES`` each."""
+    n, step = arr.shape[-1], _step(arr)
+    for start in range(0, n, step):
+        yield np.asarray(arr[i, start:start + step])
+
+
+def minmax(*arrays, rows=None) -> tuple[float, float]:
+    """(min, max) over ``rows`` (default all) of every array; NaNs ignored."""
+    lo, hi = math.inf, -math.inf
+    for arr in arrays:
+        for i in (range(arr.shape[0]) if rows is None else rows):
+            for chunk in row_chunks(arr, i):
+                if chunk.size:
+                    lo = min(lo, float(np.nanmin(chunk)))
+                    hi = max(hi, float(np.nanmax(chunk)))
+    return lo, hi
+
+
+def histogram(arr, i: int, edges: np.ndarray) -> np.ndarray:
+    """``np.histogram(arr[i], edges)[0]``, one chunk at a time."""
+    counts = np.zeros(len(edges) - 1, dtype=np.int64)
+    for chunk in row_chunks(arr, i):
+        counts += np.histogram(chunk, edges)[0]
+    return counts
+
+
+def thin_step(arr, max_points: int) -> int:
+    """Smallest k such that every k‑th element of a row is ≤ ``max_points`` elements."""
+    return max(1, math.ceil(arr.shape[-1] / max_points))
@@ -0,0 +1,110 @@
+# ======================================================================
+#  client_views.py
+# ======================================================================
+"""
+View switching in the browser for figures already sent
+======================================================
+* Opt‑in : ``CLIENTSIDE_VIEWS=1`` (env).  Off → every view change is a
+  server callback as before
+* A module whose callback in ``registry.py`` has ``client_views=dict(
+  store="<type>-views", views=[…])`` puts the figures of those (cheap)
+  views into a ``dcc.Store`` of its layout – ``views_store(…)``, compact
+  typed arrays – and a clientside callback (``SWITCH_VIEW``) copies the
+  selected one into the graph: no request, no reload, no rebuild
+  (``views`` omitted → every view the layout offers).  The graph starts
+  empty (``initial_figure``) and is drawn from the bundle as well
+* Views left out (e.g. the IQ shot histogram and scatter) still come from
+  the server: ``SWITCH_VIEW`` writes them into a second store
+  (``<store>-request``) that triggers ``switch_view``; the view itself is
+  only ``State`` there, so switching between bundled views never sends a
+  request.  Other inputs of the callback (e.g. the page) re‑send the
+  bundle together with the figure of a server view
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import os
+
+from dash import ctx, dcc, no_update
+
+CLIENTSIDE_VIEWS = os.environ.get("CLIENTSIDE_VIEWS", "0").lower() in ("1", "true", "yes", "on")
+
+# (selected view, {view: figure}) → [figure of that view, no request]
+# or [graph left alone, request the view from the server]
+SWITCH_VIEW = """
+function(view, figures) {
+    var no_update = window.dash_clientside.no_update;
+    if (figures && Object.prototype.hasOwnProperty.call(figures, view)) {
+        return [figures[view], no_update];
+    }
+    return [no_update, view];
+}
+"""
+
+
+def request_store(spec: dict) -> str:
+    """Component type of the store through which server views are requested."""
+    return spec["store"] + "-request"
+
+
+def client_spec(typ: str) -> dict | None:
+    """``client_views`` of ``typ``'s callback, or None (not declared / mode off)."""
+    if not CLIENTSIDE_VIEWS:
+        return None
+    from experiments.registry import EXPERIMENTS
+    for spec in EXPERIMENTS[typ]["callbacks"]:
+        if "client_views" in spec:
+            return spec["client_views"]
+    return None
+
+
+def render_views(update, views, *args) -> dict:
+    """``{view: figure dict}`` of ``update(view, *args)`` for every view."""
+    from experiments.figure_json import figure_dict
+    return {v: figure_dict(update(v, *args)) for v in views}
+
+
+def bundled(spec: dict, offered) -> list:
+    """Views of ``offered`` (the layout's choices) that go to the browser."""
+    cheap = spec.get("views")
+    return [v for v in offered if cheap is None or v in cheap]
+
+
+def initial_figure(typ: str, update, view, *args):
+    """
+    The layout's first figure: ``update(view, *args)``, or an empty one if
+    ``view`` goes to the browser in the bundle anyway (the clientside
+    callback draws it on insertion – the figure is not sent twice).
+    """
+    spec = client_spec(typ)
+    if spec is not None and view in bundled(spec, [view]):
+        return {}
+    return update(view, *args)
+
+
+def views_store(typ: str, uid: str, update, offered, *args) -> list:
+    """
+    ``[dcc.Store, dcc.Store]`` holding the figures of ``typ``'s client views
+    and the server view requests, ``[]`` if the mode is off – for a
+    layout's children: ``*views_store(…)``.
+    """
+    spec = client_spec(typ)
+    if spec is None:
+        return []
+    return [dcc.Store(id={"type": spec["store"], "index": uid},
+                      data=render_views(update, bundled(spec, offered), *args)),
+            dcc.Store(id={"type": request_store(spec), "index": uid})]
+
+
+def switch_view(update, requested: str, cheap, view, *args):
+    """
+    Server side of a callback with client views → (figure, bundle) for
+    ``update(view, *args)``.  A request from the browser (the ``requested``
+    store) only draws that server view; any other input (page …) re‑renders
+    the bundle and, if one is shown, the server view.
+    """
+    server_view = view not in cheap
+    trigger = ctx.triggered_id
+    if isinstance(trigger, dict) and trigger.get("type") == requested:
+        return (update(view, *args) if server_view else no_update), no_update
+    figure = update(view, *args) if server_view else no_update
+    return figure, render_views(update, cheap, *args)
@@ -0,0 +1,168 @@
+# ======================================================================
+#  data_cache.py
+# ======================================================================
+"""
+Process‑wide, byte‑bounded LRU cache for the ``load_*_data`` functions
+======================================================================
+* ``@cached_loader`` wraps a module loader ``load_x_data(folder, …)``
+* Key   : (loader, folder, other arguments with defaults filled in,
+          signature of the folder's files)
+          signature = (name, mtime_ns, size) of every file in the folder
+          → a rewritten / replaced file is a miss, no explicit invalidation
+* Value : the loader's dict with every xarray Dataset fully loaded and its
+          file closed → a hit does no file I/O beyond one ``scandir``
+* Bound : ``DATASET_CACHE_MB`` (env, default 512), least recently used first
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import functools, inspect, os, sys, threading
+from collections import OrderedDict
+
+import numpy as np
+import xarray as xr
+
+from experiments.mapped_arrays import ScaledArray
+
+DATASET_CACHE_MB = float(os.environ.get("DATASET_CACHE_MB", "512"))
+
+
+def folder_signature(folder: str) -> tuple:
+    """(name, mtime_ns, size) of every regular file directly in ``folder``."""
+    sig = []
+    try:
+        with os.scandir(folder) as it:
+            for e in it:
+                if e.is_file():
+                    st = e.stat()
+                    sig.append((e.name, st.st_mtime_ns, st.st_size))
+    except OSError:
+        return ()
+    return tuple(sorted(sig))
+
+
+def _materialize(value):
+    """Load xarray objects into memory and release their files (in place for dicts)."""
+    if isinstance(value, (xr.Dataset, xr.DataArray)):
+        value.load()
+        value.close()
+    elif isinstance(value, dict):
+        for v in value.values():
+            _materialize(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _materialize(v)
+    return value
+
+
+def estimate_nbytes(value, _seen=None) -> int:
+    """
+    Rough in‑memory size of a loader result (arrays counted exactly).
+    Memory‑mapped arrays count at full size too, which also bounds the
+    number of files kept mapped by cached results; out‑of‑core (lazy)
+    arrays count as nothing.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, ScaledArray):
+        return value.resident_nbytes
+    if isinstance(value, (xr.Dataset, xr.DataArray, np.ndarray)):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_nbytes(k, _seen) + estimate_nbytes(v, _seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v, _seen) for v in value)
+    return sys.getsizeof(value)
+
+
+class DatasetCache:
+    """Thread‑safe LRU mapping bounded by the estimated bytes of its values."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: OrderedDict = OrderedDict()       # key → (value, nbytes)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value, nbytes: int):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if nbytes > self.max_bytes:            # would evict everything – don't keep it
+                return
+            self._items[key] = (value, nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes:
+                _, (_, n) = self._items.popitem(last=False)
+                self.bytes -= n
+                self.evictions += 1
+
+    def discard(self, predicate):
+        """Drop every entry whose key satisfies ``predicate``."""
+        with self._lock:
+            for key in [k for k in self._items if predicate(k)]:
+                self.bytes -= self._items.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(entries=len(self._items), bytes=self.bytes, max_bytes=self.max_bytes,
+                        hits=self.hits, misses=self.misses, evictions=self.evictions)
+
+
+dataset_cache = DatasetCache(int(DATASET_CACHE_MB * 1024 * 1024))
+
+
+def cached_loader(func):
+    """
+    Cache ``func(folder, *args, **kwargs)`` in ``dataset_cache``.
+
+    ``None`` results (missing files, load errors) are not cached.  Callers
+    get a shallow copy of the cached dict, so adding / replacing keys is
+    safe; arrays are shared and must be treated as read‑only.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    params = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(folder, *args, **kwargs):
+        folder = os.path.normpath(str(folder))
+        sig = folder_signature(folder)
+        # defaults filled in → load(f), load(f, "conf") and load(f, view="conf") share a key
+        bound = params.bind(folder, *args, **kwargs)
+        bound.apply_defaults()
+        key = (name, folder, tuple(bound.arguments.items())[1:], sig)
+        hit = dataset_cache.get(key)
+        if hit is not None:
+            return dict(hit) if isinstance(hit, dict) else hit
+
+        result = func(folder, *args, **kwargs)
+        if result is None:
+            return None
+        _materialize(result)
+        # results for older versions of these files can never hit again
+        dataset_cache.discard(lambda k: k[0] == name and k[1] == folder and k[3] != sig)
+        dataset_cache.put(key, result, estimate_nbytes(result))
+        return dict(result) if isinstance(result, dict) else result
+
+    wrapper.cache = dataset_cache
+    return wrapper
@@ -0,0 +1,383 @@
+# ======================================================================
+#  dataset_io.py
+# ======================================================================
+"""
+Shared ``open_xr_dataset`` for all experiment modules
+=====================================================
+* Files are grouped by their format signature (first 8 bytes: HDF5,
+  NetCDF‑3 …); the engine that opened one file of a format is tried first
+  for every later file of that format → no failed parse per open
+* Unknown formats fall back to trying ``ENGINES`` in order, as before
+* ``opener_stats()`` : opens / failures / total open time per engine
+* Handle pool: at most ``DATASET_MAX_OPEN`` (env, default 32) datasets
+  opened here stay open; beyond that the least recently opened one that
+  nobody holds is closed.  The opener holds a dataset until it closes it
+  (or ``release``s it to keep it for later); other readers take a
+  ``lease`` – a dataset in use is never closed under a reader
+* ``load_xr_dataset`` : open → read everything → close, for loaders that
+  keep whole datasets
+* ``read_files`` : the files of one experiment (ds_raw.h5, ds_fit.h5,
+  data.json, node.json …) read concurrently on a small I/O thread pool
+  (``DATASET_IO_WORKERS``, default 4) → on network storage the per‑file
+  latencies overlap instead of adding up
+* Optional *sidecar* (``DATASET_SIDECAR=1``): the first open of a file
+  queues a background write (one thread, its own handle – the request
+  reads only what it draws) of every variable as a raw ``.npy`` plus a
+  JSON manifest to ``<folder>/.sidecar/<file name>/``; later opens
+  rebuild the Dataset from
+  the ``.npy`` files (large ones memory‑mapped) as long as the source
+  mtime / size match.  Variables of ``OUT_OF_CORE_BYTES`` or more are
+  copied in slices (``SIDECAR_CHUNK_BYTES``), never read whole
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import contextlib, json, logging, os, shutil, threading, time, uuid, weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import xarray as xr
+
+from experiments.mapped_arrays import MMAP_MIN_BYTES, OUT_OF_CORE_BYTES
+
+ENGINES = ("h5netcdf", "netcdf4", None)     # None → xarray's own guess
+DATASET_SIDECAR = os.environ.get("DATASET_SIDECAR", "0").lower() in ("1", "true", "yes", "on")
+SIDECAR_DIR     = ".sidecar"                # per experiment folder
+SIDECAR_VERSION = 1
+SIDECAR_CHUNK_BYTES = 64 * 1024 * 1024      # slice size when copying out‑of‑core variables
+DATASET_MAX_OPEN = int(os.environ.get("DATASET_MAX_OPEN", "32"))
+DATASET_IO_WORKERS = int(os.environ.get("DATASET_IO_WORKERS", "4"))     # ≤ 1 → serial
+
+_engine_for: dict[bytes, str | None] = {}   # format signature → engine that worked
+_stats: dict[str, dict] = {}
+_lock = threading.Lock()
+_open_lru: "OrderedDict[int, list]" = OrderedDict()    # id(ds) → [dataset ref, holders], oldest first
+_pool_closed = 0                            # datasets closed to stay under DATASET_MAX_OPEN
+_io_pool: ThreadPoolExecutor | None = None
+_IO_THREAD = "dataset-io"
+_sidecar_pool: ThreadPoolExecutor | None = None
+_sidecar_queued: set[str] = set()           # source paths with a pending sidecar write
+log = logging.getLogger(__name__)
+
+
+def file_signature(path) -> bytes:
+    """Format magic of ``path`` (b"" if unreadable)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(8)
+    except OSError:
+        return b""
+
+
+def _record(engine, ok: bool, seconds: float):
+    with _lock:
+        s = _stats.setdefault(str(engine), dict(opens=0, failures=0, seconds=0.0))
+        s["opens" if ok else "failures"] += 1
+        s["seconds"] += seconds
+
+
+def open_xr_dataset(path, engines=ENGINES, sidecar: bool | None = None):
+    """
+    ``xr.open_dataset`` with the engine remembered for this file format.
+    Raises the last error when every engine fails.
+    With ``sidecar`` (default ``DATASET_SIDECAR``) a fresh sidecar is used
+    instead of the file, and written after the first successful open.
+    """
+    if sidecar is None:
+        sidecar = DATASET_SIDECAR
+    if sidecar:
+        t0 = time.perf_counter()
+        ds = read_sidecar(path)
+        if ds is not None:
+            _record("sidecar", True, time.perf_counter() - t0)
+            ds.set_close(lambda: None)      # counted in the pool; the maps go with the arrays
+            _track(ds)
+            return ds
+
+    ds = _open_with_engines(path, engines)
+    _track(ds)
+    if sidecar:
+        _queue_sidecar(path, engines)
+    return ds
+
+
+def load_xr_dataset(path, engines=ENGINES, sidecar: bool | None = None) -> xr.Dataset:
+    """``open_xr_dataset`` fully read into memory; the file is closed on return."""
+    with open_xr_dataset(path, engines, sidecar) as ds:
+        return ds.load()
+
+
+def _open_with_engines(path, engines):
+    sig = file_signature(path)
+    with _lock:
+        known = _engine_for.get(sig, "unknown")
+    order = list(engines)
+    if known != "unknown" and known in order:
+        order.remove(known)
+        order.insert(0, known)
+
+    last_err = None
+    for eng in order:
+        t0 = time.perf_counter()
+        try:
+            ds = xr.open_dataset(path, engine=eng)
+        except Exception as e:
+            _record(eng, False, time.perf_counter() - t0)
+            last_err = e
+            continue
+        _record(eng, True, time.perf_counter() - t0)
+        if sig and known != eng:
+            with _lock:
+                _engine_for[sig] = eng
+        return ds
+    raise last_err
+
+
+# ────────────────────────────────────────────────────────────────────
+# Concurrent reads of one experiment's files
+# ────────────────────────────────────────────────────────────────────
+def read_json(path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_files(*paths, lazy: bool = False) -> list:
+    """
+    Read every path concurrently; results in argument order.
+
+    ``.json`` → parsed JSON; anything else → ``load_xr_dataset`` (or, with
+    ``lazy``, ``open_xr_dataset`` – the caller then closes the datasets).
+    The first error (in argument order) is raised after all reads ended;
+    datasets opened by the other reads are closed first.
+    """
+    def reader(path):
+        if os.fspath(path).endswith(".json"):
+            return read_json
+        return open_xr_dataset if lazy else load_xr_dataset
+    return run_concurrently([(reader(p), p) for p in paths])
+
+
+def run_concurrently(calls) -> list:
+    """``[func(arg) for func, arg in calls]``, run on the I/O thread pool."""
+    global _io_pool
+    calls = list(calls)
+    nested = threading.current_thread().name.startswith(_IO_THREAD)
+    if DATASET_IO_WORKERS <= 1 or len(calls) <= 1 or nested:   # nested → no pool deadlock
+        return [func(arg) for func, arg in calls]
+    with _lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(DATASET_IO_WORKERS, thread_name_prefix=_IO_THREAD)
+    futures = [_io_pool.submit(func, arg) for func, arg in calls]
+    results, error = [], None
+    for fut in futures:
+        try:
+            results.append(fut.result())
+        except Exception as e:
+            results.append(None)
+            error = error or e
+    if error is not None:
+        for r in results:
+            if isinstance(r, xr.Dataset):
+                r.close()
+        raise error
+    return results
+
+
+def opener_stats() -> dict:
+    """
+    {engine: {opens, failures, seconds}}, the learned format → engine map
+    and the handle pool (datasets open now / limit / closed by the pool).
+    """
+    with _lock:
+        _prune()
+        return dict(engines={k: dict(v) for k, v in _stats.items()},
+                    formats={sig.hex(): eng for sig, eng in _engine_for.items()},
+                    handles=dict(open=len(_open_lru), max_open=DATASET_MAX_OPEN,
+                                 held=sum(1 for _, n in _open_lru.values() if n),
+                                 closed=_pool_closed))
+
+
+# ────────────────────────────────────────────────────────────────────
+# Handle pool
+# ────────────────────────────────────────────────────────────────────
+def _is_open(ds) -> bool:
+    return ds is not None and getattr(ds, "_close", None) is not None
+
+
+def _prune():
+    """Forget collected / closed datasets (caller holds ``_lock``)."""
+    for key in [k for k, (ref, _) in _open_lru.items() if not _is_open(ref())]:
+        del _open_lru[key]
+
+
+def _hold(ds, n: int):
+    with _lock:
+        entry = _open_lru.get(id(ds))
+        if entry is not None and entry[0]() is ds:
+            entry[1] = max(0, entry[1] + n)
+
+
+def release(ds: xr.Dataset):
+    """The opener keeps ``ds`` (e.g. cached) but is not reading it: the pool may close it."""
+    _hold(ds, -1)
+
+
+@contextlib.contextmanager
+def lease(ds: xr.Dataset):
+    """Hold ``ds`` open while reading it from another thread than its opener."""
+    _hold(ds, 1)
+    try:
+        yield ds
+    finally:
+        _hold(ds, -1)
+
+
+def _track(ds: xr.Dataset):
+    """Register a freshly opened dataset (held by its opener); close idle ones beyond the limit."""
+    global _pool_closed
+    evict = []
+    with _lock:
+        _open_lru[id(ds)] = [weakref.ref(ds), 1]
+        if len(_open_lru) > DATASET_MAX_OPEN:
+            _prune()
+        excess = len(_open_lru) - DATASET_MAX_OPEN
+        for key, (ref, holders) in list(_open_lru.items()):
+            if excess <= 0:
+                break
+            if not holders:                 # held datasets stay open, the limit is exceeded
+                del _open_lru[key]
+                evict.append(ref())
+                excess -= 1
+        _pool_closed += sum(1 for old in evict if old is not None)
+    for old in evict:
+        if old is not None:
+            old.close()
+
+
+# ────────────────────────────────────────────────────────────────────
+# Sidecar: raw .npy arrays + JSON manifest
+# ────────────────────────────────────────────────────────────────────
+def sidecar_path(path) -> str:
+    path = os.fspath(path)
+    return os.path.join(os.path.dirname(path), SIDECAR_DIR, os.path.basename(path))
+
+
+def _source_key(path) -> dict | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return dict(mtime_ns=st.st_mtime_ns, size=st.st_size)
+
+
+def _jsonable(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def read_sidecar(path) -> xr.Dataset | None:
+    """Dataset rebuilt from a sidecar that matches ``path``'s mtime / size, else None."""
+    root = sidecar_path(path)
+    try:
+        with open(os.path.join(root, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != SIDECAR_VERSION or manifest.get("source") != _source_key(path):
+        return None
+    try:
+        def var(entry):
+            fname = os.path.join(root, entry["file"])
+            # only large arrays are mapped: every mapping holds a file descriptor
+            mode = "r" if os.path.getsize(fname) >= MMAP_MIN_BYTES else None
+            data = np.load(fname, mmap_mode=mode, allow_pickle=False)
+            return xr.Variable(entry["dims"], data, attrs=entry["attrs"])
+        return xr.Dataset(
+            {name: var(e) for name, e in manifest["data_vars"].items()},
+            coords={name: var(e) for name, e in manifest["coords"].items()},
+            attrs=manifest["attrs"],
+        )
+    except (OSError, ValueError, KeyError) as e:
+        log.warning("ignoring broken sidecar %s: %s", root, e)
+        return None
+
+
+def _save_npy(fname, var: xr.Variable):
+    """``var`` as ``fname``; out‑of‑core variables slice by slice along the first axis."""
+    if var.nbytes < OUT_OF_CORE_BYTES or var.ndim == 0:
+        values = var.values
+        if values.dtype == object:          # netCDF strings → fixed‑width unicode
+            values = values.astype(str)
+        np.save(fname, values, allow_pickle=False)
+        return
+    if var.dtype == object:
+        raise ValueError(f"object variable of {var.nbytes} bytes")
+    out = np.lib.format.open_memmap(fname, mode="w+", dtype=var.dtype, shape=var.shape)
+    step = max(1, SIDECAR_CHUNK_BYTES // max(1, var.nbytes // var.shape[0]))
+    for i in range(0, var.shape[0], step):
+        out[i:i + step] = var[i:i + step].values
+    out.flush()
+    del out
+
+
+def _queue_sidecar(path, engines=ENGINES):
+    """Write ``path``'s sidecar on the sidecar thread (once per path while queued)."""
+    global _sidecar_pool
+    path = os.fspath(path)
+    with _lock:
+        if path in _sidecar_queued:
+            return
+        _sidecar_queued.add(path)
+        if _sidecar_pool is None:
+            _sidecar_pool = ThreadPoolExecutor(1, thread_name_prefix="dataset-sidecar")
+
+    def job():
+        try:
+            ds = _open_with_engines(path, engines)
+            _track(ds)
+            with ds:
+                write_sidecar(path, ds)
+        except Exception as e:
+            log.warning("sidecar not written for %s: %s", path, e)
+        finally:
+            with _lock:
+                _sidecar_queued.discard(path)
+    _sidecar_pool.submit(job)
+
+
+def write_sidecar(path, ds: xr.Dataset) -> bool:
+    """Write ``ds`` (opened from ``path``) as a sidecar; False if not possible."""
+    source = _source_key(path)
+    root = sidecar_path(path)
+    if source is None:
+        return False
+    tmp = f"{root}.{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        os.makedirs(tmp)
+        manifest = dict(version=SIDECAR_VERSION, source=source,
+                        attrs={k: _jsonable(v) for k, v in ds.attrs.items()},
+                        data_vars={}, coords={})
+        for section, names in (("coords", ds.coords), ("data_vars", ds.data_vars)):
+            for i, name in enumerate(names):
+                fname = f"{section[0]}{i}.npy"
+                _save_npy(os.path.join(tmp, fname), ds[name].variable)
+                manifest[section][str(name)] = dict(
+                    file=fname, dims=list(ds[name].dims),
+                    attrs={k: _jsonable(v) for k, v in ds[name].attrs.items()})
+        with open(os.path.join(tmp, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        if os.path.isdir(root):
+            shutil.rmtree(root, ignore_errors=True)
+        os.replace(tmp, root)
+        return True
+    except (OSError, ValueError) as e:             # read‑only archive, object arrays …
+        log.warning("sidecar not written for %s: %s", path, e)
+        shutil.rmtree(tmp, ignore_errors=True)
+        return False
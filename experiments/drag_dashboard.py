@@ -12,32 +12,25 @@ Dash module for **DRAG‑coefficient calibration** experiments
 """
 from __future__ import annotations
 import dash
-from dash import dcc, html, Input, Output, State, MATCH
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
 import plotly.subplots as subplots
-import xarray as xr
 import numpy as np
-import json, os
+import os
 from pathlib import Path
 
-
-# ────────────────────────────────────────────────────────────────────
-# Utility : safe xarray.open_dataset
-# ────────────────────────────────────────────────────────────────────
-def open_xr_dataset(path, engines=("h5netcdf", "netcdf4", None)):
-    last_err = None
-    for eng in engines:
-        try:
-            return xr.open_dataset(path, engine=eng)
-        except Exception as e:
-            last_err = e
-    raise last_err
+from experiments.data_cache import cached_loader
+from experiments.figure_cache import cached_figure
+from experiments.grid_figure import GridFigure
+from experiments.dataset_io import read_files
+from experiments.metadata import json_select
 
 
 # ────────────────────────────────────────────────────────────────────
 # 1. Data Loading 
 # ────────────────────────────────────────────────────────────────────
+@cached_loader
 def load_drag_data(folder: str | Path) -> dict | None:
     """
     Returns dict (None on failure)
@@ -48,7 +41,7 @@ def load_drag_data(folder: str | Path) -> dict | None:
       z_label     str         – for axes / colorbar
       var_key     'state'|'I'
       opt_alpha, success,
-      ds_raw, ds_fit, data_json, node_json
+      ds_raw, ds_fit
     """
     folder = os.path.normpath(str(folder))
     paths = {
@@ -61,13 +54,7 @@ def load_drag_data(folder: str | Path) -> dict | None:
         print(f"[load_drag_data] missing files in {folder}")
         return None
 
-    ds_raw = open_xr_dataset(paths["ds_raw"])
-    ds_fit = open_xr_dataset(paths["ds_fit"])
-
-    with open(paths["data_js"], "r", encoding="utf-8") as f:
-        data_json = json.load(f)
-    with open(paths["node_js"], "r", encoding="utf-8") as f:
-        node_json = json.load(f)
+    ds_raw, ds_fit = read_files(paths["ds_raw"], paths["ds_fit"])
 
     qubits = ds_raw["qubit"].values
     n_q    = len(qubits)
@@ -104,11 +91,11 @@ def load_drag_data(folder: str | Path) -> dict | None:
         Z_avg = Z_heat.mean(axis=1)
 
     # ── fit results ────────────────────────────────────────────────
-    fit_results = data_json.get("fit_results", {})
+    fit_results = json_select(paths["data_js"], *[("fit_results", str(q)) for q in qubits],
+                              default={})
     opt_alpha = np.full(n_q, np.nan, dtype=float)
     success   = np.full(n_q, False,  dtype=bool)
-    for i, q in enumerate(qubits):
-        info = fit_results.get(str(q), {})
+    for i, info in enumerate(fit_results):
         opt_alpha[i] = info.get("alpha", np.nan)
         success[i]   = bool(info.get("success", False))
 
@@ -119,7 +106,6 @@ def load_drag_data(folder: str | Path) -> dict | None:
         var_key=var_key, z_label=z_label,
         opt_alpha=opt_alpha, success=success,
         ds_raw=ds_raw, ds_fit=ds_fit,
-        data_json=data_json, node_json=node_json,
     )
 
 
@@ -152,7 +138,7 @@ def create_summary_figure(d: dict) -> go.Figure:
 # ────────────────────────────────────────────────────────────────────
 # 2‑B. Detailed Plot  (avg | heat)
 # ────────────────────────────────────────────────────────────────────
-def create_drag_plot(d: dict, mode: str = "avg") -> go.Figure:
+def create_drag_plot(d: dict, mode: str = "avg") -> dict:
     qbs      = d["qubits"]; n_q = d["n"]
     alpha    = d["alpha"];   nb_p = d["nb_pulses"]
     Z_avg    = d["Z_avg"];   Z_hm = d["Z_heat"]
@@ -161,7 +147,7 @@ def create_drag_plot(d: dict, mode: str = "avg") -> go.Figure:
 
     n_cols = 2
     n_rows = int(np.ceil(n_q / n_cols))
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows, cols=n_cols,
         subplot_titles=[str(q) for q in qbs],
         vertical_spacing=0.03, horizontal_spacing=0.07,
@@ -175,10 +161,10 @@ def create_drag_plot(d: dict, mode: str = "avg") -> go.Figure:
         if mode == "avg":
             x = alpha if alpha.ndim == 1 else alpha[i]
             fig.add_trace(
-                go.Scatter(x=x, y=Z_avg[i], mode="lines",
-                           line=dict(color="blue", width=1),
-                           name="Data" if i == 0 else None,
-                           showlegend=(i == 0)),
+                dict(type="scatter", x=x, y=Z_avg[i], mode="lines",
+                     line=dict(color="blue", width=1),
+                     name="Data" if i == 0 else None,
+                     showlegend=(i == 0)),
                 row=row, col=col,
             )
             if success[i] and not np.isnan(optα[i]):
@@ -186,18 +172,18 @@ def create_drag_plot(d: dict, mode: str = "avg") -> go.Figure:
                               line=dict(color="red", dash="dash", width=1),
                               row=row, col=col)
                 if i == 0:
-                    fig.add_trace(go.Scatter(x=[None], y=[None], mode="lines",
-                                             line=dict(color="red", dash="dash"),
-                                             name="optimal α"),
+                    fig.add_trace(dict(type="scatter", x=[None], y=[None], mode="lines",
+                                       line=dict(color="red", dash="dash"),
+                                       name="optimal α"),
                                   row=row, col=col)
 
         else:  # heat‑map
             x = alpha if alpha.ndim == 1 else alpha[i]
             z = Z_hm[i]                                  # (P, A)
             fig.add_trace(
-                go.Heatmap(x=x, y=nb_p, z=z[::-1],
-                           coloraxis="coloraxis",
-                           showscale=show_cbar),
+                dict(type="heatmap", x=x, y=nb_p, z=z[::-1],
+                     coloraxis="coloraxis",
+                     showscale=show_cbar),
                 row=row, col=col,
             )
             show_cbar = False
@@ -224,7 +210,7 @@ def create_drag_plot(d: dict, mode: str = "avg") -> go.Figure:
                     xanchor="right", x=1),
         coloraxis=dict(colorbar=dict(title=label_z), colorscale="Viridis") if mode == "heat" else None,
     )
-    return fig
+    return fig.to_dict()
                   
 # ────────────────────────────────────────────────────────────────────
 # 3. Summary Table
@@ -262,7 +248,7 @@ def create_drag_layout(folder: str | Path):
 
     init_mode  = "avg"
     summary_fig = create_summary_figure(data)
-    detail_fig  = create_drag_plot(data, init_mode)
+    detail_fig  = update_drag_plot(init_mode, {"folder": str(folder)})
 
     return html.Div(
         [
@@ -329,14 +315,15 @@ def create_drag_layout(folder: str | Path):
 # ────────────────────────────────────────────────────────────────────
 # 5. Callbacks
 # ────────────────────────────────────────────────────────────────────
+@cached_figure
+def update_drag_plot(view_mode, store):
+    if not store:
+        return go.Figure()
+    d = load_drag_data(store["folder"])
+    return create_drag_plot(d, view_mode)
+
+
 def register_drag_callbacks(app: dash.Dash):
-    @app.callback(
-        Output({"type": "drag-plot", "index": MATCH}, "figure"),
-        Input({"type": "drag-view", "index": MATCH}, "value"),
-        State({"type": "drag-data", "index": MATCH}, "data"),
-    )
-    def _update_plot(view_mode, store):
-        if not store:
-            return go.Figure()
-        d = load_drag_data(store["folder"])
-        return create_drag_plot(d, view_mode)
+    """Register ``update_drag_plot`` (dependencies listed in experiments/registry.py)."""
+    from experiments.registry import register_callbacks
+    register_callbacks(app, "drag")
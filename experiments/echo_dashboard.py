@@ -11,26 +11,18 @@ Author : (Author Name)
 Date   : 2025‑06‑22
 """
 import dash
-from dash import dcc, html, Input, Output, State, MATCH
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
-import plotly.subplots as subplots
-import xarray as xr
 import numpy as np
-import json, os
+import os
 from pathlib import Path
 
-# ────────────────────────────────────────────────────────────────────
-# Safe xarray open_dataset
-# ────────────────────────────────────────────────────────────────────
-def open_xr_dataset(path, engines=("h5netcdf", "netcdf4", None)):
-    last_err = None
-    for eng in engines:
-        try:
-            return xr.open_dataset(path, engine=eng)
-        except Exception as e:
-            last_err = e
-    raise last_err
+from experiments.data_cache import cached_loader
+from experiments.figure_cache import cached_figure
+from experiments.grid_figure import GridFigure
+from experiments.dataset_io import read_files
+
 
 # ────────────────────────────────────────────────────────────────────
 # Simple exponential decay (offset + a·exp(decay·t))
@@ -41,13 +33,14 @@ def decay_exp(t, a, offset, decay):
 # ────────────────────────────────────────────────────────────────────
 # 1. Data Loading
 # ────────────────────────────────────────────────────────────────────
+@cached_loader
 def load_echo_data(folder):
     """
     Returns dict  (None on failure)
       qubits, n, idle_time_us, ds_raw, ds_fit,
       success, T2_us, T2_err_us,
       fit_a, fit_offset, fit_decay,
-      vars_available, data_json, node_json
+      vars_available
     """
     folder = os.path.normpath(folder)
     paths = {
@@ -60,13 +53,7 @@ def load_echo_data(folder):
         print(f"[load_echo_data] missing files in {folder}")
         return None
 
-    ds_raw = open_xr_dataset(paths["ds_raw"])
-    ds_fit = open_xr_dataset(paths["ds_fit"])
-
-    with open(paths["data_js"], "r", encoding="utf-8") as f:
-        data_json = json.load(f)
-    with open(paths["node_js"], "r", encoding="utf-8") as f:
-        node_json = json.load(f)
+    ds_raw, ds_fit = read_files(paths["ds_raw"], paths["ds_fit"])
 
     qubits = ds_raw["qubit"].values
     n_q    = len(qubits)
@@ -106,7 +93,6 @@ def load_echo_data(folder):
         T2_us=T2_us, T2_err_us=T2_err_us,
         fit_a=fit_a, fit_offset=fit_offset, fit_decay=fit_decay,
         vars_available=vars_avail,
-        data_json=data_json, node_json=node_json,
     )
 
 # ────────────────────────────────────────────────────────────────────
@@ -115,7 +101,7 @@ def load_echo_data(folder):
 def create_echo_plot(data, var_key):
     """
     var_key ∈ {'state','I','Q','amp'}
-    → returns plotly.graph_objs.Figure
+    → returns the figure dict (``GridFigure``)
     """
     if not data or var_key not in data["vars_available"]:
         return go.Figure()
@@ -133,7 +119,7 @@ def create_echo_plot(data, var_key):
     n_cols = 2
     n_rows = int(np.ceil(n_q / n_cols))
 
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows,
         cols=n_cols,
         subplot_titles=[str(q) for q in qbs],
@@ -163,7 +149,8 @@ def create_echo_plot(data, var_key):
 
         # ── Plot raw data ───────────────────────────────────────────────
         fig.add_trace(
-            go.Scatter(
+            dict(
+                type="scatter",
                 x=t_us, y=y,
                 mode="lines",
                 line=dict(color="blue", width=1),
@@ -182,7 +169,8 @@ def create_echo_plot(data, var_key):
                 else:
                     y_fit = y_fit * 1e3
             fig.add_trace(
-                go.Scatter(
+                dict(
+                    type="scatter",
                     x=t_us, y=y_fit,
                     mode="lines",
                     line=dict(color="red", dash="dash", width=1),
@@ -206,7 +194,7 @@ def create_echo_plot(data, var_key):
         legend=dict(orientation="h", yanchor="bottom", y=1.02,
                     xanchor="right", x=1),
     )
-    return fig
+    return fig.to_dict()
 
 # ────────────────────────────────────────────────────────────────────
 # 3. Summary Table
@@ -242,7 +230,7 @@ def create_echo_layout(folder):
                          html.Pre(folder)])
 
     default_var = data["vars_available"][0]
-    init_fig    = create_echo_plot(data, default_var)
+    init_fig    = update_echo_plot(default_var, {"folder": folder})
 
     var_options = [
         {"label": f" {('|' if v=='amp' else '') + v.upper() + ('|' if v=='amp' else '')}", "value": v}
@@ -312,14 +300,15 @@ def create_echo_layout(folder):
 # ────────────────────────────────────────────────────────────────────
 # 5. Callbacks
 # ────────────────────────────────────────────────────────────────────
+@cached_figure
+def update_echo_plot(var_key, store):
+    if not store:
+        return go.Figure()
+    data = load_echo_data(store["folder"])
+    return create_echo_plot(data, var_key)
+
+
 def register_echo_callbacks(app: dash.Dash):
-    @app.callback(
-        Output({"type": "echo-plot", "index": MATCH}, "figure"),
-        Input({"type": "echo-var",  "index": MATCH}, "value"),
-        State({"type": "echo-data", "index": MATCH}, "data"),
-    )
-    def _update_plot(var_key, store):
-        if not store:
-            return go.Figure()
-        data = load_echo_data(store["folder"])
-        return create_echo_plot(data, var_key)
+    """Register ``update_echo_plot`` (dependencies listed in experiments/registry.py)."""
+    from experiments.registry import register_callbacks
+    register_callbacks(app, "echo")
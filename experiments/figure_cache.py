@@ -0,0 +1,70 @@
+# ======================================================================
+#  figure_cache.py
+# ======================================================================
+"""
+Process‑wide, byte‑bounded LRU cache of rendered Plotly figures
+===============================================================
+* ``@cached_figure`` wraps a module callback ``update_x_plot(*inputs, store)``
+  whose last argument is the layout's ``dcc.Store`` holding the run folder
+* Key   : (callback, folder, the other arguments = view / page / options,
+          signature of the folder's files – see ``data_cache``)
+          → going back to a view or page is a hit, a rewritten run a miss
+* Value : the figure (``go.Figure`` or ``GridFigure`` dict) serialised to
+          compact JSON once (``figure_json``); a hit only parses it back –
+          no loader, no Plotly object tree
+* Bound : ``FIGURE_CACHE_MB`` (env, default 128, ``0`` disables), least
+          recently used first
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import functools, json, os, sys
+
+import plotly.graph_objects as go
+
+from experiments.data_cache import DatasetCache, folder_signature
+from experiments.figure_json import dumps, figure_dict
+
+try:                                    # optional: pip install orjson
+    import orjson
+    _loads = orjson.loads
+except ImportError:                     # pragma: no cover
+    _loads = json.loads
+
+FIGURE_CACHE_MB = float(os.environ.get("FIGURE_CACHE_MB", "128"))
+
+figure_cache = DatasetCache(int(FIGURE_CACHE_MB * 1024 * 1024))
+
+
+def _store_folder(store) -> str | None:
+    if not isinstance(store, dict):
+        return None
+    folder = store.get("folder") or store.get("folder_path")
+    return os.path.normpath(str(folder)) if folder else None
+
+
+def cached_figure(func):
+    """Cache the figure ``func(*args, store)`` returns; the other arguments must be hashable."""
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        folder = _store_folder(args[-1]) if args else None
+        if folder is None or figure_cache.max_bytes <= 0:
+            return func(*args)
+        sig = folder_signature(folder)
+        key = (name, folder, args[:-1], sig)
+        hit = figure_cache.get(key)
+        if hit is not None:
+            return _loads(hit)
+
+        fig = func(*args)
+        if isinstance(fig, (go.Figure, dict)):
+            fig = figure_dict(fig)                  # what a hit returns: typed arrays
+            payload = dumps(fig)
+            # figures of older versions of these files can never hit again
+            figure_cache.discard(lambda k: k[0] == name and k[1] == folder and k[3] != sig)
+            figure_cache.put(key, payload, sys.getsizeof(payload))
+        return fig
+
+    wrapper.cache = figure_cache
+    return wrapper
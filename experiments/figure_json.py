@@ -0,0 +1,137 @@
+# ======================================================================
+#  figure_json.py
+# ======================================================================
+"""
+Compact JSON for Plotly figures
+===============================
+* ``typed_array(a)`` : numeric ndarray → plotly.js typed array
+  ``{"dtype": "f4", "bdata": <base64>, "shape": "rows, cols"}`` instead of
+  a list of decimal numbers (≈ 3× smaller for float64, decoded in the
+  browser without parsing)
+  – float64 is sent as float32 when that moves no value by more than
+    ``F32_TOLERANCE`` of the array's span (far below a pixel); arrays that
+    need the precision (e.g. GHz frequencies with kHz steps) stay float64
+  – integers are narrowed to the smallest type holding their range
+  – big‑endian data (netCDF‑3) is byte‑swapped, other dtypes stay lists
+* ``encode_arrays(obj)`` : the same for every array inside a figure dict
+* ``figure_dict(fig)`` : ``go.Figure`` or figure dict → dict with typed arrays
+* ``dumps(fig)`` : figure dict / ``go.Figure`` → JSON string with ``orjson``
+  when installed (numpy scalars natively), Plotly's encoder otherwise
+* ``FIGURE_FLOAT32=0`` (env) always keeps float64
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import base64, os
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+
+try:                                    # optional: pip install orjson
+    import orjson
+    JSON_ENGINE = "orjson"
+except ImportError:                     # pragma: no cover
+    orjson = None
+    JSON_ENGINE = "json"
+
+FIGURE_FLOAT32 = os.environ.get("FIGURE_FLOAT32", "1") != "0"
+F32_TOLERANCE = 1e-6
+
+# plotly.js typed‑array names (little endian)
+_SHORT = {"int8": "i1", "uint8": "u1", "int16": "i2", "uint16": "u2",
+          "int32": "i4", "uint32": "u4", "float32": "f4", "float64": "f8"}
+_SKIPPED_KEYS = {"range", "geojson", "layer", "layers"}   # must stay plain lists
+
+
+def _as_float32(a: np.ndarray):
+    """``a`` as float32 if that is invisible on a plot of ``a`` (else None)."""
+    if not FIGURE_FLOAT32:
+        return None
+    b = a.astype("<f4")
+    with np.errstate(invalid="ignore", over="ignore"):
+        err = np.abs(a - b)
+    finite = np.isfinite(a)
+    if not finite.any():
+        return b
+    vals = a[finite]
+    lo, hi = vals.min(), vals.max()
+    scale = (hi - lo) or max(abs(lo), abs(hi))
+    worst = err[finite].max()                    # a finite value → inf shows up as inf
+    return b if worst <= F32_TOLERANCE * scale else None
+
+
+def _narrow_int(a: np.ndarray) -> np.ndarray | None:
+    """``a`` in the smallest (≤ 32 bit) integer type that holds it exactly."""
+    lo, hi = int(a.min()), int(a.max())
+    for t in ("int8", "int16", "int32") if a.dtype.kind == "i" else ("uint8", "uint16", "uint32"):
+        info = np.iinfo(t)
+        if info.min <= lo and hi <= info.max:
+            return a.astype(np.dtype(t).newbyteorder("<"), copy=False)
+    return None
+
+
+def typed_array(a: np.ndarray):
+    """plotly.js typed‑array dict for ``a``, or a plain list if it has no typed form."""
+    if a.size == 0 or a.dtype.kind not in "iuf":
+        return a.tolist()
+    a = a.astype(a.dtype.newbyteorder("<"), copy=False)
+    if a.dtype.kind == "f" and a.dtype.itemsize > 4:
+        b = _as_float32(a) if a.dtype.itemsize == 8 else None
+        a = b if b is not None else a.astype("<f8", copy=False)
+    elif a.dtype.kind in "iu" and a.dtype.itemsize > 1:
+        b = _narrow_int(a)
+        if b is None:                               # beyond 32 bit: no typed array
+            return a.tolist()
+        a = b
+    name = _SHORT.get(a.dtype.name)
+    if name is None:                                # float16 and friends
+        return a.tolist()
+    spec = {"dtype": name, "bdata": base64.b64encode(np.ascontiguousarray(a)).decode("ascii")}
+    if a.ndim > 1:
+        spec["shape"] = ", ".join(str(n) for n in a.shape)
+    return spec
+
+
+def encode_arrays(obj):
+    """
+    Replace (in place) every numeric ndarray in the dicts / lists of ``obj``
+    by ``typed_array``; dates, bools and strings are left to the encoder.
+    """
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(value, np.ndarray):
+                if value.dtype.kind in "iuf" and key not in _SKIPPED_KEYS:
+                    obj[key] = typed_array(value)
+            elif isinstance(value, (dict, list)):
+                encode_arrays(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            if isinstance(value, (dict, list)):
+                encode_arrays(value)
+    return obj
+
+
+def _default(obj):
+    if isinstance(obj, np.ndarray):                 # dtypes orjson cannot write itself
+        return obj.tolist()
+    if hasattr(obj, "to_plotly_json"):
+        return obj.to_plotly_json()
+    raise TypeError(f"{type(obj).__name__} is not JSON serialisable")
+
+
+def figure_dict(fig) -> dict:
+    """``go.Figure`` / figure dict → figure dict with typed arrays."""
+    if isinstance(fig, go.Figure):
+        # not fig.to_dict(): that already writes every array as float64
+        return encode_arrays({"data": [t.to_plotly_json() for t in fig.data],
+                              "layout": fig.layout.to_plotly_json()})
+    return encode_arrays(fig)
+
+
+def dumps(fig) -> str:
+    """JSON of a figure as Dash sends it (see module doc)."""
+    fig = figure_dict(fig)
+    if orjson is None:
+        return to_json_plotly(fig)
+    return orjson.dumps(fig, default=_default,
+                        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
@@ -0,0 +1,226 @@
+# ======================================================================
+#  grid_figure.py
+# ======================================================================
+"""
+Per‑qubit subplot grids built as plain figure dicts
+===================================================
+* ``GridFigure(rows, cols, subplot_titles=…, vertical_spacing=…)`` lays
+  out the same grid as ``plotly.subplots.make_subplots`` (same axis ids,
+  domains and title annotations) with the axis domains computed once
+* ``add_trace(dict(type="scatter", …), row, col)``, ``add_vline``,
+  ``add_hline``, ``update_xaxes`` / ``update_yaxes(row=, col=)`` and
+  ``update_layout`` mirror the ``go.Figure`` methods of the same name but
+  only append / update dicts: no ``graph_objs`` validation, no lookup
+  over every subplot per call (which made a grid O(n_qubits²) to build)
+* ``to_dict()`` → ``{"data": …, "layout": …}`` as ``go.Figure`` would
+  serialise it (named template expanded, numpy arrays as typed arrays, see
+  ``figure_json``); ``dcc.Graph`` takes it as ``figure`` directly
+--------------------------------------------------------------------
+Traces are plain dicts with a ``type`` (``marker_color=…`` works as in
+``go.Scatter``); they are not checked, so a misspelt attribute shows up in
+the browser console, not as a Python exception.
+"""
+from __future__ import annotations
+
+import plotly.io as pio
+from _plotly_utils.basevalidators import ColorscaleValidator
+from plotly.basedatatypes import BaseFigure
+
+from experiments import figure_json
+
+_AXIS_REFS = {"anchor", "scaleanchor", "matches", "overlaying"}
+# attribute names that contain "_" (error_x, plot_bgcolor …): kept whole, as plotly does
+_UNDERSCORED = tuple(BaseFigure._valid_underscore_properties)
+_colorscale = ColorscaleValidator("colorscale", "grid_figure")
+
+
+def _check_spacing(n: int, spacing: float, name: str, dim: str):
+    """Same limits as ``make_subplots``."""
+    if spacing < 0 or spacing > 1:
+        raise ValueError(f"{name} spacing must be between 0 and 1.")
+    if n > 1 and spacing > 1.0 / (n - 1):
+        raise ValueError(f"{name} spacing cannot be greater than (1 / ({dim} - 1)) = "
+                         f"{1.0 / (n - 1):f}.")
+
+
+def _clip(v: float) -> float:
+    """``make_subplots`` rounds domain ends within 0.01 of [0, 1] onto it."""
+    if v < 0.0:
+        if v > -0.01:
+            return 0.0
+        raise ValueError("subplot grid does not fit into the figure")
+    if v > 1.0:
+        if v < 1.01:
+            return 1.0
+        raise ValueError("subplot grid does not fit into the figure")
+    return v
+
+
+def _coerce(key: str, value):
+    """What the ``graph_objs`` validators would store for a few common shorthands."""
+    if key == "title" and isinstance(value, str):
+        return {"text": value}
+    if key == "colorscale" and isinstance(value, str):
+        return _colorscale.validate_coerce(value)   # plotly.js names differ ("Greys" is reversed)
+    if key in _AXIS_REFS and value in ("x1", "y1"):
+        return value[0]
+    return value
+
+
+def _split(key: str) -> list[str]:
+    """Magic‑underscore path of ``key``: ``title_font_size`` → title.font.size, ``plot_bgcolor`` kept."""
+    for name in _UNDERSCORED:
+        key = key.replace(name, name.replace("_", "-"))
+    return [part.replace("-", "_") for part in key.split("_")]
+
+
+def _update(container: dict, props: dict):
+    """``go.Figure.update_*`` semantics: ``title_text`` → title.text, dicts merge, None skips."""
+    for key, value in props.items():
+        if value is None:
+            continue
+        *path, leaf = _split(key)
+        target = container
+        for part in path:
+            target = target.setdefault(part, {})
+        value = _coerce(leaf, value)
+        if isinstance(value, dict):
+            sub = target.get(leaf)
+            if not isinstance(sub, dict):
+                sub = target[leaf] = {}
+            _update(sub, value)
+        else:
+            target[leaf] = value
+
+
+_templates: dict = {}                   # name → (Template, its dict)
+
+
+def _template(name):
+    if name is None or isinstance(name, dict):
+        return name
+    if not isinstance(name, str):                       # go.layout.Template
+        return name.to_plotly_json()
+    tpl = pio.templates[name]
+    hit = _templates.get(name)
+    if hit is None or hit[0] is not tpl:
+        hit = _templates[name] = (tpl, tpl.to_plotly_json())
+    return hit[1]
+
+
+class GridFigure:
+    """A ``rows`` × ``cols`` grid of x/y subplots, filled row by row from the top left."""
+
+    def __init__(self, rows: int, cols: int, subplot_titles=None,
+                 vertical_spacing: float | None = None,
+                 horizontal_spacing: float | None = None):
+        rows, cols = int(rows), int(cols)
+        if rows < 1 or cols < 1:
+            raise ValueError(f"a subplot grid needs at least one row and column, got {rows}×{cols}")
+        if horizontal_spacing is None:
+            horizontal_spacing = 0.2 / cols
+        if vertical_spacing is None:
+            vertical_spacing = (0.5 if subplot_titles is not None else 0.3) / rows
+        _check_spacing(cols, horizontal_spacing, "Horizontal", "cols")
+        _check_spacing(rows, vertical_spacing, "Vertical", "rows")
+        self.rows, self.cols = rows, cols
+
+        # same arithmetic as make_subplots (→ identical domains), cumulative sums kept
+        width = (1.0 - horizontal_spacing * (cols - 1)) / cols
+        height = (1.0 - vertical_spacing * (rows - 1)) / rows
+        x_dom, start = [], 0
+        for c in range(cols):
+            x_s = start + c * horizontal_spacing
+            x_dom.append([x_s, x_s + width])
+            start += width
+        y_dom, start = [], 0
+        for r in range(rows):                           # bottom row first
+            y_s = start + r * vertical_spacing
+            y_dom.append([_clip(y_s), _clip(y_s + height)])
+            start += height
+        y_dom.reverse()                                 # row 1 at the top
+
+        self._layout: dict = {}
+        titles = []
+        for r in range(rows):
+            for c in range(cols):
+                k = r * cols + c + 1
+                s, xd, yd = self._suffix(k), x_dom[c], y_dom[r]
+                self._layout[f"xaxis{s}"] = {"anchor": f"y{s}", "domain": list(xd)}
+                self._layout[f"yaxis{s}"] = {"anchor": f"x{s}", "domain": list(yd)}
+                if subplot_titles and k <= len(subplot_titles) and subplot_titles[k - 1]:
+                    titles.append({"font": {"size": 16}, "showarrow": False,
+                                   "text": subplot_titles[k - 1],
+                                   "x": sum(xd) / 2.0, "xanchor": "center", "xref": "paper",
+                                   "y": yd[1], "yanchor": "bottom", "yref": "paper"})
+        self._annotations = titles
+        self._shapes: list[dict] = []
+        self._data: list[dict] = []
+        self._filled: set[int] = set()
+
+    # ── cells ────────────────────────────────────────────────────────
+    def _cell(self, row: int, col: int) -> int:
+        if not (1 <= row <= self.rows and 1 <= col <= self.cols):
+            raise ValueError(f"cell ({row}, {col}) outside the {self.rows}×{self.cols} grid")
+        return (row - 1) * self.cols + col
+
+    @staticmethod
+    def _suffix(k: int) -> str:
+        return str(k) if k > 1 else ""
+
+    # ── figure API ───────────────────────────────────────────────────
+    def add_trace(self, trace: dict, row: int, col: int) -> "GridFigure":
+        k = self._cell(row, col)
+        tr = {}
+        _update(tr, trace)
+        tr["xaxis"], tr["yaxis"] = f"x{self._suffix(k)}", f"y{self._suffix(k)}"
+        self._data.append(tr)
+        self._filled.add(k)
+        return self
+
+    def add_vline(self, x, row: int, col: int, **shape) -> "GridFigure":
+        """Vertical line over the full height of the cell (skipped if it has no trace yet)."""
+        k = self._cell(row, col)
+        if k in self._filled:
+            s = self._suffix(k)
+            line = {"type": "line", "x0": x, "x1": x, "xref": f"x{s}",
+                    "y0": 0, "y1": 1, "yref": f"y{s} domain"}
+            _update(line, shape)
+            self._shapes.append(line)
+        return self
+
+    def add_hline(self, y, row: int, col: int, **shape) -> "GridFigure":
+        """Horizontal line over the full width of the cell (skipped if it has no trace yet)."""
+        k = self._cell(row, col)
+        if k in self._filled:
+            s = self._suffix(k)
+            line = {"type": "line", "x0": 0, "x1": 1, "xref": f"x{s} domain",
+                    "y0": y, "y1": y, "yref": f"y{s}"}
+            _update(line, shape)
+            self._shapes.append(line)
+        return self
+
+    def update_xaxes(self, row: int, col: int, **props) -> "GridFigure":
+        _update(self._layout[f"xaxis{self._suffix(self._cell(row, col))}"], props)
+        return self
+
+    def update_yaxes(self, row: int, col: int, **props) -> "GridFigure":
+        _update(self._layout[f"yaxis{self._suffix(self._cell(row, col))}"], props)
+        return self
+
+    def update_layout(self, **props) -> "GridFigure":
+        _update(self._layout, props)
+        return self
+
+    def to_dict(self) -> dict:
+        layout = dict(self._layout)
+        annotations = self._annotations + layout.pop("annotations", [])
+        if annotations:
+            layout["annotations"] = annotations
+        if self._shapes:
+            layout["shapes"] = self._shapes + layout.pop("shapes", [])
+        template = _template(layout.get("template", pio.templates.default))
+        if template is not None:
+            layout["template"] = template
+        figure_json.encode_arrays(self._data)    # numpy → (float32) typed arrays
+        return {"data": self._data, "layout": layout}
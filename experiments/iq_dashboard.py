@@ -13,15 +13,21 @@ All views share 2‑column × N‑row layout with automatic pagination.
 """
 from __future__ import annotations
 import dash
-from dash import dcc, html, Input, Output, State, MATCH
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
-import plotly.subplots as subplots
-import xarray as xr
 import numpy as np
-import json, os
+import os
 from pathlib import Path
 
+from experiments.data_cache import cached_loader
+from experiments.figure_cache import cached_figure
+from experiments.client_views import initial_figure, views_store
+from experiments.grid_figure import GridFigure
+from experiments.dataset_io import open_xr_dataset
+from experiments.mapped_arrays import ScaledArray, scaled_values
+from experiments.chunked import histogram, minmax, thin_step
+
 # ────────────────────────────────────────────────────────────────────
 # 0. Global settings (rows·cols, pagination, size)
 # ────────────────────────────────────────────────────────────────────
@@ -34,30 +40,30 @@ PLOT_HEIGHT_UNIT = {        # Height per row [px]  ### TUNE HERE
 }
 SUBPLOT_VSPACE     = 0.05   #   │ vertical spacing      ### TUNE HERE
 SUBPLOT_HSPACE     = 0.07   #   └─horizontal spacing
+BLOB_MAX_POINTS    = 20_000 # out‑of‑core run, more shots per qubit → blob shows every k‑th shot
 
-# ────────────────────────────────────────────────────────────────────
-# Common: Safe xarray.open_dataset
-# ────────────────────────────────────────────────────────────────────
-def open_xr_dataset(path, engines=("h5netcdf", "netcdf4", None)):
-    last_err = None
-    for eng in engines:
-        try:
-            return xr.open_dataset(path, engine=eng)
-        except Exception as e:
-            last_err = e
-    raise last_err
 
 # ────────────────────────────────────────────────────────────────────
 # 1. Data Loader
 # ────────────────────────────────────────────────────────────────────
-def load_iq_data(folder: str | Path) -> dict | None:
+# Variables each view needs beyond the per‑qubit summary (qubit, success,
+# fidelity, thresholds); shots are only read for the views that draw them.
+VIEW_VARS = {
+    "conf": ("gg", "ge", "eg", "ee"),
+    "hist": ("Ig_rot", "Ie_rot"),
+    "blob": ("Ig_rot", "Ie_rot", "Qg_rot", "Qe_rot"),
+}
+
+@cached_loader
+def load_iq_data(folder: str | Path, view: str = "conf") -> dict | None:
     """
     Returns dict (keys):
-      qubits, n, ds_raw, ds_fit,
-      success, readout_fidelity,
-      gg, ge, eg, ee,
-      Ig, Ie, Qg, Qe,
-      rus_thr, ge_thr
+      qubits, n, view,
+      success, readout_fidelity, rus_thr, ge_thr,
+      gg, ge, eg, ee          (view "conf")
+      Ig, Ie[, Qg, Qe]        (views "hist" / "blob", ``ScaledArray`` → mV)
+    Only ``view``'s variables are read from ds_fit.h5; ds_raw.h5 is opened
+    only when ds_fit.h5 has no qubit coordinate.
     """
     folder = os.path.normpath(str(folder))
     paths = {
@@ -70,37 +76,31 @@ def load_iq_data(folder: str | Path) -> dict | None:
         print(f"[load_iq_data] missing files in {folder}")
         return None
 
-    ds_raw = open_xr_dataset(paths["ds_raw"])
-    ds_fit = open_xr_dataset(paths["ds_fit"])
-    with open(paths["data_js"], "r", encoding="utf-8") as f:
-        data_json = json.load(f)
-    with open(paths["node_js"], "r", encoding="utf-8") as f:
-        node_json = json.load(f)
-
-    qubits   = ds_fit["qubit"].values if "qubit" in ds_fit else ds_raw["qubit"].values
-    n_q      = len(qubits)
-    success  = ds_fit["success"].values if "success" in ds_fit else np.full(n_q, True)
-    fidelity = ds_fit["readout_fidelity"].values if "readout_fidelity" in ds_fit else np.full(n_q, np.nan)
-
-    gg = ds_fit["gg"].values; ge = ds_fit["ge"].values
-    eg = ds_fit["eg"].values; ee = ds_fit["ee"].values
-
-    Ig = ds_fit["Ig_rot"].values * 1e3
-    Ie = ds_fit["Ie_rot"].values * 1e3
-    Qg = ds_fit["Qg_rot"].values * 1e3 if "Qg_rot" in ds_fit else np.zeros_like(Ig)
-    Qe = ds_fit["Qe_rot"].values * 1e3 if "Qe_rot" in ds_fit else np.zeros_like(Ie)
-
-    rus_thr = ds_fit["rus_threshold"].values * 1e3
-    ge_thr  = ds_fit["ge_threshold"].values * 1e3
+    with open_xr_dataset(paths["ds_fit"]) as ds_fit:
+        if "qubit" in ds_fit:
+            qubits = ds_fit["qubit"].values
+        else:
+            with open_xr_dataset(paths["ds_raw"]) as ds_raw:
+                qubits = ds_raw["qubit"].values
+        n_q      = len(qubits)
+        success  = ds_fit["success"].values if "success" in ds_fit else np.full(n_q, True)
+        fidelity = ds_fit["readout_fidelity"].values if "readout_fidelity" in ds_fit else np.full(n_q, np.nan)
+        rus_thr  = ds_fit["rus_threshold"].values * 1e3
+        ge_thr   = ds_fit["ge_threshold"].values * 1e3
 
-    return dict(
-        qubits=qubits, n=n_q,
-        ds_raw=ds_raw, ds_fit=ds_fit,
-        success=success, readout_fidelity=fidelity,
-        gg=gg, ge=ge, eg=eg, ee=ee,
-        Ig=Ig, Ie=Ie, Qg=Qg, Qe=Qe,
-        rus_thr=rus_thr, ge_thr=ge_thr,
-    )
+        data = dict(
+            qubits=qubits, n=n_q, view=view,
+            success=success, readout_fidelity=fidelity,
+            rus_thr=rus_thr, ge_thr=ge_thr,
+        )
+        for var in VIEW_VARS.get(view, VIEW_VARS["blob"]):
+            if var in ("gg", "ge", "eg", "ee"):
+                data[var] = ds_fit[var].values
+            elif var in ds_fit:
+                data[var[:2]] = scaled_values(ds_fit, var, 1e3)   # shots: mapped if large
+            else:                               # Q quadrature missing → flat blobs
+                data[var[:2]] = ScaledArray(np.zeros(data["I" + var[1]].shape))
+    return data
 
 # ────────────────────────────────────────────────────────────────────
 # 1‑B. Data slicer for pagination
@@ -110,9 +110,9 @@ def slice_data_for_page(data: dict, page: int, per_page: int = PER_PAGE) -> dict
     start = (page - 1) * per_page
     stop  = min(page * per_page, data["n"])
     sel   = slice(start, stop)
-    sliced = {k: (v[sel] if isinstance(v, np.ndarray) else v)
+    sliced = {k: v[sel]
               for k, v in data.items()
-              if isinstance(v, np.ndarray)}
+              if isinstance(v, (np.ndarray, ScaledArray))}
     # Non‑array items remain as is
     for k, v in data.items():
         if k not in sliced:
@@ -124,10 +124,10 @@ def slice_data_for_page(data: dict, page: int, per_page: int = PER_PAGE) -> dict
 # ────────────────────────────────────────────────────────────────────
 # 2‑A. Confusion‑matrix plot  (2×N, enlarged number font)
 # ────────────────────────────────────────────────────────────────────
-def plotconfusion(data: dict) -> go.Figure:
+def plotconfusion(data: dict) -> dict:
     qbs = data["qubits"]; n_q = data["n"]
     n_rows = int(np.ceil(n_q / N_COLS))
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows, cols=N_COLS,
         subplot_titles=[str(q) for q in qbs],
         vertical_spacing=SUBPLOT_VSPACE, horizontal_spacing=SUBPLOT_HSPACE,
@@ -138,7 +138,8 @@ def plotconfusion(data: dict) -> go.Figure:
                       [data["eg"][idx], data["ee"][idx]]])
         txt = np.vectorize(lambda x: f"{x*100:.1f}%")(z)
         fig.add_trace(
-            go.Heatmap(
+            dict(
+                type="heatmap",
                 z=z[::-1], text=txt[::-1], texttemplate="%{text}",
                 textfont={"size": 18},                 
                 colorscale="Greys", zmin=0, zmax=1,
@@ -156,33 +157,34 @@ def plotconfusion(data: dict) -> go.Figure:
         height=PLOT_HEIGHT_UNIT["conf"] * n_rows,  
         template="dashboard_dark",
     )
-    return fig
+    return fig.to_dict()
 
 # ────────────────────────────────────────────────────────────────────
 # 2‑B. Histogram plot
 # ────────────────────────────────────────────────────────────────────
-def plothistogram(data: dict) -> go.Figure:
+def plothistogram(data: dict) -> dict:
     qbs = data["qubits"]; n_q = data["n"]
     Ig, Ie = data["Ig"], data["Ie"]
     rus, ge_thr = data["rus_thr"], data["ge_thr"]
     n_rows = int(np.ceil(n_q / N_COLS))
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows, cols=N_COLS,
         subplot_titles=[str(q) for q in qbs],
         vertical_spacing=SUBPLOT_VSPACE, horizontal_spacing=SUBPLOT_HSPACE,
     )
+    stream = Ig.lazy or Ie.lazy         # out‑of‑core run → counts, not raw shots
     for idx, q in enumerate(qbs):
         r, c = divmod(idx, N_COLS); row, col = r + 1, c + 1
-        bins = np.linspace(min(Ig[idx].min(), Ie[idx].min()),
-                           max(Ig[idx].max(), Ie[idx].max()), 90)
-        fig.add_trace(go.Histogram(
-            x=Ig[idx], nbinsx=len(bins)-1, name="|g⟩" if idx == 0 else None,
-            marker_color="skyblue", opacity=0.7, showlegend=(idx == 0)),
-            row=row, col=col)
-        fig.add_trace(go.Histogram(
-            x=Ie[idx], nbinsx=len(bins)-1, name="|e⟩" if idx == 0 else None,
-            marker_color="lightsalmon", opacity=0.7, showlegend=(idx == 0)),
-            row=row, col=col)
+        bins = np.linspace(*minmax(Ig, Ie, rows=[idx]), 90)
+        for shots, name, color in ((Ig, "|g⟩", "skyblue"), (Ie, "|e⟩", "lightsalmon")):
+            style = dict(name=name if idx == 0 else None, marker=dict(color=color),
+                         opacity=0.7, showlegend=(idx == 0))
+            if stream:
+                trace = dict(type="bar", x=(bins[:-1] + bins[1:]) / 2, y=histogram(shots, idx, bins),
+                             width=bins[1] - bins[0], **style)
+            else:
+                trace = dict(type="histogram", x=shots[idx], nbinsx=len(bins)-1, **style)
+            fig.add_trace(trace, row=row, col=col)
         fig.add_vline(x=rus[idx], line=dict(color="black", dash="dash"), row=row, col=col)
         fig.add_vline(x=ge_thr[idx], line=dict(color="red",   dash="dash"), row=row, col=col)
         if row == n_rows: fig.update_xaxes(title_text="I‑rot [mV]", row=row, col=col)
@@ -195,30 +197,37 @@ def plothistogram(data: dict) -> go.Figure:
         template="dashboard_dark",
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
     )
-    return fig
+    return fig.to_dict()
 
 # ────────────────────────────────────────────────────────────────────
 # 2‑C. Scatter (blob) plot
 # ────────────────────────────────────────────────────────────────────
-def plotblob(data: dict) -> go.Figure:
+def plotblob(data: dict) -> dict:
     qbs = data["qubits"]; n_q = data["n"]
     Ig, Ie, Qg, Qe = data["Ig"], data["Ie"], data["Qg"], data["Qe"]
     rus, ge_thr = data["rus_thr"], data["ge_thr"]
     n_rows = int(np.ceil(n_q / N_COLS))
-    fig = subplots.make_subplots(
+    # out‑of‑core run → every step‑th shot only (noted in each subplot title)
+    step = thin_step(Ig, BLOB_MAX_POINTS) if any(a.lazy for a in (Ig, Ie, Qg, Qe)) else 1
+    note = f" (every {step}th shot)" if step > 1 else ""
+    fig = GridFigure(
         rows=n_rows, cols=N_COLS,
-        subplot_titles=[str(q) for q in qbs],
+        subplot_titles=[f"{q}{note}" for q in qbs],
         vertical_spacing=SUBPLOT_VSPACE, horizontal_spacing=SUBPLOT_HSPACE,
     )
     for idx, q in enumerate(qbs):
         r, c = divmod(idx, N_COLS); row, col = r + 1, c + 1
-        fig.add_trace(go.Scatter(
-            x=Ig[idx], y=Qg[idx], mode="markers",
+        xg, yg = np.asarray(Ig[idx, ::step]), np.asarray(Qg[idx, ::step])
+        xe, ye = np.asarray(Ie[idx, ::step]), np.asarray(Qe[idx, ::step])
+        fig.add_trace(dict(
+            type="scatter",
+            x=xg, y=yg, mode="markers",
             marker=dict(color="skyblue", size=4, opacity=0.3),
             name="|g⟩" if idx == 0 else None, showlegend=(idx == 0)),
             row=row, col=col)
-        fig.add_trace(go.Scatter(
-            x=Ie[idx], y=Qe[idx], mode="markers",
+        fig.add_trace(dict(
+            type="scatter",
+            x=xe, y=ye, mode="markers",
             marker=dict(color="lightsalmon", size=4, opacity=0.3),
             name="|e⟩" if idx == 0 else None, showlegend=(idx == 0)),
             row=row, col=col)
@@ -234,12 +243,12 @@ def plotblob(data: dict) -> go.Figure:
         template="dashboard_dark",
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
     )
-    return fig
+    return fig.to_dict()
 
 # ────────────────────────────────────────────────────────────────────
 # 2. Plot wrapper (mode + page)
 # ────────────────────────────────────────────────────────────────────
-def create_iq_plot(data: dict, mode: str, page: int = 1) -> go.Figure:
+def create_iq_plot(data: dict, mode: str, page: int = 1) -> dict:
     if not data:
         return go.Figure()
     data_page = slice_data_for_page(data, page)
@@ -275,13 +284,13 @@ def create_summary_table(data: dict):
 # ────────────────────────────────────────────────────────────────────
 def create_iq_layout(folder: str | Path):
     uid  = str(folder).replace("\\", "_").replace("/", "_").replace(":", "")
-    data = load_iq_data(folder)
+    data = load_iq_data(folder, "conf")
     if not data:
         return html.Div([dbc.Alert("Failed to load data", color="danger"),
                          html.Pre(str(folder))])
 
     n_pages = int(np.ceil(data["n"] / PER_PAGE))
-    init_fig = create_iq_plot(data, "conf", page=1)
+    init_fig = initial_figure("iq", update_iq_plot, "conf", 1, {"folder": str(folder)})
 
     # Pagination component
     page_selector = dbc.Pagination(
@@ -295,6 +304,8 @@ def create_iq_layout(folder: str | Path):
         [
             dcc.Store(id={"type": "iq-data", "index": uid},
                       data={"folder": str(folder)}),
+            *views_store("iq", uid, update_iq_plot, ["conf", "hist", "blob"],
+                         1, {"folder": str(folder)}),
 
             # ── Title ────────────────────────────────────────────
             dbc.Row(dbc.Col(html.H3(f"IQ Discrimination – {Path(folder).name}")),
@@ -360,15 +371,15 @@ def create_iq_layout(folder: str | Path):
 # ────────────────────────────────────────────────────────────────────
 # 5. Callbacks (update figure when view or page changes)
 # ────────────────────────────────────────────────────────────────────
+@cached_figure
+def update_iq_plot(view_mode, page, store):
+    if not store:
+        return go.Figure()
+    data = load_iq_data(store["folder"], view_mode)
+    return create_iq_plot(data, view_mode, page or 1)
+
+
 def register_iq_callbacks(app: dash.Dash):
-    @app.callback(
-        Output({"type": "iq-plot", "index": MATCH}, "figure"),
-        Input({"type": "iq-view",  "index": MATCH}, "value"),
-        Input({"type": "iq-page",  "index": MATCH}, "active_page"),
-        State({"type": "iq-data",  "index": MATCH}, "data"),
-    )
-    def updateplot(view_mode, page, store):
-        if not store:
-            return go.Figure()
-        data = load_iq_data(store["folder"])
-        return create_iq_plot(data, view_mode, page or 1)
+    """Register ``update_iq_plot`` (dependencies listed in experiments/registry.py)."""
+    from experiments.registry import register_callbacks
+    register_callbacks(app, "iq")
@@ -0,0 +1,288 @@
+# ======================================================================
+#  mapped_arrays.py
+# ======================================================================
+"""
+Zero‑copy, memory‑mapped access to large contiguous variables
+============================================================
+* Finds where a variable's raw bytes live in its file:
+    – HDF5 / netCDF‑4 : contiguous, unfiltered datasets (``h5py`` offsets)
+    – netCDF‑3        : fixed‑size (non‑record) variables, from the header
+* Maps them read‑only (one ``mmap`` per file version, shared by all its
+  variables) → opening costs a header read, pages are loaded by the OS
+  when a plot touches them and can be dropped again under memory pressure
+* ``ScaledArray`` applies unit scaling (V → mV …) when it is indexed, i.e.
+  for the rows a figure draws, instead of copying the whole array up front
+* Anything that cannot be mapped (chunked / compressed data, packed or
+  masked encodings, small arrays, sidecar datasets …) falls back to the
+  in‑memory values – or, from ``DATASET_OUT_OF_CORE_MB`` (default 256) on,
+  to the lazy xarray variable, read piece by piece as it is indexed
+  (see ``experiments/chunked.py``) – the caller gets the same interface
+--------------------------------------------------------------------
+Mapped files must not be truncated in place while a plot reads them
+(acquisition software writes new files, which is safe).
+"""
+from __future__ import annotations
+import mmap, os, struct, threading, weakref
+
+import numpy as np
+
+DATASET_MMAP   = os.environ.get("DATASET_MMAP", "1").lower() in ("1", "true", "yes", "on")
+MMAP_MIN_BYTES = 4 * 1024 * 1024        # smaller arrays are cheaper to copy than to map
+OUT_OF_CORE_BYTES = int(float(os.environ.get("DATASET_OUT_OF_CORE_MB", "256")) * 1024 * 1024)
+
+_layouts: dict[tuple, dict] = {}        # (path, mtime_ns, size) → {name: (offset, dtype, shape)}
+_maps: "weakref.WeakValueDictionary[tuple, mmap.mmap]" = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+
+
+# ────────────────────────────────────────────────────────────────────
+# Lazily scaled array
+# ────────────────────────────────────────────────────────────────────
+class ScaledArray:
+    """
+    ``base * scale`` evaluated on access.
+
+    ``a[i]`` / ``a[i, j]`` → ndarray (only the selected elements are read
+    and scaled); ``a[start:stop]`` → ``ScaledArray`` (still lazy);
+    ``np.asarray(a)`` → the full scaled array.
+    """
+
+    def __init__(self, base: np.ndarray, scale: float = 1.0):
+        self.base  = base
+        self.scale = scale
+        native = base.dtype.newbyteorder("=")
+        self.dtype = native if scale == 1 else np.result_type(native, type(scale))
+
+    @property
+    def shape(self):
+        return self.base.shape
+
+    @property
+    def ndim(self):
+        return self.base.ndim
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.base.nbytes)
+
+    @property
+    def lazy(self) -> bool:
+        """True when ``base`` is an unread xarray variable (out‑of‑core)."""
+        return not isinstance(self.base, np.ndarray)
+
+    @property
+    def resident_nbytes(self) -> int:
+        """Bytes held for the cache budget (mapped arrays count, lazy ones don't)."""
+        return 0 if self.lazy else self.nbytes
+
+    @property
+    def mapped(self) -> bool:
+        """True when the values are read from a file mapping."""
+        owner = self.base
+        while isinstance(owner, np.ndarray) and not isinstance(owner, np.memmap):
+            owner = owner.base
+        if isinstance(owner, memoryview):       # np.frombuffer(mmap)
+            owner = owner.obj
+        return isinstance(owner, (mmap.mmap, np.memmap))
+
+    def __len__(self):
+        return len(self.base)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return ScaledArray(self.base[key], self.scale)
+        out = np.array(self.base[key], dtype=self.dtype)
+        if self.scale != 1:
+            out *= self.scale
+        return out
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __array__(self, dtype=None, copy=None):
+        out = self[...]
+        return out if dtype is None else out.astype(dtype, copy=False)
+
+    def __repr__(self):
+        kind = "lazy" if self.lazy else "mapped" if self.mapped else "in-memory"
+        return f"ScaledArray({kind}, shape={self.shape}, scale={self.scale:g})"
+
+
+def scaled_values(ds, name: str, scale: float = 1.0, dims=None) -> ScaledArray:
+    """
+    ``ds[name].values * scale`` as a ``ScaledArray`` – memory‑mapped from the
+    source file when possible, left unread (out‑of‑core) when it is at least
+    ``OUT_OF_CORE_BYTES``.  With ``dims`` the result has that dimension
+    order (``...`` allowed, as in ``DataArray.transpose``).
+    """
+    var = ds[name]
+    ordered = var if dims is None else var.transpose(*dims)
+    if DATASET_MMAP and ordered.dims == var.dims:       # on‑disk order → can be mapped
+        mapped = map_variable(ds.encoding.get("source"), name, var)
+        if mapped is not None:
+            return ScaledArray(mapped, scale)
+    if var.nbytes >= OUT_OF_CORE_BYTES:
+        return ScaledArray(ordered.variable, scale)    # read when indexed (file reopened)
+    return ScaledArray(ordered.values, scale)
+
+
+def map_variable(path, name: str, var=None) -> np.ndarray | None:
+    """
+    Read‑only array view of ``name``'s bytes in ``path``, or None when the
+    variable is not stored contiguously (or is below ``MMAP_MIN_BYTES``).
+    With ``var`` (the decoded xarray variable) the mapping is only used if
+    decoding would not change the values: same dtype / shape, no packing,
+    no integer fill value.
+    """
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (os.fspath(path), st.st_mtime_ns, st.st_size)
+    entry = _layout(key).get(name)
+    if entry is None:
+        return None
+    offset, dtype, shape = entry
+    if int(np.prod(shape)) * dtype.itemsize < MMAP_MIN_BYTES:
+        return None
+    if var is not None and not _decodes_to_raw(var, dtype, shape):
+        return None
+    mm = _mapping(key)
+    if mm is None:
+        return None
+    arr = np.frombuffer(mm, dtype=dtype, count=int(np.prod(shape)), offset=offset)
+    return arr.reshape(shape)
+
+
+def _decodes_to_raw(var, dtype: np.dtype, shape: tuple) -> bool:
+    enc = var.encoding
+    if var.shape != tuple(shape) or var.dtype != dtype.newbyteorder("="):
+        return False
+    if "scale_factor" in enc or "add_offset" in enc:
+        return False
+    fill = enc.get("_FillValue", var.attrs.get("_FillValue"))
+    if fill is not None and not (dtype.kind == "f" and np.isnan(fill)):
+        return False                    # masking would replace values by NaN
+    return True
+
+
+def _mapping(key: tuple) -> mmap.mmap | None:
+    with _lock:
+        mm = _maps.get(key)
+        if mm is None:
+            try:
+                with open(key[0], "rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return None
+            _maps[key] = mm             # released with the last array that uses it
+        return mm
+
+
+def _layout(key: tuple) -> dict:
+    with _lock:
+        if key in _layouts:
+            return _layouts[key]
+    path = key[0]
+    try:
+        with open(path, "rb") as f:
+            magic = f.read(4)
+            if magic[:3] == b"CDF":
+                layout = _cdf_layout(f, magic[3])
+            elif magic == b"\x89HDF":
+                layout = _hdf5_layout(path)
+            else:
+                layout = {}
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        print(f"[mapped_arrays] cannot read layout of {path}: {e}")
+        layout = {}
+    size = key[2]
+    layout = {n: e for n, e in layout.items()
+              if e[0] + int(np.prod(e[2])) * e[1].itemsize <= size}
+    with _lock:
+        for old in [k for k in _layouts if k[0] == path]:     # previous file versions
+            del _layouts[old]
+        _layouts[key] = layout
+    return layout
+
+
+# ────────────────────────────────────────────────────────────────────
+# HDF5: contiguous datasets via h5py
+# ────────────────────────────────────────────────────────────────────
+def _hdf5_layout(path: str) -> dict:
+    try:
+        import h5py                     # installed with h5netcdf
+    except ImportError:
+        return {}
+    layout = {}
+    with h5py.File(path, "r") as f:
+        for name, obj in f.items():
+            if not isinstance(obj, h5py.Dataset) or obj.dtype.kind not in "biuf":
+                continue
+            if obj.chunks is not None or obj.ndim == 0:
+                continue                # chunked (maybe filtered) or scalar
+            offset = obj.id.get_offset()
+            if offset is not None:      # None → never written
+                layout[name] = (offset, obj.dtype, obj.shape)
+    return layout
+
+
+# ────────────────────────────────────────────────────────────────────
+# netCDF‑3 (classic / 64‑bit offset / CDF‑5): fixed‑size variables
+# ────────────────────────────────────────────────────────────────────
+_CDF_TYPES = {1: "i1", 2: "S1", 3: ">i2", 4: ">i4", 5: ">f4", 6: ">f8",
+              7: "u1", 8: ">u2", 9: ">u4", 10: ">i8", 11: ">u8"}
+_NC_DIMENSION, _NC_VARIABLE, _NC_ATTRIBUTE = 10, 11, 12
+
+
+def _cdf_layout(f, version: int) -> dict:
+    if version not in (1, 2, 5):
+        return {}
+    wide = version == 5                 # CDF‑5: 64‑bit counts
+
+    def read(fmt):
+        size = struct.calcsize(fmt)
+        return struct.unpack(fmt, f.read(size))[0]
+
+    def count():
+        return read(">q" if wide else ">i")
+
+    def name():
+        n = count()
+        s = f.read(n)
+        f.read(-n % 4)
+        return s.decode("utf-8")
+
+    def skip_attributes():
+        read(">i")                      # NC_ATTRIBUTE or ABSENT
+        for _ in range(count()):
+            name()
+            itemsize = np.dtype(_CDF_TYPES[read(">i")]).itemsize
+            n = count() * itemsize
+            f.seek(n + (-n % 4), os.SEEK_CUR)
+
+    count()                             # numrecs
+    read(">i")                          # NC_DIMENSION or ABSENT
+    dims = []
+    for _ in range(count()):
+        name()
+        dims.append(count())            # 0 → the unlimited (record) dimension
+    skip_attributes()                   # global attributes
+
+    layout = {}
+    read(">i")                          # NC_VARIABLE or ABSENT
+    for _ in range(count()):
+        vname = name()
+        ndim  = count()
+        shape = tuple(dims[count()] for _ in range(ndim))
+        skip_attributes()
+        dtype = np.dtype(_CDF_TYPES[read(">i")])
+        count()                         # vsize
+        begin = read(">i" if version == 1 else ">q")
+        if 0 in shape or not shape or dtype.kind not in "biuf":
+            continue                    # record (interleaved), scalar or char variable
+        layout[vname] = (begin, dtype, shape)
+    return layout
@@ -0,0 +1,96 @@
+# ======================================================================
+#  metadata.py
+# ======================================================================
+"""
+Key‑selective access to the JSON files of an experiment run
+===========================================================
+* ``json_get(path, "fit_results", "q1")`` / ``json_select(path, keys, …)``
+  return only the values a view asks for – node.json, data.json and
+  quam_state/*.json are never kept whole in loader results
+* One parse per file version serves every key path requested together;
+  selected values are cached by (path, key path) and revalidated with the
+  file's mtime / size → a repeated lookup costs one ``stat``
+* Uses ``orjson`` when installed (several × faster on the 250 kB
+  quam_state/state.json), the standard ``json`` module otherwise
+* Bound : ``METADATA_CACHE_ENTRIES`` selected values, least recently used
+  first
+--------------------------------------------------------------------
+Returned values are shared between callers and must not be modified.
+"""
+from __future__ import annotations
+import json, os, threading
+from collections import OrderedDict
+
+try:                                    # optional: pip install orjson
+    import orjson
+    _loads = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:                     # pragma: no cover
+    _loads = json.loads
+    JSON_BACKEND = "json"
+
+METADATA_CACHE_ENTRIES = 1024
+_MISSING = object()
+
+_cache: "OrderedDict[tuple, tuple]" = OrderedDict()     # (path, keys) → (version, value)
+_lock = threading.Lock()
+_stats = dict(hits=0, parses=0)
+
+
+def json_get(path, *keys, default=None):
+    """
+    Value at ``keys`` in the JSON file ``path`` (``default`` if a key is
+    missing).  Raises OSError / ValueError when the file is unreadable.
+    """
+    return json_select(path, keys, default=default)[0]
+
+
+def json_select(path, *key_paths, default=None) -> list:
+    """``[json_get(path, *keys) for keys in key_paths]`` with a single parse."""
+    path = os.path.abspath(os.fspath(path))
+    st = os.stat(path)
+    version = (st.st_mtime_ns, st.st_size)
+    key_paths = [tuple(keys) for keys in key_paths]
+
+    values, missing = [], []
+    with _lock:
+        for keys in key_paths:
+            entry = _cache.get((path, keys))
+            if entry is not None and entry[0] == version:
+                _cache.move_to_end((path, keys))
+                _stats["hits"] += 1
+                values.append(entry[1])
+            else:
+                values.append(_MISSING)
+                missing.append(keys)
+    if missing:
+        with open(path, "rb") as f:
+            doc = _loads(f.read())
+        with _lock:
+            _stats["parses"] += 1
+            for i, keys in enumerate(key_paths):
+                if values[i] is _MISSING:
+                    values[i] = _lookup(doc, keys)
+                    _cache[(path, keys)] = (version, values[i])
+                    _cache.move_to_end((path, keys))
+            while len(_cache) > METADATA_CACHE_ENTRIES:
+                _cache.popitem(last=False)
+    return [default if v is _MISSING else v for v in values]
+
+
+def _lookup(doc, keys: tuple):
+    for key in keys:
+        if isinstance(doc, dict):
+            doc = doc.get(key, _MISSING)
+        elif isinstance(doc, list) and isinstance(key, int) and -len(doc) <= key < len(doc):
+            doc = doc[key]
+        else:
+            return _MISSING
+        if doc is _MISSING:
+            break
+    return doc
+
+
+def metadata_stats() -> dict:
+    with _lock:
+        return dict(backend=JSON_BACKEND, entries=len(_cache), **_stats)
@@ -7,31 +7,23 @@ Dash module for **Power‑Rabi** calibration experiments
 --------------------------------------------------------------------
 """
 import dash
-from dash import dcc, html, Input, Output, State, MATCH
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
-import plotly.subplots as subplots
-import xarray as xr
 import numpy as np
-import json, os
+import os
 from pathlib import Path
 
-# -------------------------------------------------------------------
-# Common helper: H5 file loader
-# -------------------------------------------------------------------
-def open_xr_dataset(path, engines=("h5netcdf", "netcdf4", None)):
-    last_err = None
-    for eng in engines:
-        try:
-            return xr.open_dataset(path, engine=eng)
-        except Exception as e:
-            last_err = e
-    raise last_err
+from experiments.data_cache import cached_loader
+from experiments.figure_cache import cached_figure
+from experiments.grid_figure import GridFigure
+from experiments.dataset_io import read_files
 
 
 # -------------------------------------------------------------------
 # 1. Data Loader
 # -------------------------------------------------------------------
+@cached_loader
 def load_prabi_data(folder):
     """
     folder (str | Path) → dict or None
@@ -46,8 +38,7 @@ def load_prabi_data(folder):
         print(f"[load_prabi_data] missing files in {folder}")
         return None
 
-    ds_raw = open_xr_dataset(paths["ds_raw.h5"])
-    ds_fit = open_xr_dataset(paths["ds_fit.h5"])
+    ds_raw, ds_fit = read_files(paths["ds_raw.h5"], paths["ds_fit.h5"])
 
     # Main common variables
     qubits = ds_raw["qubit"].values
@@ -64,17 +55,10 @@ def load_prabi_data(folder):
     # Check which data variables exist
     vars_avail = [v for v in ("I", "Q", "state") if v in ds_raw.data_vars]
 
-    # JSONs are stored for debugging purposes only
-    with open(paths["data.json"], "r", encoding="utf-8") as f:
-        data_json = json.load(f)
-    with open(paths["node.json"], "r", encoding="utf-8") as f:
-        node_json = json.load(f)
-
     return dict(
         qubits=qubits, n=n_q, is_1d=is_1d, nb_pulses=nb_of_pulses,
         full_amp_mV=full_amp_mV, ds_raw=ds_raw, ds_fit=ds_fit,
         success=success, opt_amp_mV=opt_amp_mV, vars_available=vars_avail,
-        data_json=data_json, node_json=node_json,
     )
 
 
@@ -101,7 +85,7 @@ def create_prabi_plot(data, var_key):
     n_cols = 2
     n_rows = int(np.ceil(n_q / n_cols))
 
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows, cols=n_cols,
         subplot_titles=[str(q) for q in qubits],
         vertical_spacing=0.03, horizontal_spacing=0.07,
@@ -123,10 +107,10 @@ def create_prabi_plot(data, var_key):
         if is_1d:
             y = da.squeeze().values
             fig.add_trace(
-                go.Scatter(x=x_amp, y=y[::-1], mode="lines",
-                           line=dict(width=1, color="blue"),
-                           name="Data" if idx == 0 else None,
-                           showlegend=(idx == 0)),
+                dict(type="scatter", x=x_amp, y=y[::-1], mode="lines",
+                     line=dict(width=1, color="blue"),
+                     name="Data" if idx == 0 else None,
+                     showlegend=(idx == 0)),
                 row=row, col=col,
             )
             ylabel = {"I": "Rot I [mV]", "Q": "Rot Q [mV]",
@@ -140,7 +124,8 @@ def create_prabi_plot(data, var_key):
                               line=dict(color="red", dash="dash", width=1),
                               row=row, col=col)
                 if idx == 0:
-                    fig.add_trace(go.Scatter(
+                    fig.add_trace(dict(
+                        type="scatter",
                         x=[None], y=[None], mode="lines",
                         line=dict(color="red", dash="dash", width=1),
                         name="opt. amp"), row=row, col=col)
@@ -148,7 +133,8 @@ def create_prabi_plot(data, var_key):
         else:   # 2‑D colormesh
             z = da.transpose("nb_of_pulses", "amp_prefactor").values  # (P, A)
 
-            hm = go.Heatmap(
+            hm = dict(
+                type="heatmap",
                 x=x_amp, y=nb_pulses, z=z[::-1],
                 coloraxis="coloraxis", showscale=show_cbar,
             )
@@ -158,7 +144,8 @@ def create_prabi_plot(data, var_key):
             # Optimal amplitude line
             if success[idx] and not np.isnan(opt_amp_mv[idx]):
                 fig.add_trace(
-                    go.Scatter(
+                    dict(
+                        type="scatter",
                         x=[opt_amp_mv[idx]] * len(nb_pulses),
                         y=nb_pulses,
                         mode="lines",
@@ -189,7 +176,7 @@ def create_prabi_plot(data, var_key):
                 colorscale="Viridis"  
     ),
     )
-    return fig
+    return fig.to_dict()
 
 
 # -------------------------------------------------------------------
@@ -227,7 +214,7 @@ def create_prabi_layout(folder):
                          html.Pre(folder)])
 
     default_var = data["vars_available"][0]
-    init_fig = create_prabi_plot(data, default_var)
+    init_fig = update_prabi_plot(default_var, {"folder": folder})
 
     var_options = [{"label": f" {v}", "value": v} for v in data["vars_available"]]
 
@@ -289,15 +276,15 @@ def create_prabi_layout(folder):
 # -------------------------------------------------------------------
 # 5. Callbacks
 # -------------------------------------------------------------------
-def register_prabi_callbacks(app: dash.Dash):
+@cached_figure
+def update_prabi_plot(var_key, store):
+    if not store:
+        return go.Figure()
+    data = load_prabi_data(store["folder"])
+    return create_prabi_plot(data, var_key)
 
-    @app.callback(
-        Output({"type": "prabi-plot", "index": MATCH}, "figure"),
-        Input({"type": "prabi-var",  "index": MATCH}, "value"),
-        State({"type": "prabi-data", "index": MATCH}, "data"),
-    )
-    def _update_plot(var_key, store):
-        if not store:
-            return go.Figure()
-        data = load_prabi_data(store["folder"])
-        return create_prabi_plot(data, var_key)
+
+def register_prabi_callbacks(app: dash.Dash):
+    """Register ``update_prabi_plot`` (dependencies listed in experiments/registry.py)."""
+    from experiments.registry import register_callbacks
+    register_callbacks(app, "prabi")
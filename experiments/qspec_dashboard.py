@@ -11,30 +11,23 @@ Dash module for **Qubit Spectroscopy** experiments
 """
 
 import dash
-from dash import dcc, html, Input, Output, State, MATCH
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
-import plotly.subplots as subplots
-import xarray as xr
 import numpy as np
-import json, os
+import os
 from pathlib import Path
 
-# -------------------------------------------------------------------
-# Safe xarray loading
-# -------------------------------------------------------------------
-def open_xr_dataset(path, engines=("h5netcdf", "netcdf4", None)):
-    last_err = None
-    for eng in engines:
-        try:
-            return xr.open_dataset(path, engine=eng)
-        except Exception as e:
-            last_err = e
-    raise last_err
+from experiments.data_cache import cached_loader
+from experiments.figure_cache import cached_figure
+from experiments.grid_figure import GridFigure
+from experiments.dataset_io import read_files
+
 
 # -------------------------------------------------------------------
 # 1. Data Loading
 # -------------------------------------------------------------------
+@cached_loader
 def load_qspec_data(folder):
     folder = os.path.normpath(folder)
     req = [Path(folder, f) for f in ("ds_raw.h5", "ds_fit.h5", "data.json", "node.json")]
@@ -42,13 +35,7 @@ def load_qspec_data(folder):
         print(f"[load_qspec_data] missing file in {folder}")
         return None
 
-    ds_raw = open_xr_dataset(req[0])
-    ds_fit = open_xr_dataset(req[1])
-
-    with open(req[2], "r", encoding="utf-8") as f:
-        data_json = json.load(f)
-    with open(req[3], "r", encoding="utf-8") as f:
-        node_json = json.load(f)
+    ds_raw, ds_fit = read_files(*req[:2])
 
     qubits   = ds_raw["qubit"].values if "qubit" in ds_raw else ds_fit["qubit"].values
     n_q      = len(qubits)
@@ -75,7 +62,7 @@ def load_qspec_data(folder):
         freq_ghz=full_freq_ghz, I_rot=I_rot_mv,
         amp=amplitude, pos=position, width=width, base_line=base_line,
         res_freq=res_freq, fwhm=fwhm_mhz, x180=x180_amp,
-        ds_raw=ds_raw, ds_fit=ds_fit, data_json=data_json, node_json=node_json,
+        ds_raw=ds_raw, ds_fit=ds_fit,
     )
 
 # -------------------------------------------------------------------
@@ -94,9 +81,9 @@ def create_qspec_plot(data, view="rf"):
 
     n_cols = 2  # Changed from 1 to 2
     n_rows = int(np.ceil(data["n"] / n_cols))  # Calculate rows needed for 2 columns
-    fig = subplots.make_subplots(rows=n_rows, cols=n_cols, shared_xaxes=False,
-                                 subplot_titles=[f"{q}" for q in data["qubits"]],
-                                 vertical_spacing=0.04)
+    fig = GridFigure(rows=n_rows, cols=n_cols,
+                     subplot_titles=[f"{q}" for q in data["qubits"]],
+                     vertical_spacing=0.04)
 
     for i, q in enumerate(data["qubits"]):
         row = i // n_cols + 1  # Calculate row position
@@ -105,20 +92,20 @@ def create_qspec_plot(data, view="rf"):
         if view == "rf":
             x = data["freq_ghz"][i]
             y = data["I_rot"][i]
-            fig.add_trace(go.Scatter(x=x, y=y, mode="lines",
-                                     line=dict(color="blue", width=1),
-                                     name="Data" if i == 0 else None,
-                                     showlegend=(i == 0)),
+            fig.add_trace(dict(type="scatter", x=x, y=y, mode="lines",
+                               line=dict(color="blue", width=1),
+                               name="Data" if i == 0 else None,
+                               showlegend=(i == 0)),
                           row=row, col=col)
             fig.update_xaxes(title_text="RF frequency [GHz]" if row == n_rows else None, row=row, col=col)
             fig.update_yaxes(title_text="Rotated I [mV]", row=row, col=col)
         else:  # detuning
             x_det = data["det_mhz"]
             y_det = data["I_rot"][i]
-            fig.add_trace(go.Scatter(x=x_det, y=y_det, mode="lines",
-                                     line=dict(color="blue", width=1),
-                                     name="Data" if i == 0 else None,
-                                     showlegend=(i == 0)),
+            fig.add_trace(dict(type="scatter", x=x_det, y=y_det, mode="lines",
+                               line=dict(color="blue", width=1),
+                               name="Data" if i == 0 else None,
+                               showlegend=(i == 0)),
                           row=row, col=col)
 
             # fit
@@ -130,10 +117,10 @@ def create_qspec_plot(data, view="rf"):
                                         data["pos"][i],
                                         data["width"][i]/2,      # HWHM
                                         offset_interp) * 1e3
-                fig.add_trace(go.Scatter(x=x_fit/1e6, y=y_fit, mode="lines",
-                                         line=dict(color="red", dash="dash"),
-                                         name="Fit" if i == 0 else None,
-                                         showlegend=(i == 0)),
+                fig.add_trace(dict(type="scatter", x=x_fit/1e6, y=y_fit, mode="lines",
+                                   line=dict(color="red", dash="dash"),
+                                   name="Fit" if i == 0 else None,
+                                   showlegend=(i == 0)),
                               row=row, col=col)
 
             fig.update_xaxes(title_text="Detuning [MHz]" if row == n_rows else None, row=row, col=col)
@@ -143,7 +130,7 @@ def create_qspec_plot(data, view="rf"):
     fig.update_layout(title=title, height=400*n_rows,  # Changed from 250 to 400
                       template="dashboard_dark",
                       legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
-    return fig
+    return fig.to_dict()
 
 # -------------------------------------------------------------------
 # 4. Summary Table
@@ -176,7 +163,7 @@ def create_qspec_layout(folder):
     if not data:
         return html.Div([dbc.Alert("Failed to load data", color="danger"), html.Pre(folder)])
 
-    init_fig = create_qspec_plot(data, "rf")
+    init_fig = update_qspec_plot("rf", {"folder": folder})
     return html.Div(
         [
             dcc.Store(id={"type": "qspec-data", "index": uid}, data={"folder": folder}),
@@ -236,14 +223,15 @@ def create_qspec_layout(folder):
 # -------------------------------------------------------------------
 # 6. Callback Registration
 # -------------------------------------------------------------------
+@cached_figure
+def update_qspec_plot(view, store):
+    if not store:
+        return go.Figure()
+    data = load_qspec_data(store["folder"])
+    return create_qspec_plot(data, view)
+
+
 def register_qspec_callbacks(app):
-    @app.callback(
-        Output({"type": "qspec-plot", "index": MATCH}, "figure"),
-        Input({"type": "qspec-view",  "index": MATCH}, "value"),
-        State({"type": "qspec-data",  "index": MATCH}, "data"),
-    )
-    def _update(view, store):
-        if not store:
-            return go.Figure()
-        data = load_qspec_data(store["folder"])
-        return create_qspec_plot(data, view)
+    """Register ``update_qspec_plot`` (dependencies listed in experiments/registry.py)."""
+    from experiments.registry import register_callbacks
+    register_callbacks(app, "qspec")
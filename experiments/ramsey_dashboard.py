@@ -13,26 +13,19 @@ Date   : 2025‑06‑22
 """
 from __future__ import annotations
 import dash
-from dash import dcc, html, Input, Output, State, MATCH
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
-import plotly.subplots as subplots
-import xarray as xr
 import numpy as np
-import json, os
+import os
 from pathlib import Path
 
-# ────────────────────────────────────────────────────────────────────
-# Safe xarray open_dataset
-# ────────────────────────────────────────────────────────────────────
-def open_xr_dataset(path, engines=("h5netcdf", "netcdf4", None)):
-    last_err = None
-    for eng in engines:
-        try:
-            return xr.open_dataset(path, engine=eng)
-        except Exception as e:
-            last_err = e
-    raise last_err
+from experiments.data_cache import cached_loader
+from experiments.figure_cache import cached_figure
+from experiments.client_views import initial_figure, views_store
+from experiments.grid_figure import GridFigure
+from experiments.dataset_io import read_files
+
 
 # ────────────────────────────────────────────────────────────────────
 # Ramsey model: exp‑decay × cos
@@ -46,6 +39,7 @@ def exp_cos_gamma(t_ns, a, f_cyc_per_ns, phi_rad, offset, gamma_1_over_ns):
 # ────────────────────────────────────────────────────────────────────
 # 1. Data Loading
 # ────────────────────────────────────────────────────────────────────
+@cached_loader
 def load_ramsey_data(folder: str | Path) -> dict | None:
     folder = os.path.normpath(str(folder))
     paths = {
@@ -58,13 +52,7 @@ def load_ramsey_data(folder: str | Path) -> dict | None:
         print(f"[load_ramsey_data] missing files in {folder}")
         return None
 
-    ds_raw = open_xr_dataset(paths["ds_raw"])
-    ds_fit = open_xr_dataset(paths["ds_fit"])
-
-    with open(paths["data_js"], "r", encoding="utf-8") as f:
-        data_json = json.load(f)
-    with open(paths["node_js"], "r", encoding="utf-8") as f:
-        node_json = json.load(f)
+    ds_raw, ds_fit = read_files(paths["ds_raw"], paths["ds_fit"])
 
     qubits   = ds_raw["qubit"].values
     n_q      = len(qubits)
@@ -106,13 +94,12 @@ def load_ramsey_data(folder: str | Path) -> dict | None:
         ds_raw=ds_raw, ds_fit=ds_fit, success=success,
         f_det_mhz=f_det_mhz, tau_ns=tau_ns,
         vars_available=vars_avail,
-        data_json=data_json, node_json=node_json,
     )
 
 # ────────────────────────────────────────────────────────────────────
 # 2. Plot Generation
 # ────────────────────────────────────────────────────────────────────
-def create_ramsey_plot(data: dict, var_key: str) -> go.Figure:
+def create_ramsey_plot(data: dict, var_key: str) -> dict:
     if not data or var_key not in data["vars_available"]:
         return go.Figure()
 
@@ -144,7 +131,7 @@ def create_ramsey_plot(data: dict, var_key: str) -> go.Figure:
 
     n_cols = 2
     n_rows = int(np.ceil(n_q / n_cols))
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows, cols=n_cols,
         subplot_titles=[str(q) for q in qubits],
         vertical_spacing=0.03, horizontal_spacing=0.07,
@@ -177,7 +164,8 @@ def create_ramsey_plot(data: dict, var_key: str) -> go.Figure:
                 ylabel = "|IQ| [mV]"
 
             fig.add_trace(
-                go.Scatter(
+                dict(
+                    type="scatter",
                     x=t_ns, y=y,
                     mode="markers",
                     marker=dict(size=5, color=color),
@@ -207,7 +195,8 @@ def create_ramsey_plot(data: dict, var_key: str) -> go.Figure:
                     if var_key in ("I", "Q", "amp"):
                         y_fit *= 1e3
                     fig.add_trace(
-                        go.Scatter(
+                        dict(
+                            type="scatter",
                             x=t_ns, y=y_fit,
                             mode="lines",
                             line=dict(color=color, dash="dash", width=1),
@@ -232,7 +221,7 @@ def create_ramsey_plot(data: dict, var_key: str) -> go.Figure:
         legend=dict(orientation="h", yanchor="bottom", y=1.02,
                     xanchor="right", x=1),
     )
-    return fig
+    return fig.to_dict()
 
 # ────────────────────────────────────────────────────────────────────
 # 3. Summary Table
@@ -272,7 +261,7 @@ def create_ramsey_layout(folder: str | Path):
                          html.Pre(str(folder))])
 
     default_var = data["vars_available"][0]
-    init_fig = create_ramsey_plot(data, default_var)
+    init_fig = initial_figure("ramsey", update_ramsey_plot, default_var, {"folder": str(folder)})
 
     var_opts = [{"label": f" {('|IQ|' if v=='amp' else v.upper()) if v!='state' else 'State'}",
                  "value": v}
@@ -282,6 +271,8 @@ def create_ramsey_layout(folder: str | Path):
         [
             dcc.Store(id={"type": "ramsey-data", "index": uid},
                       data={"folder": str(folder)}),
+            *views_store("ramsey", uid, update_ramsey_plot, data["vars_available"],
+                         {"folder": str(folder)}),
             dbc.Row(dbc.Col(html.H3(f"Ramsey (T2*) – {Path(folder).name}")),
                     className="mb-3"),
             dbc.Row(
@@ -333,14 +324,15 @@ def create_ramsey_layout(folder: str | Path):
 # ────────────────────────────────────────────────────────────────────
 # 5. Callbacks
 # ────────────────────────────────────────────────────────────────────
+@cached_figure
+def update_ramsey_plot(var_key, store):
+    if not store:
+        return go.Figure()
+    data = load_ramsey_data(store["folder"])
+    return create_ramsey_plot(data, var_key)
+
+
 def register_ramsey_callbacks(app: dash.Dash):
-    @app.callback(
-        Output({"type": "ramsey-plot", "index": MATCH}, "figure"),
-        Input({"type": "ramsey-var",  "index": MATCH}, "value"),
-        State({"type": "ramsey-data", "index": MATCH}, "data"),
-    )
-    def _update_plot(var_key, store):
-        if not store:
-            return go.Figure()
-        data = load_ramsey_data(store["folder"])
-        return create_ramsey_plot(data, var_key)
+    """Register ``update_ramsey_plot`` (dependencies listed in experiments/registry.py)."""
+    from experiments.registry import register_callbacks
+    register_callbacks(app, "ramsey")
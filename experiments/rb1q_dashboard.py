@@ -12,17 +12,21 @@ Rev.   : 2025‑06‑22
 """
 from __future__ import annotations
 
-import os, json
+import os
 from pathlib import Path
 from typing import Any
 
 import dash
-from dash import dcc, html, Input, Output, State, MATCH
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 import numpy as np
-import xarray as xr
 import plotly.graph_objs as go
-import plotly.subplots as subplots
+
+from experiments.data_cache import cached_loader
+from experiments.figure_cache import cached_figure
+from experiments.grid_figure import GridFigure
+from experiments.dataset_io import read_files
+from experiments.metadata import json_select
 
 
 # ────────────────────────────────────────────────────────────────────
@@ -32,18 +36,6 @@ PER_PAGE = 16           # qubits per page
 N_COLS   = 2            # subplot columns
 MAX_VALID_FIDELITY = 99.999999  # This value is considered unrealistic
 
-
-def open_xr_dataset(path: str, engines=("h5netcdf", "netcdf4", None)) -> xr.Dataset:
-    """Open xarray Dataset with automatic engine switching attempts."""
-    last_exc: Exception | None = None
-    for eng in engines:
-        try:
-            return xr.open_dataset(path, engine=eng)
-        except Exception as e:  # pragma: no cover
-            last_exc = e
-    raise last_exc if last_exc else RuntimeError(f"Cannot open dataset: {path}")
-
-
 def decay_exp(x: np.ndarray, a: float, offset: float, decay: float) -> np.ndarray:
     """RB decay model – offset + a·exp(decay·x)"""
     return offset + a * np.exp(decay * x)
@@ -52,6 +44,7 @@ def decay_exp(x: np.ndarray, a: float, offset: float, decay: float) -> np.ndarra
 # ────────────────────────────────────────────────────────────────────
 # 1. Data loader
 # ────────────────────────────────────────────────────────────────────
+@cached_loader
 def load_rb_data(folder: str | Path) -> dict[str, Any] | None:
     """
     Load 4 RB result files (ds_raw.h5, ds_fit.h5, data.json, node.json)
@@ -68,7 +61,6 @@ def load_rb_data(folder: str | Path) -> dict[str, Any] | None:
     rb_fidelity     ndarray        (q)     • 100 × (1 – error_per_gate)
     fit_a/offset/decay             (q)     • fit parameters
     ds_raw, ds_fit                original datasets (for use if needed)
-    data_json, node_json          metadata
     """
     folder = Path(folder).expanduser().resolve()
     paths = {
@@ -82,10 +74,7 @@ def load_rb_data(folder: str | Path) -> dict[str, Any] | None:
         return None
 
     # ── File loading ─────────────────────────────────────────────────
-    ds_raw  = open_xr_dataset(str(paths["ds_raw"]))
-    ds_fit  = open_xr_dataset(str(paths["ds_fit"]))
-    data_js = json.loads(paths["data_js"].read_text(encoding="utf-8"))
-    node_js = json.loads(paths["node_js"].read_text(encoding="utf-8"))
+    ds_raw, ds_fit = read_files(str(paths["ds_raw"]), str(paths["ds_fit"]))
 
     qubits = ds_fit.get("qubit", ds_raw["qubit"]).values.astype(str)
     n_q    = len(qubits)
@@ -129,10 +118,10 @@ def load_rb_data(folder: str | Path) -> dict[str, Any] | None:
 
     # ── RB fidelity (using error_per_gate) ─────────────────────────────
     rb_fid = np.full(n_q, np.nan)
-    for i, q in enumerate(qubits):
-        res = data_js.get("fit_results", {}).get(str(q), {})
-        if "error_per_gate" in res and res["error_per_gate"] is not None:
-            rb_fid[i] = 100.0 * (1.0 - float(res["error_per_gate"]))
+    epg = json_select(paths["data_js"], *[("fit_results", str(q), "error_per_gate") for q in qubits])
+    for i, e in enumerate(epg):
+        if e is not None:
+            rb_fid[i] = 100.0 * (1.0 - float(e))
 
     return dict(
         qubits=qubits, n=n_q,
@@ -140,7 +129,6 @@ def load_rb_data(folder: str | Path) -> dict[str, Any] | None:
         success=success, rb_fidelity=rb_fid,
         fit_a=fit_a, fit_offset=fit_offset, fit_decay=fit_decay,
         ds_raw=ds_raw, ds_fit=ds_fit,
-        data_json=data_js, node_json=node_js,
     )
 
 
@@ -166,8 +154,8 @@ def slice_page(data: dict[str, Any], page: int) -> dict[str, Any]:
 # ────────────────────────────────────────────────────────────────────
 # 2. Plot generation
 # ────────────────────────────────────────────────────────────────────
-def create_rb_plot(d: dict[str, Any]) -> go.Figure:
-    """Return Plotly subplots Figure (Data + Fit)."""
+def create_rb_plot(d: dict[str, Any]) -> dict:
+    """Return the subplot grid (Data + Fit) as a figure dict."""
     if not d:
         return go.Figure()
 
@@ -179,7 +167,7 @@ def create_rb_plot(d: dict[str, Any]) -> go.Figure:
     rb_fidelity   = d["rb_fidelity"]
 
     n_rows = int(np.ceil(n_q / N_COLS))
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows, cols=N_COLS,
         subplot_titles=[str(q) for q in qbs],
         vertical_spacing=0.03, horizontal_spacing=0.07,
@@ -191,7 +179,8 @@ def create_rb_plot(d: dict[str, Any]) -> go.Figure:
 
         # ── Raw data (markers) ────────────────────────────────────
         fig.add_trace(
-            go.Scatter(
+            dict(
+                type="scatter",
                 x=depths,
                 y=y_data[i],
                 mode="markers",
@@ -211,7 +200,8 @@ def create_rb_plot(d: dict[str, Any]) -> go.Figure:
         if fit_valid:
             y_fit = decay_exp(depths, fit_a[i], fit_o[i], fit_d[i])
             fig.add_trace(
-                go.Scatter(
+                dict(
+                    type="scatter",
                     x=depths, y=y_fit,
                     mode="lines",
                     line=dict(color="firebrick", dash="dash"),
@@ -235,7 +225,7 @@ def create_rb_plot(d: dict[str, Any]) -> go.Figure:
                     xanchor="right", x=1),
         margin=dict(t=60, l=50, r=30, b=50),
     )
-    return fig
+    return fig.to_dict()
 
 
 # ────────────────────────────────────────────────────────────────────
@@ -290,7 +280,7 @@ def create_rb_layout(folder: str | Path) -> html.Div:
                          html.Pre(str(folder))])
 
     n_pages = int(np.ceil(data["n"] / PER_PAGE))
-    init_fig = create_rb_plot(slice_page(data, 1))
+    init_fig = update_rb_plot(1, {"folder": str(folder)})
 
     # ── Pagination component ─────────────────────────────────────────
     page_selector = dbc.Pagination(
@@ -354,24 +344,19 @@ def create_rb_layout(folder: str | Path) -> html.Div:
 # ────────────────────────────────────────────────────────────────────
 # 5. Callback registration
 # ────────────────────────────────────────────────────────────────────
-def register_rb_callbacks(app: dash.Dash):
-    """
-    Register callbacks to Dash app instance.
-    Must call `register_rb_callbacks(app)` after app creation.
-    """
+@cached_figure
+def update_rb_plot(active_page: int, store: dict[str, str]) -> go.Figure | dict:
+    folder = store.get("folder")
+    if not folder:
+        return go.Figure()
+    data = load_rb_data(folder)
+    return create_rb_plot(slice_page(data, active_page or 1))
 
-    @app.callback(
-        Output({"type": "rb-plot", "index": MATCH}, "figure"),
-        Input({"type": "rb-page", "index": MATCH}, "active_page"),
-        State({"type": "rb-data", "index": MATCH}, "data"),
-        prevent_initial_call=True,
-    )
-    def _update_rb_plot(active_page: int, store: dict[str, str]) -> go.Figure:
-        folder = store.get("folder")
-        if not folder:
-            return go.Figure()
-        data = load_rb_data(folder)
-        return create_rb_plot(slice_page(data, active_page or 1))
+
+def register_rb_callbacks(app: dash.Dash):
+    """Register ``update_rb_plot`` (dependencies listed in experiments/registry.py)."""
+    from experiments.registry import register_callbacks
+    register_callbacks(app, "rb1q")
 
 
 # ────────────────────────────────────────────────────────────────────
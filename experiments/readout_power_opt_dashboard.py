@@ -14,15 +14,21 @@ Dash module for **Readout‑Power‑Optimization** experiments
 """
 from __future__ import annotations
 import dash
-from dash import dcc, html, Input, Output, State, MATCH
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
-import plotly.subplots as subplots
-import xarray as xr
 import numpy as np
-import json, os
+import os
 from pathlib import Path
 
+from experiments.data_cache import cached_loader
+from experiments.figure_cache import cached_figure
+from experiments.grid_figure import GridFigure
+from experiments.dataset_io import open_xr_dataset, read_files
+from experiments.metadata import json_select
+from experiments.mapped_arrays import ScaledArray, scaled_values
+from experiments.chunked import minmax, thin_step
+
 # ────────────────────────────────────────────────────────────────────
 # Global: layout/sizing
 # ────────────────────────────────────────────────────────────────────
@@ -35,30 +41,22 @@ PLOT_H_UNIT = {              # Fixed height per row (px)  ── adjust if neede
 }
 V_SPACE = 0.04               # Subplot vertical spacing
 H_SPACE = 0.07               # Subplot horizontal spacing
+BLOB_MAX_POINTS = 20_000     # out‑of‑core run, more shots per qubit → blob shows every k‑th shot
 
-# ────────────────────────────────────────────────────────────────────
-# Safe xarray.open_dataset
-# ────────────────────────────────────────────────────────────────────
-def open_xr_dataset(path, engines=("h5netcdf", "netcdf4", None)):
-    last = None
-    for eng in engines:
-        try:
-            return xr.open_dataset(path, engine=eng)
-        except Exception as e:
-            last = e
-    raise last
 
 # ────────────────────────────────────────────────────────────────────
 # 1. Data loader
 # ────────────────────────────────────────────────────────────────────
-def load_rpo_data(folder: str | Path) -> dict | None:
+@cached_loader
+def load_rpo_data(folder: str | Path, view: str = "assign") -> dict | None:
     """
     Return dict
-      qubits, n,
-      amp, fidelity, non_out, opt_amp,
-      gg, ge, eg, ee,
-      Ig, Ie, Qg, Qe, rus_thr, ge_thr,
-      readout_fidelity, success, has_iq
+      qubits, n, view, opt_amp, readout_fidelity, success, has_iq,
+      amp, fidelity, non_out                  (view "assign")
+      gg, ge, eg, ee                          (view "conf")
+      Ig, Ie, Qg, Qe, rus_thr, ge_thr         (view "blob", from ds_iq_blobs.h5;
+                                               shots as ``ScaledArray`` → mV)
+    Only ``view``'s variables are read; ds_iq_blobs.h5 is opened for "blob" only.
     """
     folder = os.path.normpath(str(folder))
     paths = {
@@ -72,63 +70,57 @@ def load_rpo_data(folder: str | Path) -> dict | None:
         print(f"[load_rpo_data] missing core files in {folder}")
         return None
 
-    ds_raw = open_xr_dataset(paths["ds_raw"])
-    ds_fit = open_xr_dataset(paths["ds_fit"])
-    with open(paths["data_js"], "r", encoding="utf-8") as f:
-        data_json = json.load(f)
+    ds_raw, ds_fit = read_files(paths["ds_raw"], paths["ds_fit"], lazy=True)
+    with ds_raw, ds_fit:
+        # ── Common metadata (summary table) ───────────────────────────
+        qubits = ds_raw["qubit"].values
+        n_q    = len(qubits)
+        success = ds_fit["success"].values if "success" in ds_fit else np.full(n_q, True)
+        opt_amp = ds_fit["optimal_amp"].values
+        has_iq  = os.path.exists(paths["ds_iq"])
+        d = dict(qubits=qubits, n=n_q, view=view, opt_amp=opt_amp,
+                 success=success, has_iq=has_iq)
 
-    # ── Common metadata ───────────────────────────────────────────────
-    qubits = ds_raw["qubit"].values
-    n_q    = len(qubits)
-    success = ds_fit["success"].values if "success" in ds_fit else np.full(n_q, True)
+        # ── 1) Assignment‑fidelity / non‑outliers ─────────────────
+        fit_data = None
+        if view == "assign" or "readout_fidelity" not in ds_fit:
+            fit_data = ds_fit["fit_data"].values            # (q, A, 2)
+        d["readout_fidelity"] = ds_fit["readout_fidelity"].values if "readout_fidelity" in ds_fit \
+                                else np.nanmax(fit_data[:, :, 0], axis=1)
+        if view == "assign":
+            d["amp"]      = ds_raw["readout_amplitude"].values      # shape (q, A)
+            d["fidelity"] = fit_data[:, :, 0]
+            d["non_out"]  = fit_data[:, :, 1]
 
-    # ── 1) Assignment‑fidelity / non‑outliers ─────────────────
-    amp = ds_raw["readout_amplitude"].values            # shape (q, A)
-    fit_data = ds_fit["fit_data"].values                # (q, A, 2)
-    fidelity   = fit_data[:, :, 0]
-    non_out    = fit_data[:, :, 1]
-    opt_amp    = ds_fit["optimal_amp"].values
-    readout_fidelity = ds_fit["readout_fidelity"].values if "readout_fidelity" in ds_fit \
-                       else np.nanmax(fidelity, axis=1)
-
-    # ── 2) Confusion‑matrix ───────────────────────────────────
-    if all(k in ds_fit for k in ("gg", "ge", "eg", "ee")):
-        gg, ge, eg, ee = (ds_fit[k].values for k in ("gg", "ge", "eg", "ee"))
-    else:
-        # fallback → data_json["fit_results"][qubit]['confusion_matrix']
-        gg = np.zeros(n_q); ge = np.zeros(n_q); eg = np.zeros(n_q); ee = np.zeros(n_q)
-        for i, q in enumerate(qubits):
-            cm = np.array(data_json["fit_results"][str(q)]["confusion_matrix"])
-            gg[i], ge[i], eg[i], ee[i] = cm[0, 0], cm[0, 1], cm[1, 0], cm[1, 1]
+        # ── 2) Confusion‑matrix ───────────────────────────────────
+        if view == "conf":
+            if all(k in ds_fit for k in ("gg", "ge", "eg", "ee")):
+                d["gg"], d["ge"], d["eg"], d["ee"] = (ds_fit[k].values for k in ("gg", "ge", "eg", "ee"))
+            else:
+                # fallback → data_json["fit_results"][qubit]['confusion_matrix']
+                cms = json_select(paths["data_js"],
+                                  *[("fit_results", str(q), "confusion_matrix") for q in qubits])
+                gg = np.zeros(n_q); ge = np.zeros(n_q); eg = np.zeros(n_q); ee = np.zeros(n_q)
+                for i, cm in enumerate(cms):
+                    cm = np.array(cm)
+                    gg[i], ge[i], eg[i], ee[i] = cm[0, 0], cm[0, 1], cm[1, 0], cm[1, 1]
+                d.update(gg=gg, ge=ge, eg=eg, ee=ee)
 
     # ── 3) IQ‑blob (optional ds_iq_blobs.h5) ───────────────────
-    has_iq = os.path.exists(paths["ds_iq"])
-    if has_iq:
-        ds_iq = open_xr_dataset(paths["ds_iq"])
-        Ig = ds_iq["Ig_rot"].values * 1e3
-        Ie = ds_iq["Ie_rot"].values * 1e3
-        Qg = ds_iq["Qg_rot"].values * 1e3
-        Qe = ds_iq["Qe_rot"].values * 1e3
-        rus_thr = ds_iq["rus_threshold"].values * 1e3
-        ge_thr  = ds_iq["ge_threshold"].values  * 1e3
-    else:
-        # Minimal size placeholder (skip scatter plot)
-        Ig = Ie = Qg = Qe = rus_thr = ge_thr = None
-
-    return dict(
-        qubits=qubits, n=n_q,
-        amp=amp, fidelity=fidelity, non_out=non_out, opt_amp=opt_amp,
-        gg=gg, ge=ge, eg=eg, ee=ee,
-        Ig=Ig, Ie=Ie, Qg=Qg, Qe=Qe, rus_thr=rus_thr, ge_thr=ge_thr,
-        readout_fidelity=readout_fidelity, success=success, has_iq=has_iq,
-    )
+    if view == "blob" and has_iq:
+        with open_xr_dataset(paths["ds_iq"]) as ds_iq:
+            for k in ("Ig", "Ie", "Qg", "Qe"):
+                d[k] = scaled_values(ds_iq, f"{k}_rot", 1e3)      # mapped if large
+            d["rus_thr"] = ds_iq["rus_threshold"].values * 1e3
+            d["ge_thr"]  = ds_iq["ge_threshold"].values  * 1e3
+    return d
 
 # ────────────────────────────────────────────────────────────────────
 # 1‑B. Pagination helper
 # ────────────────────────────────────────────────────────────────────
 def slice_page(data: dict, page: int) -> dict:
     s = slice((page-1)*PER_PAGE, min(page*PER_PAGE, data["n"]))
-    copy = {k: (v[s] if isinstance(v, np.ndarray) else v) for k, v in data.items()}
+    copy = {k: (v[s] if isinstance(v, (np.ndarray, ScaledArray)) else v) for k, v in data.items()}
     copy["qubits"] = data["qubits"][s]
     copy["n"]      = len(copy["qubits"])
     return copy
@@ -136,10 +128,10 @@ def slice_page(data: dict, page: int) -> dict:
 # ────────────────────────────────────────────────────────────────────
 # 2‑A. Assignment‑plot
 # ────────────────────────────────────────────────────────────────────
-def plot_assignment(d: dict) -> go.Figure:
+def plot_assignment(d: dict) -> dict:
     qbs, n_q = d["qubits"], d["n"]
     n_rows = int(np.ceil(n_q / N_COLS))
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows, cols=N_COLS,
         subplot_titles=[str(q) for q in qbs],
         vertical_spacing=V_SPACE, horizontal_spacing=H_SPACE,
@@ -148,22 +140,22 @@ def plot_assignment(d: dict) -> go.Figure:
     for i, q in enumerate(qbs):
         r, c = divmod(i, N_COLS); row, col = r+1, c+1
         x = d["amp"][i]
-        fig.add_trace(go.Scatter(x=x, y=d["fidelity"][i], mode="lines",
-                                 line=dict(color="blue", width=1.5),
-                                 name="readout fidelity" if i==0 else None,
-                                 showlegend=i==0),
+        fig.add_trace(dict(type="scatter", x=x, y=d["fidelity"][i], mode="lines",
+                           line=dict(color="blue", width=1.5),
+                           name="readout fidelity" if i==0 else None,
+                           showlegend=i==0),
                       row=row, col=col)
-        fig.add_trace(go.Scatter(x=x, y=d["non_out"][i], mode="lines",
-                                 line=dict(color="red", width=1.5),
-                                 name="non‑outliers" if i==0 else None,
-                                 showlegend=i==0),
+        fig.add_trace(dict(type="scatter", x=x, y=d["non_out"][i], mode="lines",
+                           line=dict(color="red", width=1.5),
+                           name="non‑outliers" if i==0 else None,
+                           showlegend=i==0),
                       row=row, col=col)
         fig.add_vline(x=d["opt_amp"][i], line=dict(color="black", dash="dash"),
                       row=row, col=col)
         if i==0:
-            fig.add_trace(go.Scatter(x=[None], y=[None], mode="lines",
-                                     line=dict(color="black", dash="dash"),
-                                     name="optimal readout amplitude"),
+            fig.add_trace(dict(type="scatter", x=[None], y=[None], mode="lines",
+                               line=dict(color="black", dash="dash"),
+                               name="optimal readout amplitude"),
                           row=row, col=col)
         if row==n_rows:
             fig.update_xaxes(title_text="Relative power", row=row, col=col)
@@ -178,15 +170,15 @@ def plot_assignment(d: dict) -> go.Figure:
         legend=dict(orientation="h", yanchor="bottom", y=1.02,
                     xanchor="right", x=1),
     )
-    return fig
+    return fig.to_dict()
 
 # ────────────────────────────────────────────────────────────────────
 # 2‑B. Confusion‑matrix
 # ────────────────────────────────────────────────────────────────────
-def plot_confusion(d: dict) -> go.Figure:
+def plot_confusion(d: dict) -> dict:
     qbs, n_q = d["qubits"], d["n"]
     n_rows = int(np.ceil(n_q / N_COLS))
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows, cols=N_COLS,
         subplot_titles=[str(q) for q in qbs],
         vertical_spacing=V_SPACE, horizontal_spacing=H_SPACE,
@@ -196,7 +188,8 @@ def plot_confusion(d: dict) -> go.Figure:
         z = np.array([[d["gg"][i], d["ge"][i]],
                       [d["eg"][i], d["ee"][i]]])
         txt = np.vectorize(lambda p:f"{p*100:.1f}%")(z)
-        fig.add_trace(go.Heatmap(
+        fig.add_trace(dict(
+            type="heatmap",
             z=z[::-1], text=txt[::-1], texttemplate="%{text}",
             textfont=dict(size=18),
             coloraxis="coloraxis", showscale=i==0, zmin=0, zmax=1),
@@ -213,49 +206,53 @@ def plot_confusion(d: dict) -> go.Figure:
         height=PLOT_H_UNIT["conf"]*n_rows,
         template="dashboard_dark",
     )
-    return fig
+    return fig.to_dict()
 
 # ────────────────────────────────────────────────────────────────────
 # 2‑C. IQ‑blob scatter
 # ────────────────────────────────────────────────────────────────────
-def plot_blob(d: dict) -> go.Figure:
+def plot_blob(d: dict) -> dict:
     if not d["has_iq"]:
         return go.Figure(layout=dict(
             title="IQ data unavailable in this run – ds_iq_blobs.h5 not found"))
     qbs, n_q = d["qubits"], d["n"]
     n_rows = int(np.ceil(n_q / N_COLS))
-    fig = subplots.make_subplots(
+    shots = [d[k] for k in ("Ig", "Qg", "Ie", "Qe")]
+    # out‑of‑core run → every step‑th shot only (noted in each subplot title)
+    step = thin_step(shots[0], BLOB_MAX_POINTS) if any(a.lazy for a in shots) else 1
+    note = f" (every {step}th shot)" if step > 1 else ""
+    fig = GridFigure(
         rows=n_rows, cols=N_COLS,
-        subplot_titles=[str(q) for q in qbs],
+        subplot_titles=[f"{q}{note}" for q in qbs],
         vertical_spacing=V_SPACE, horizontal_spacing=H_SPACE,
     )
+    # common axis ranges of the page, streamed over the shots
+    x_min, x_max = (v*1.05 for v in minmax(d["Ig"], d["Ie"]))
+    y_min, y_max = (v*1.05 for v in minmax(d["Qg"], d["Qe"]))
     for i, q in enumerate(qbs):
-        all_I = np.concatenate([d["Ig"], d["Ie"]]) if d["has_iq"] else np.array([0])
-        all_Q = np.concatenate([d["Qg"], d["Qe"]]) if d["has_iq"] else np.array([0])
-        x_min, x_max = float(all_I.min())*1.05, float(all_I.max())*1.05
-        y_min, y_max = float(all_Q.min())*1.05, float(all_Q.max())*1.05
         r, c = divmod(i, N_COLS); row, col = r+1, c+1
-        fig.add_trace(go.Scatter(x=d["Ig"][i], y=d["Qg"][i], mode="markers",
-                                 marker=dict(color="blue", size=3, opacity=0.25),
-                                 name="Ground" if i==0 else None,
-                                 showlegend=i==0),
+        xg, yg, xe, ye = (np.asarray(a[i, ::step]) for a in shots)
+        fig.add_trace(dict(type="scatter", x=xg, y=yg, mode="markers",
+                           marker=dict(color="blue", size=3, opacity=0.25),
+                           name="Ground" if i==0 else None,
+                           showlegend=i==0),
                       row=row, col=col)
-        fig.add_trace(go.Scatter(x=d["Ie"][i], y=d["Qe"][i], mode="markers",
-                                 marker=dict(color="orange", size=3, opacity=0.25),
-                                 name="Excited" if i==0 else None,
-                                 showlegend=i==0),
+        fig.add_trace(dict(type="scatter", x=xe, y=ye, mode="markers",
+                           marker=dict(color="orange", size=3, opacity=0.25),
+                           name="Excited" if i==0 else None,
+                           showlegend=i==0),
                       row=row, col=col)
         fig.add_vline(x=d["rus_thr"][i], line=dict(color="black", dash="dash"),
                       row=row, col=col)
         fig.add_vline(x=d["ge_thr"][i], line=dict(color="red", dash="dash"),
                       row=row, col=col)
         if i==0:
-            fig.add_trace(go.Scatter(x=[None], y=[None], mode="lines",
-                                     line=dict(color="black", dash="dash"),
-                                     name="RUS Threshold"), row=row, col=col)
-            fig.add_trace(go.Scatter(x=[None], y=[None], mode="lines",
-                                     line=dict(color="red", dash="dash"),
-                                     name="Threshold"), row=row, col=col)
+            fig.add_trace(dict(type="scatter", x=[None], y=[None], mode="lines",
+                               line=dict(color="black", dash="dash"),
+                               name="RUS Threshold"), row=row, col=col)
+            fig.add_trace(dict(type="scatter", x=[None], y=[None], mode="lines",
+                               line=dict(color="red", dash="dash"),
+                               name="Threshold"), row=row, col=col)
         fig.update_xaxes(range=[x_min, x_max], row=row, col=col)
         fig.update_yaxes(range=[y_min, y_max],
                          scaleanchor=f"x{i+1}", scaleratio=1,
@@ -271,12 +268,12 @@ def plot_blob(d: dict) -> go.Figure:
         legend=dict(orientation="h", yanchor="bottom", y=1.02,
                     xanchor="right", x=1),
     )
-    return fig
+    return fig.to_dict()
 
 # ────────────────────────────────────────────────────────────────────
 # 2‑wrapper
 # ────────────────────────────────────────────────────────────────────
-def make_plot(data: dict, mode: str, page: int) -> go.Figure:
+def make_plot(data: dict, mode: str, page: int) -> dict:
     if not data:
         return go.Figure()
     d_page = slice_page(data, page)
@@ -313,12 +310,12 @@ def summary_table(d: dict):
 # ────────────────────────────────────────────────────────────────────
 def create_rpo_layout(folder: str | Path):
     uid = str(folder).replace("\\", "_").replace("/", "_").replace(":", "")
-    data = load_rpo_data(folder)
+    data = load_rpo_data(folder, "assign")
     if not data:
         return html.Div([dbc.Alert("Data loading failed", color="danger"), html.Pre(str(folder))])
 
     n_pages = int(np.ceil(data["n"]/PER_PAGE))
-    init_fig = make_plot(data, "assign", 1)
+    init_fig = update_rpo_plot("assign", 1, {"folder": str(folder)})
 
     page_sel = dbc.Pagination(
         id={"type": "rpo-page", "index": uid},
@@ -387,15 +384,15 @@ def create_rpo_layout(folder: str | Path):
 # ────────────────────────────────────────────────────────────────────
 # 5. Callback registration
 # ────────────────────────────────────────────────────────────────────
+@cached_figure
+def update_rpo_plot(view, page, store):
+    if not store:
+        return go.Figure()
+    data = load_rpo_data(store["folder"], view)
+    return make_plot(data, view, page or 1)
+
+
 def register_rpo_callbacks(app: dash.Dash):
-    @app.callback(
-        Output({"type": "rpo-plot", "index": MATCH}, "figure"),
-        Input({"type": "rpo-view",  "index": MATCH}, "value"),
-        Input({"type": "rpo-page",  "index": MATCH}, "active_page"),
-        State({"type": "rpo-data",  "index": MATCH}, "data"),
-    )
-    def _update(view, page, store):
-        if not store:
-            return go.Figure()
-        data = load_rpo_data(store["folder"])
-        return make_plot(data, view, page or 1)
+    """Register ``update_rpo_plot`` (dependencies listed in experiments/registry.py)."""
+    from experiments.registry import register_callbacks
+    register_callbacks(app, "rpo")
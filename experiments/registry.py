@@ -0,0 +1,248 @@
+# ======================================================================
+#  registry.py
+# ======================================================================
+"""
+Manifest of experiment dashboard modules
+========================================
+* One entry per experiment type: title, folder‑name patterns, the module
+  that implements it and the Dash callbacks it needs
+* The manifest only names things – importing it does not import xarray,
+  plotly or any experiment module
+* ``register_callbacks`` wires every callback up front (Dash needs the
+  dependency graph before the first page load) through trampolines that
+  import the module the first time one of its callbacks fires
+* ``load_layout`` / ``load_data`` import a module the first time its type
+  is selected (or prefetched)
+--------------------------------------------------------------------
+Adding a type : write ``experiments/<name>_dashboard.py`` with a layout
+function and module‑level callback functions, then add an entry below.
+"""
+from __future__ import annotations
+import importlib, threading
+
+from dash import Input, Output, State, MATCH
+
+from experiments.client_views import CLIENTSIDE_VIEWS, SWITCH_VIEW, request_store, switch_view
+
+# ``layout`` / ``loader`` : ``create_*_layout(folder)`` / ``load_*_data(folder)``
+# in the module.  Each callback: function name in the module + (component
+# type, property) pairs; every id is {"type": <component type>, "index": MATCH}.
+# ``client_views`` (optional, see client_views.py): with CLIENTSIDE_VIEWS=1 the
+# first input switches between figures the layout stored in ``store`` in the
+# browser – ``views`` lists them (omitted → every view the layout offers;
+# required when the callback has further inputs, e.g. a page).  The view
+# reaches the server only as State, for the views left out.
+EXPERIMENTS: dict[str, dict] = {
+    "tof": dict(
+        title="Time of Flight",
+        patterns=["tof", "time_of_flight"],
+        module="experiments.tof_dashboard",
+        layout="create_tof_layout",
+        loader="load_tof_data",
+        callbacks=[dict(function="update_tof_plot",
+                        outputs=[("tof-plot", "figure")],
+                        inputs=[("tof-view-mode", "value")],
+                        states=[("tof-data", "data")],
+                        client_views=dict(store="tof-views"))],
+    ),
+    "res": dict(
+        title="Resonator Spectroscopy",
+        patterns=["res_spec", "resonator", "resonator_spectroscopy"],
+        module="experiments.resonator_dashboard",
+        layout="create_res_layout",
+        loader="load_res_data",
+        callbacks=[dict(function="update_res_plot",
+                        outputs=[("res-plot", "figure")],
+                        inputs=[("res-view", "value")],
+                        states=[("res-data", "data")],
+                        client_views=dict(store="res-views"))],
+    ),
+    "qspec": dict(
+        title="Qubit Spectroscopy",
+        patterns=["qspec", "qubit_spec", "qubit_spectroscopy"],
+        module="experiments.qspec_dashboard",
+        layout="create_qspec_layout",
+        loader="load_qspec_data",
+        callbacks=[dict(function="update_qspec_plot",
+                        outputs=[("qspec-plot", "figure")],
+                        inputs=[("qspec-view", "value")],
+                        states=[("qspec-data", "data")])],
+    ),
+    "prabi": dict(
+        title="Power Rabi",
+        patterns=["prabi", "power_rabi", "power‑rabi", "pwr_rabi", "rabi"],
+        module="experiments.power_rabi_dashboard",
+        layout="create_prabi_layout",
+        loader="load_prabi_data",
+        callbacks=[dict(function="update_prabi_plot",
+                        outputs=[("prabi-plot", "figure")],
+                        inputs=[("prabi-var", "value")],
+                        states=[("prabi-data", "data")])],
+    ),
+    "t1": dict(
+        title="T1 Relaxation",
+        patterns=["t1", "t1_relax", "relaxation"],
+        module="experiments.t1_dashboard",
+        layout="create_t1_layout",
+        loader="load_t1_data",
+        callbacks=[dict(function="update_t1_plot",
+                        outputs=[("t1-plot", "figure")],
+                        inputs=[("t1-var", "value")],
+                        states=[("t1-data", "data")])],
+    ),
+    "echo": dict(
+        title="T2 Echo",
+        patterns=["echo", "t2echo", "t2_echo", "t2e"],
+        module="experiments.echo_dashboard",
+        layout="create_echo_layout",
+        loader="load_echo_data",
+        callbacks=[dict(function="update_echo_plot",
+                        outputs=[("echo-plot", "figure")],
+                        inputs=[("echo-var", "value")],
+                        states=[("echo-data", "data")])],
+    ),
+    "ramsey": dict(
+        title="Ramsey (T2*)",
+        patterns=["ramsey", "t2star", "t2*", "ramsey_exp"],
+        module="experiments.ramsey_dashboard",
+        layout="create_ramsey_layout",
+        loader="load_ramsey_data",
+        callbacks=[dict(function="update_ramsey_plot",
+                        outputs=[("ramsey-plot", "figure")],
+                        inputs=[("ramsey-var", "value")],
+                        states=[("ramsey-data", "data")],
+                        client_views=dict(store="ramsey-views"))],
+    ),
+    "iq": dict(
+        title="IQ Discrimination",
+        patterns=["iq", "iq_blobs", "iq_readout"],
+        module="experiments.iq_dashboard",
+        layout="create_iq_layout",
+        loader="load_iq_data",
+        callbacks=[dict(function="update_iq_plot",
+                        outputs=[("iq-plot", "figure")],
+                        inputs=[("iq-view", "value"), ("iq-page", "active_page")],
+                        states=[("iq-data", "data")],
+                        # histogram / scatter carry every shot: drawn on request only
+                        client_views=dict(store="iq-views", views=["conf"]))],
+    ),
+    "rpo": dict(
+        title="Readout Power Opt.",
+        patterns=["readout_power", "power_opt", "readout_power_optimization",
+                  "rpo", "readout‑power"],
+        priority=1,                           # e.g. "…readout_power_opt…_iq_blobs"
+        module="experiments.readout_power_opt_dashboard",
+        layout="create_rpo_layout",
+        loader="load_rpo_data",
+        callbacks=[dict(function="update_rpo_plot",
+                        outputs=[("rpo-plot", "figure")],
+                        inputs=[("rpo-view", "value"), ("rpo-page", "active_page")],
+                        states=[("rpo-data", "data")])],
+    ),
+    "drag": dict(
+        title="DRAG Calibration",
+        patterns=["drag", "drag_cal", "dragcal", "drag_calibration"],
+        module="experiments.drag_dashboard",
+        layout="create_drag_layout",
+        loader="load_drag_data",
+        callbacks=[dict(function="update_drag_plot",
+                        outputs=[("drag-plot", "figure")],
+                        inputs=[("drag-view", "value")],
+                        states=[("drag-data", "data")])],
+    ),
+    "rb1q": dict(
+        title="1Q Randomized Benchmark",
+        patterns=["rb1q", "1q_rb", "Randomized", "Randomized_benchmarking", "benchmarking"],
+        module="experiments.rb1q_dashboard",
+        layout="create_rb_layout",
+        loader="load_rb_data",
+        callbacks=[dict(function="update_rb_plot",
+                        outputs=[("rb-plot", "figure")],
+                        inputs=[("rb-page", "active_page")],
+                        states=[("rb-data", "data")],
+                        prevent_initial_call=True)],
+    ),
+}
+
+_import_lock = threading.Lock()
+
+
+def load_module(typ: str):
+    """Import (once) and return the dashboard module of ``typ``."""
+    name = EXPERIMENTS[typ]["module"]
+    with _import_lock:                  # first import from concurrent callbacks
+        return importlib.import_module(name)
+
+
+def load_layout(typ: str):
+    """The ``create_*_layout(folder)`` function of ``typ``."""
+    return getattr(load_module(typ), EXPERIMENTS[typ]["layout"])
+
+
+def load_data(typ: str):
+    """The cached ``load_*_data(folder)`` function of ``typ`` (what the layout loads)."""
+    return getattr(load_module(typ), EXPERIMENTS[typ]["loader"])
+
+
+def preload():
+    """Import every module now (e.g. before gunicorn forks with --preload)."""
+    for typ in EXPERIMENTS:
+        load_module(typ)
+
+
+def _dependencies(spec: dict) -> list:
+    def ids(pairs, kind):
+        return [kind({"type": t, "index": MATCH}, prop) for t, prop in pairs]
+    return ids(spec["outputs"], Output) + ids(spec["inputs"], Input) + ids(spec.get("states", ()), State)
+
+
+def _trampoline(typ: str, function: str):
+    def callback(*args):
+        return getattr(load_module(typ), function)(*args)
+    callback.__name__ = callback.__qualname__ = function
+    return callback
+
+
+def _switch_trampoline(typ: str, function: str, requested: str, cheap, n_inputs: int):
+    # (request, *other inputs, view, *states) → update(view, *other inputs, *states)
+    def callback(_, *args):
+        update = getattr(load_module(typ), function)
+        others, view, states = args[:n_inputs - 1], args[n_inputs - 1], args[n_inputs:]
+        return switch_view(update, requested, cheap, view, *others, *states)
+    callback.__name__ = callback.__qualname__ = f"{function}_views"
+    return callback
+
+
+def _register_client_views(app, typ: str, spec: dict):
+    """View input → figure in the browser (the first one too); server views and other inputs → server."""
+    (graph, prop), = spec["outputs"]
+    (view_type, view_prop), *others = spec["inputs"]
+    views = spec["client_views"]
+
+    def dep(kind, component_type, prop, **kw):
+        return kind({"type": component_type, "index": MATCH}, prop, **kw)
+
+    figure = dep(Output, graph, prop, allow_duplicate=True)
+    app.clientside_callback(SWITCH_VIEW, figure, dep(Output, request_store(views), "data"),
+                            dep(Input, view_type, view_prop), dep(Input, views["store"], "data"),
+                            prevent_initial_call="initial_duplicate")
+    if others or views.get("views") is not None:    # views not bundled, or e.g. the page
+        app.callback(figure, dep(Output, views["store"], "data"),
+                     dep(Input, request_store(views), "data"),
+                     *(dep(Input, t, p) for t, p in others),
+                     dep(State, view_type, view_prop),
+                     *(dep(State, t, p) for t, p in spec.get("states", ())),
+                     prevent_initial_call=True)(
+            _switch_trampoline(typ, spec["function"], request_store(views),
+                               views.get("views") or (), len(spec["inputs"])))
+
+
+def register_callbacks(app, typ: str):
+    """Register the callbacks of ``typ``; the module is imported on first use."""
+    for spec in EXPERIMENTS[typ]["callbacks"]:
+        if CLIENTSIDE_VIEWS and "client_views" in spec:
+            _register_client_views(app, typ, spec)
+            continue
+        options = {k: v for k, v in spec.items()
+                   if k not in ("function", "outputs", "inputs", "states", "client_views")}
+        app.callback(*_dependencies(spec), **options)(_trampoline(typ, spec["function"]))
@@ -10,31 +10,24 @@ Dash module for **Readout‑Resonator Spectroscopy** experiments
 --------------------------------------------------------------------
 """
 import dash
-from dash import dcc, html, Input, Output, State, MATCH
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
-import plotly.subplots as subplots
-import xarray as xr
 import numpy as np
-import json, os
+import os
 from pathlib import Path
 
-# --------------------------------------------------------------------
-# Common helper: xarray open_dataset with multiple engine attempts
-# --------------------------------------------------------------------
-def open_xr_dataset(path, engines=("h5netcdf", "netcdf4", None)):
-    last_err = None
-    for eng in engines:
-        try:
-            return xr.open_dataset(path, engine=eng)
-        except Exception as e:
-            last_err = e
-    raise last_err
+from experiments.data_cache import cached_loader
+from experiments.figure_cache import cached_figure
+from experiments.client_views import initial_figure, views_store
+from experiments.grid_figure import GridFigure
+from experiments.dataset_io import read_files
 
 
 # --------------------------------------------------------------------
 # 1. Data Loader
 # --------------------------------------------------------------------
+@cached_loader
 def load_res_data(folder):
     folder = os.path.normpath(folder)
     paths = {
@@ -47,13 +40,7 @@ def load_res_data(folder):
         print(f"[load_res_data] missing file in {folder}")
         return None
 
-    ds_raw = open_xr_dataset(paths["ds_raw"])
-    ds_fit = open_xr_dataset(paths["ds_fit"])
-
-    with open(paths["data_js"], "r", encoding="utf-8") as f:
-        data_json = json.load(f)
-    with open(paths["node_js"], "r", encoding="utf-8") as f:
-        node_json = json.load(f)
+    ds_raw, ds_fit = read_files(paths["ds_raw"], paths["ds_fit"])
 
     qubits       = ds_raw["qubit"].values
     detuning     = ds_raw["detuning"].values                # Hz
@@ -73,7 +60,7 @@ def load_res_data(folder):
     fwhm         = ds_fit["fwhm"].values                    # Hz
 
     return dict(
-        ds_raw=ds_raw, ds_fit=ds_fit, data_json=data_json, node_json=node_json,
+        ds_raw=ds_raw, ds_fit=ds_fit,
         qubits=qubits, n=len(qubits), det_hz=detuning, det_mhz=det_mhz,
         I=I, Q=Q, IQ_abs=IQ_abs, phase=phase,
         success=success, base_line=base_line, pos=pos, width=width,
@@ -93,7 +80,7 @@ def create_res_plots(data, view="amplitude"):
     n_q = data["n"]
     n_cols = 4
     n_rows = int(np.ceil(n_q / n_cols))
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows, cols=n_cols,
         subplot_titles=[str(q) for q in data["qubits"]],
         vertical_spacing=0.07, horizontal_spacing=0.04,
@@ -105,26 +92,26 @@ def create_res_plots(data, view="amplitude"):
 
         if view == "amplitude":
             y = data["IQ_abs"][idx]
-            fig.add_trace(go.Scatter(x=x, y=y, mode="lines", line=dict(color="blue", width=1), name="Data" if idx == 0 else None, showlegend=idx==0), row=r, col=c)
+            fig.add_trace(dict(type="scatter", x=x, y=y, mode="lines", line=dict(color="blue", width=1), name="Data" if idx == 0 else None, showlegend=idx==0), row=r, col=c)
 
             # fit curve
             if data["success"][idx] and not np.isnan(data["res_freq"][idx]):
                 x_fit = np.linspace(data["det_hz"].min(), data["det_hz"].max(), 500)
                 offset   = np.interp(x_fit, data["det_hz"], data["base_line"][idx])  # baseline interpolate
                 y_fit = lorentzian(x_fit, data["pos"][idx], data["width"][idx], data["amp"][idx], offset) * 1e3
-                fig.add_trace(go.Scatter(x=x_fit/1e6, y=y_fit, mode="lines", line=dict(color="red", dash="dash"), name="Fit" if idx==0 else None, showlegend=idx==0), row=r, col=c)
+                fig.add_trace(dict(type="scatter", x=x_fit/1e6, y=y_fit, mode="lines", line=dict(color="red", dash="dash"), name="Fit" if idx==0 else None, showlegend=idx==0), row=r, col=c)
 
             fig.update_yaxes(title_text="|IQ|  [mV]" if c==1 else None, row=r, col=c, showgrid=True)
         else:  # phase
             y = data["phase"][idx]
-            fig.add_trace(go.Scatter(x=x, y=y, mode="lines", line=dict(color="blue", width=1), showlegend=False), row=r, col=c)
+            fig.add_trace(dict(type="scatter", x=x, y=y, mode="lines", line=dict(color="blue", width=1), showlegend=False), row=r, col=c)
             fig.update_yaxes(title_text="Phase [rad]" if c==1 else None, row=r, col=c, showgrid=True)
 
         fig.update_xaxes(range=[-3, 3], title_text="Detuning [MHz]" if r==n_rows else None, row=r, col=c, showgrid=True)
 
     ttl = "Resonator Spectroscopy – Amplitude + Fit" if view=="amplitude" else "Resonator Spectroscopy – Phase"
     fig.update_layout(title=ttl, height=280*n_rows, template="dashboard_dark", legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
-    return fig
+    return fig.to_dict()
 
 # --------------------------------------------------------------------
 # 3. Summary Table
@@ -156,11 +143,12 @@ def create_res_layout(folder):
     if not data:
         return html.Div([dbc.Alert("Failed to load data", color="danger"), html.Pre(folder)])
 
-    init_fig = create_res_plots(data, "amplitude")
+    init_fig = initial_figure("res", update_res_plot, "amplitude", {"folder": folder})
 
     return html.Div(
         [
             dcc.Store(id={"type": "res-data", "index": uid}, data={"folder": folder}),
+            *views_store("res", uid, update_res_plot, ["amplitude", "phase"], {"folder": folder}),
             dbc.Row(dbc.Col(html.H3(f"Resonator Spectroscopy – {Path(folder).name}")), className="mb-3"),
             dbc.Row(
                 dbc.Col(
@@ -212,14 +200,15 @@ def create_res_layout(folder):
 # --------------------------------------------------------------------
 # 5. Callbacks
 # --------------------------------------------------------------------
+@cached_figure
+def update_res_plot(view_mode, store):
+    if not store:
+        return go.Figure()
+    data = load_res_data(store["folder"])
+    return create_res_plots(data, view_mode)
+
+
 def register_res_callbacks(app):
-    @app.callback(
-        Output({"type": "res-plot", "index": MATCH}, "figure"),
-        Input({"type": "res-view", "index": MATCH}, "value"),
-        State({"type": "res-data", "index": MATCH}, "data"),
-    )
-    def update_plot(view_mode, store):
-        if not store:
-            return go.Figure()
-        data = load_res_data(store["folder"])
-        return create_res_plots(data, view_mode)
+    """Register ``update_res_plot`` (dependencies listed in experiments/registry.py)."""
+    from experiments.registry import register_callbacks
+    register_callbacks(app, "res")
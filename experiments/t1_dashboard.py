@@ -11,26 +11,18 @@ Author : (Author Name)
 Date   : 2025‑06‑22
 """
 import dash
-from dash import dcc, html, Input, Output, State, MATCH
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
-import plotly.subplots as subplots
-import xarray as xr
 import numpy as np
-import json, os
+import os
 from pathlib import Path
 
-# ────────────────────────────────────────────────────────────────────
-# Safe xarray open_dataset
-# ────────────────────────────────────────────────────────────────────
-def open_xr_dataset(path, engines=("h5netcdf", "netcdf4", None)):
-    last_err = None
-    for eng in engines:
-        try:
-            return xr.open_dataset(path, engine=eng)
-        except Exception as e:
-            last_err = e
-    raise last_err
+from experiments.data_cache import cached_loader
+from experiments.figure_cache import cached_figure
+from experiments.grid_figure import GridFigure
+from experiments.dataset_io import read_files
+
 
 # ────────────────────────────────────────────────────────────────────
 # Exponential decay
@@ -42,13 +34,14 @@ def decay_exp(t, a, offset, decay):
 # ────────────────────────────────────────────────────────────────────
 # 1. Data Loading
 # ────────────────────────────────────────────────────────────────────
+@cached_loader
 def load_t1_data(folder):
     """
     Returns dict or None
       qubits, n, idle_time_ns, ds_raw, ds_fit,
       success, tau_ns, tau_err_ns,
       fit_a, fit_offset, fit_decay,
-      vars_available, data_json, node_json
+      vars_available
     """
     folder = os.path.normpath(folder)
     paths = {
@@ -61,13 +54,7 @@ def load_t1_data(folder):
         print(f"[load_t1_data] missing files in {folder}")
         return None
 
-    ds_raw = open_xr_dataset(paths["ds_raw"])
-    ds_fit = open_xr_dataset(paths["ds_fit"])
-
-    with open(paths["data_js"], "r", encoding="utf-8") as f:
-        data_json = json.load(f)
-    with open(paths["node_js"], "r", encoding="utf-8") as f:
-        node_json = json.load(f)
+    ds_raw, ds_fit = read_files(paths["ds_raw"], paths["ds_fit"])
 
     qubits    = ds_raw["qubit"].values
     n_q       = len(qubits)
@@ -99,7 +86,6 @@ def load_t1_data(folder):
         success=success, tau_ns=tau_ns, tau_err_ns=tau_err,
         fit_a=fit_a, fit_offset=fit_offset, fit_decay=fit_decay,
         vars_available=vars_avail,
-        data_json=data_json, node_json=node_json,
     )
 
 # ────────────────────────────────────────────────────────────────────
@@ -108,7 +94,7 @@ def load_t1_data(folder):
 def create_t1_plot(data, var_key):
     """
     var_key ∈ {'I','Q','amp'}
-    returns plotly.graph_objs.Figure
+    returns the figure dict (``GridFigure``)
     """
     if not data or var_key not in data["vars_available"]:
         return go.Figure()
@@ -125,7 +111,7 @@ def create_t1_plot(data, var_key):
     n_cols = 2
     n_rows = int(np.ceil(n_q / n_cols))
 
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows,
         cols=n_cols,
         subplot_titles=[str(q) for q in qubits],
@@ -152,7 +138,8 @@ def create_t1_plot(data, var_key):
 
         # Raw data
         fig.add_trace(
-            go.Scatter(
+            dict(
+                type="scatter",
                 x=t_ns,
                 y=y,
                 mode="lines",
@@ -167,7 +154,8 @@ def create_t1_plot(data, var_key):
         if success[idx] and not np.isnan(fit_decay[idx]):
             y_fit = decay_exp(t_ns, fit_a[idx], fit_offset[idx], fit_decay[idx]) * 1e3
             fig.add_trace(
-                go.Scatter(
+                dict(
+                    type="scatter",
                     x=t_ns,
                     y=y_fit,
                     mode="lines",
@@ -192,7 +180,7 @@ def create_t1_plot(data, var_key):
         legend=dict(orientation="h", yanchor="bottom", y=1.02,
                     xanchor="right", x=1),
     )
-    return fig
+    return fig.to_dict()
 
 # ────────────────────────────────────────────────────────────────────
 # 3. Summary Table
@@ -230,7 +218,7 @@ def create_t1_layout(folder):
         )
 
     default_var = data["vars_available"][0]
-    init_fig    = create_t1_plot(data, default_var)
+    init_fig    = update_t1_plot(default_var, {"folder": folder})
 
     var_options = [{"label": f" {v.upper() if v!='amp' else '|IQ|'}", "value": v}
                    for v in data["vars_available"]]
@@ -301,14 +289,15 @@ def create_t1_layout(folder):
 # ────────────────────────────────────────────────────────────────────
 # 5. Callbacks
 # ────────────────────────────────────────────────────────────────────
+@cached_figure
+def update_t1_plot(var_key, store):
+    if not store:
+        return go.Figure()
+    data = load_t1_data(store["folder"])
+    return create_t1_plot(data, var_key)
+
+
 def register_t1_callbacks(app: dash.Dash):
-    @app.callback(
-        Output({"type": "t1-plot", "index": MATCH}, "figure"),
-        Input({"type": "t1-var",  "index": MATCH}, "value"),
-        State({"type": "t1-data", "index": MATCH}, "data"),
-    )
-    def _update_plot(var_key, store):
-        if not store:
-            return go.Figure()
-        data = load_t1_data(store["folder"])
-        return create_t1_plot(data, var_key)
+    """Register ``update_t1_plot`` (dependencies listed in experiments/registry.py)."""
+    from experiments.registry import register_callbacks
+    register_callbacks(app, "t1")
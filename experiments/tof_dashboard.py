@@ -12,39 +12,37 @@ Dash module for **Time‑of‑Flight (TOF)** calibration experiments
 
 
 import dash
-from dash import dcc, html, Input, Output, State, MATCH
+from dash import dcc, html
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
-import plotly.subplots as subplots
-import xarray as xr
 import numpy as np
-import json
 import os
 from pathlib import Path
 
-def open_xr_dataset(path, engines=("h5netcdf", "netcdf4", None)):
-    """
-    Try xarray.open_dataset with multiple engines.
-    Return the first successful result, or raise the last exception if all fail.
-    """
-    last_error = None
-    for eng in engines:
-        try:
-            print(f"  trying engine={eng} ... ", end="")
-            ds = xr.open_dataset(path, engine=eng)
-            print("✓ success")
-            return ds
-        except Exception as e:
-            print(f"✗ {type(e).__name__}: {e}")
-            last_error = e
-    raise last_error  # Propagate exception for caller to handle if all fail
+from experiments.data_cache import cached_loader
+from experiments.figure_cache import cached_figure
+from experiments.client_views import initial_figure, views_store
+from experiments.grid_figure import GridFigure
+from experiments.dataset_io import read_files
+from experiments.mapped_arrays import scaled_values
 
 
 # -------------------------------------------------------------------
 # 1. Data Loader
 # -------------------------------------------------------------------
-def load_tof_data(folder_path):
-    """Load TOF experiment data"""
+# ADC traces drawn by each view (I, Q); the other view's traces are not read
+VIEW_VARS = {
+    "averaged": ("adcI", "adcQ"),
+    "single":   ("adc_single_runI", "adc_single_runQ"),
+}
+
+@cached_loader
+def load_tof_data(folder_path, view_mode="averaged"):
+    """
+    Load TOF experiment data (ADC traces of ``view_mode`` only).
+    ``adcI`` / ``adcQ`` are ``ScaledArray``s (qubit × time) giving mV when
+    indexed; large single‑shot traces stay memory‑mapped until plotted.
+    """
     try:
         folder_path = os.path.normpath(folder_path)
 
@@ -59,34 +57,30 @@ def load_tof_data(folder_path):
             print(f"[load_tof_data] Missing required files in {folder_path}")
             return None
 
-        print(f"[load_tof_data] opening datasets in {folder_path}")
-        ds_raw = open_xr_dataset(ds_raw_path)
-        ds_fit = open_xr_dataset(ds_fit_path)
-
-        with open(data_json_path, "r", encoding="utf-8") as f:
-            data_json = json.load(f)
-        with open(node_json_path, "r", encoding="utf-8") as f:
-            node_json = json.load(f)
-
-        qubits       = ds_raw["qubit"].values
-        n_qubits     = len(qubits)
-        success      = ds_fit["success"].values
-        delays       = ds_fit["delay"].values
-        thresholds   = ds_fit["threshold"].values
-        readout_time = ds_raw["readout_time"].values
+        print(f"[load_tof_data] opening datasets in {folder_path} ({view_mode})")
+        var_I, var_Q = VIEW_VARS.get(view_mode, VIEW_VARS["single"])
+        ds_raw, ds_fit = read_files(ds_raw_path, ds_fit_path, lazy=True)
+        with ds_raw, ds_fit:
+            qubits       = ds_raw["qubit"].values
+            n_qubits     = len(qubits)
+            success      = ds_fit["success"].values
+            delays       = ds_fit["delay"].values
+            thresholds   = ds_fit["threshold"].values
+            readout_time = ds_raw["readout_time"].values
+            adcI         = scaled_values(ds_raw, var_I, 1e3, dims=("qubit", ...))
+            adcQ         = scaled_values(ds_raw, var_Q, 1e3, dims=("qubit", ...))
 
         print(f"[load_tof_data] loaded OK – {n_qubits} qubits")
         return dict(
-            ds_raw=ds_raw,
-            ds_fit=ds_fit,
-            data_json=data_json,
-            node_json=node_json,
             qubits=qubits,
             n_qubits=n_qubits,
             success=success,
             delays=delays,
             thresholds=thresholds,
             readout_time=readout_time,
+            view_mode=view_mode,
+            adcI=adcI,
+            adcQ=adcQ,
         )
 
     except Exception as e:
@@ -109,13 +103,12 @@ def create_tof_plots(data, view_mode="averaged"):
     delays       = data["delays"]
     thresholds   = data["thresholds"]
     success      = data["success"]
-    ds_raw       = data["ds_raw"]
 
     print(f"[create_tof_plots] qubits={n_qubits}, mode={view_mode}")
 
     n_cols = 2
     n_rows = int(np.ceil(n_qubits / n_cols))
-    fig = subplots.make_subplots(
+    fig = GridFigure(
         rows=n_rows,
         cols=n_cols,
         subplot_titles=[f"{q}" for q in qubits],
@@ -129,16 +122,13 @@ def create_tof_plots(data, view_mode="averaged"):
     for idx, qubit in enumerate(qubits):
         row, col = idx // n_cols + 1, idx % n_cols + 1
 
-        if view_mode == "averaged":
-            adcI = ds_raw["adcI"].sel(qubit=qubit).values * 1e3
-            adcQ = ds_raw["adcQ"].sel(qubit=qubit).values * 1e3
-        else:  # single
-            adcI = ds_raw["adc_single_runI"].sel(qubit=qubit).values * 1e3
-            adcQ = ds_raw["adc_single_runQ"].sel(qubit=qubit).values * 1e3
+        adcI = data["adcI"][idx]      # traces of the view the data was loaded for
+        adcQ = data["adcQ"][idx]
 
         # Gray background – ADC range
         fig.add_trace(
-            go.Scatter(
+            dict(
+                type="scatter",
                 x=[readout_time[0], readout_time[-1], readout_time[-1], readout_time[0], readout_time[0]],
                 y=[-adc_range, -adc_range, adc_range, adc_range, -adc_range],
                 fill="toself",
@@ -154,7 +144,8 @@ def create_tof_plots(data, view_mode="averaged"):
 
         # I, Q curves
         fig.add_trace(
-            go.Scatter(
+            dict(
+                type="scatter",
                 x=readout_time,
                 y=adcI,
                 mode="lines",
@@ -167,7 +158,8 @@ def create_tof_plots(data, view_mode="averaged"):
             col=col,
         )
         fig.add_trace(
-            go.Scatter(
+            dict(
+                type="scatter",
                 x=readout_time,
                 y=adcQ,
                 mode="lines",
@@ -190,7 +182,8 @@ def create_tof_plots(data, view_mode="averaged"):
             )
             if idx == 0:
                 fig.add_trace(
-                    go.Scatter(
+                    dict(
+                        type="scatter",
                         x=[None],
                         y=[None],
                         mode="lines",
@@ -227,7 +220,7 @@ def create_tof_plots(data, view_mode="averaged"):
         template="dashboard_dark",
         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
     )
-    return fig
+    return fig.to_dict()
 
 
 # -------------------------------------------------------------------
@@ -275,11 +268,13 @@ def create_tof_layout(folder_path):
             ]
         )
 
-    initial_fig = create_tof_plots(data, "averaged")
+    initial_fig = initial_figure("tof", update_tof_plot, "averaged", {"folder_path": folder_path})
 
     return html.Div(
         [
             dcc.Store(id={"type": "tof-data", "index": unique_id}, data={"folder_path": folder_path}),
+            *views_store("tof", unique_id, update_tof_plot, ["averaged", "single"],
+                         {"folder_path": folder_path}),
             dbc.Row(dbc.Col(html.H3(f"TOF Calibration – {os.path.basename(folder_path)}")), className="mb-3"),
             dbc.Row(
                 [
@@ -358,14 +353,15 @@ def create_tof_layout(folder_path):
 # -------------------------------------------------------------------
 # 5. Callback Registration
 # -------------------------------------------------------------------
+@cached_figure
+def update_tof_plot(view_mode, tof_data):
+    if not tof_data:
+        return go.Figure()
+    data = load_tof_data(tof_data["folder_path"], view_mode)
+    return create_tof_plots(data, view_mode)
+
+
 def register_tof_callbacks(app):
-    @app.callback(
-        Output({"type": "tof-plot", "index": MATCH}, "figure"),
-        Input({"type": "tof-view-mode", "index": MATCH}, "value"),
-        State({"type": "tof-data", "index": MATCH}, "data"),
-    )
-    def update_tof_plot(view_mode, tof_data):
-        if not tof_data:
-            return go.Figure()
-        data = load_tof_data(tof_data["folder_path"])
-        return create_tof_plots(data, view_mode)
+    """Register ``update_tof_plot`` (dependencies listed in experiments/registry.py)."""
+    from experiments.registry import register_callbacks
+    register_callbacks(app, "tof")
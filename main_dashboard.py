@@ -1,26 +1,22 @@
 import dash
-from dash import dcc, html, Input, Output, State
+from dash import dcc, html, Input, Output, State, Patch, ctx, no_update
 import dash_bootstrap_components as dbc
 from datetime import datetime
-import os, re
+import os, sys, itertools, threading, time
 from pathlib import Path
 import theme
+from experiment_index import ExperimentIndex, make_record, date_key
+from experiment_watcher import ExperimentWatcher
+from experiment_catalog import ExperimentCatalog
+from experiment_classifier import ExperimentClassifier
+from experiment_prefetch import Prefetcher
+from response_compression import ResponseCompressor
 from dash_bootstrap_templates import load_figure_template
 
 # ────────────────────────────────────────────────────────────────────
-# Import Dash modules for each experiment
+# Experiment modules: listed in experiments/registry.py, imported on first use
 # ────────────────────────────────────────────────────────────────────
-from experiments.tof_dashboard        import create_tof_layout,   register_tof_callbacks
-from experiments.resonator_dashboard  import create_res_layout,   register_res_callbacks
-from experiments.qspec_dashboard      import create_qspec_layout, register_qspec_callbacks
-from experiments.power_rabi_dashboard import create_prabi_layout, register_prabi_callbacks
-from experiments.t1_dashboard         import create_t1_layout,    register_t1_callbacks
-from experiments.echo_dashboard       import create_echo_layout,  register_echo_callbacks
-from experiments.ramsey_dashboard     import create_ramsey_layout, register_ramsey_callbacks
-from experiments.iq_dashboard         import create_iq_layout,    register_iq_callbacks
-from experiments.readout_power_opt_dashboard import create_rpo_layout, register_rpo_callbacks
-from experiments.drag_dashboard       import create_drag_layout,   register_drag_callbacks
-from experiments.rb1q_dashboard       import create_rb_layout,     register_rb_callbacks     
+from experiments.registry import EXPERIMENTS, load_layout, load_data, register_callbacks, preload
 
 # ────────────────────────────────────────────────────────────────────
 # App instance & global settings
@@ -32,175 +28,247 @@ app = dash.Dash(__name__,
 server = app.server
 load_figure_template("SLATE")
 
-import os
 BASE = os.path.abspath(os.path.dirname(__file__))
 EXPERIMENT_BASE_PATH = os.environ.get("EXPERIMENT_BASE_PATH", os.path.join(BASE, "data/QPU_Project"))
-
-# Experiment type metadata ------------------------------------------------
-experiment_modules = {
-    "tof": dict(
-        layout_func=create_tof_layout,
-        register_func=register_tof_callbacks,
-        title="Time of Flight",
-        patterns=["tof", "time_of_flight"],
-    ),
-    "res": dict(
-        layout_func=create_res_layout,
-        register_func=register_res_callbacks,
-        title="Resonator Spectroscopy",
-        patterns=["res_spec", "resonator", "resonator_spectroscopy"],
-    ),
-    "qspec": dict(
-        layout_func=create_qspec_layout,
-        register_func=register_qspec_callbacks,
-        title="Qubit Spectroscopy",
-        patterns=["qspec", "qubit_spec", "qubit_spectroscopy"],
-    ),
-    "prabi": dict(
-        layout_func=create_prabi_layout,
-        register_func=register_prabi_callbacks,
-        title="Power Rabi",
-        patterns=["prabi", "power_rabi", "power‑rabi", "pwr_rabi", "rabi"],
-    ),
-    "t1": dict(
-        layout_func=create_t1_layout,
-        register_func=register_t1_callbacks,
-        title="T1 Relaxation",
-        patterns=["t1", "t1_relax", "relaxation"],
-    ),
-    "echo": dict(
-        layout_func=create_echo_layout,
-        register_func=register_echo_callbacks,
-        title="T2 Echo",
-        patterns=["echo", "t2echo", "t2_echo", "t2e"],
-    ),
-    "ramsey": dict(
-        layout_func=create_ramsey_layout,
-        register_func=register_ramsey_callbacks,
-        title="Ramsey (T2*)",
-        patterns=["ramsey", "t2star", "t2*", "ramsey_exp"],
-    ),
-    "iq": dict(
-        layout_func=create_iq_layout,
-        register_func=register_iq_callbacks,
-        title="IQ Discrimination",
-        patterns=["iq", "iq_blobs", "iq_readout"],
-    ),
-    "rpo": dict(
-        layout_func=create_rpo_layout,
-        register_func=register_rpo_callbacks,
-        title="Readout Power Opt.",
-        patterns=["readout_power", "power_opt", "readout_power_optimization",
-                  "rpo", "readout‑power"],
-    ),
-    "drag": dict(
-        layout_func=create_drag_layout,
-        register_func=register_drag_callbacks,
-        title="DRAG Calibration",
-        patterns=["drag", "drag_cal", "dragcal", "drag_calibration"],
-    ),
-    "rb1q": dict(                             
-        layout_func=create_rb_layout,
-        register_func=register_rb_callbacks,
-        title="1Q Randomized Benchmark",
-        patterns=["rb1q", "1q_rb", "Randomized", "Randomized_benchmarking", "benchmarking"],
-    ),
-}
+# "off" → every browser poll refreshes the index itself
+# "auto" | "inotify" | "poll" → one server‑side watcher, polls only compare versions
+EXPERIMENT_WATCHER = os.environ.get("EXPERIMENT_WATCHER", "off").lower()
+# SQLite catalog that persists the index across restarts ("" disables it)
+EXPERIMENT_CATALOG = os.environ.get("EXPERIMENT_CATALOG", os.path.join(BASE, "experiment_catalog.sqlite3"))
+# Threads used to rescan changed date folders (raise for high‑latency network mounts)
+EXPERIMENT_SCAN_WORKERS = int(os.environ.get("EXPERIMENT_SCAN_WORKERS", "8"))
+# Only the newest N date folders are scanned / polled; older dates are loaded
+# when the date range is widened (0 → scan every date folder)
+EXPERIMENT_SCAN_WINDOW = int(os.environ.get("EXPERIMENT_SCAN_WINDOW", "7"))
+# Classify by node.json → metadata.name first (one small read per new run)
+EXPERIMENT_CLASSIFY_NODE_JSON = os.environ.get("EXPERIMENT_CLASSIFY_NODE_JSON", "0").lower() in ("1", "true", "yes", "on")
+# Folder dropdown shows at most this many runs; typing searches the rest server‑side
+FOLDER_OPTIONS_LIMIT = 50
+
+# Data of the newest run and of the runs next to the selection is loaded in the
+# background, at most this many MB (.h5 size) per batch (0 → no prefetching)
+EXPERIMENT_PREFETCH_MB = float(os.environ.get("EXPERIMENT_PREFETCH_MB", "128"))
+PREFETCH_NEIGHBOURS = 1   # runs on each side of the selection
+
+# gzip / brotli for callback results, the page and the JS bundles
+# "auto" (brotli if installed, else gzip) | "br" | "gzip" | "off"
+RESPONSE_COMPRESSION = os.environ.get("RESPONSE_COMPRESSION", "auto").lower()
+# level of callback results (gzip 1–9, brotli 0–11; unset → 1) and smallest body worth compressing
+RESPONSE_COMPRESSION_LEVEL = os.environ.get("RESPONSE_COMPRESSION_LEVEL")
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", "1400"))
+
+# Import every experiment module at start‑up instead of on first use
+# (e.g. with gunicorn --preload so forked workers share them)
+EXPERIMENT_PRELOAD = os.environ.get("EXPERIMENT_PRELOAD", "0").lower() in ("1", "true", "yes", "on")
+
+# Experiment type metadata (title, patterns, priority, module …) ----------
+# A folder matching patterns of several types goes to the highest ``priority``
+# (default 0), then to the whole‑word match, then to the longest pattern.
+experiment_modules = EXPERIMENTS
+
+compressor = ResponseCompressor(
+    RESPONSE_COMPRESSION,
+    int(RESPONSE_COMPRESSION_LEVEL) if RESPONSE_COMPRESSION_LEVEL else None,
+    RESPONSE_COMPRESSION_MIN_BYTES,
+).install(server) if RESPONSE_COMPRESSION not in ("off", "0", "") else None
 
 # ────────────────────────────────────────────────────────────────────
 # 1. Scan experiment folders (using experiment_modules)
 # ────────────────────────────────────────────────────────────────────
+classify_experiment = ExperimentClassifier(experiment_modules,
+                                           use_node_json=EXPERIMENT_CLASSIFY_NODE_JSON)
+
+prefetcher = Prefetcher(lambda typ, path: load_data(typ)(path),
+                        int(EXPERIMENT_PREFETCH_MB * 1024 * 1024)) if EXPERIMENT_PREFETCH_MB > 0 else None
+
+def prefetch_around(typ: str, paths: list[str], cur: str | None):
+    """Queue the newest run and the neighbours of ``cur`` in the dropdown order."""
+    if prefetcher is None or not paths:
+        return
+    items = [paths[0]]
+    if cur in paths:
+        i = paths.index(cur)
+        for d in range(1, PREFETCH_NEIGHBOURS + 1):       # next (older) run first, then newer
+            items += [paths[j] for j in (i + d, i - d) if 0 <= j < len(paths)]
+    prefetcher.schedule([(typ, p) for p in items if p != cur])
+
+_indexes: dict[str, ExperimentIndex] = {}
+_watcher: ExperimentWatcher | None = None
+_watcher_lock = threading.Lock()
+_catalog: ExperimentCatalog | None = None
+
+def get_catalog() -> ExperimentCatalog | None:
+    """Shared on‑disk catalog (None when disabled or not writable)."""
+    global _catalog
+    if _catalog is None and EXPERIMENT_CATALOG:
+        try:
+            _catalog = ExperimentCatalog(EXPERIMENT_CATALOG,
+                                         classifier=classify_experiment.signature)
+        except Exception as e:
+            print(f"[main] catalog disabled – cannot open {EXPERIMENT_CATALOG}: {e}")
+    return _catalog
+
+def get_index(base_path: str) -> ExperimentIndex:
+    base_path = os.path.normpath(base_path)
+    index = _indexes.get(base_path)
+    if index is None:
+        index = _indexes[base_path] = ExperimentIndex(
+            base_path, classify_experiment, catalog=get_catalog(),
+            workers=EXPERIMENT_SCAN_WORKERS, window=EXPERIMENT_SCAN_WINDOW)
+    return index
+
+def get_watcher() -> ExperimentWatcher | None:
+    """Shared watcher for EXPERIMENT_BASE_PATH, started on first use (per process)."""
+    global _watcher
+    if EXPERIMENT_WATCHER in ("", "off", "0", "false", "no"):
+        return None
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = ExperimentWatcher(get_index(EXPERIMENT_BASE_PATH), EXPERIMENT_WATCHER)
+            _watcher.start()
+    return _watcher
+
 def find_experiments(base_path: str):
     """
     Date folders: YYYY_MM_DD or YYYY-MM-DD
     Experiment folders: '#number_…<keyword>…_<HHMMSS>'
+    Backed by a persistent per‑path ExperimentIndex: only date folders whose
+    mtime changed since the previous call are rescanned, and only the newest
+    EXPERIMENT_SCAN_WINDOW of them are looked at (see ``ExperimentIndex.backfill``).
     """
-    exps: dict[str, list] = {}
-    base_path = os.path.normpath(base_path)
-    if not os.path.exists(base_path):
-        return exps
-
-    date_re = re.compile(r"^\d{4}[-_]\d{2}[-_]\d{2}$")
-    date_dirs = [
-        d for d in os.listdir(base_path)
-        if date_re.match(d) and os.path.isdir(Path(base_path, d))
-    ]
-
-    for dname in date_dirs:
-        y, m, d = map(int, re.split(r"[-_]", dname))
-        day_dir = Path(base_path, dname)
-
-        for exp_dir in day_dir.iterdir():
-            if not exp_dir.is_dir():
-                continue
-            fname = exp_dir.name.lower()
-
-            # Check if required data files exist
-            required_ok = all(
-                (exp_dir / f).exists()
-                for f in ("ds_raw.h5", "ds_fit.h5")
-            ) and len(list(exp_dir.glob("*.json"))) >= 2
-            if not required_ok:
-                continue
-
-            # Determine experiment type
-            typ = None
-            for t, info in experiment_modules.items():
-                if any(p in fname for p in info["patterns"]):
-                    typ = t
-                    break
-            if typ is None:
-                continue
-
-            # Timestamp
-            m_t = re.search(r"(\d{6})$", fname)
-            hh, mm, ss = (
-                int(m_t.group(1)[:2]),
-                int(m_t.group(1)[2:4]),
-                int(m_t.group(1)[4:]),
-            ) if m_t else (0, 0, 0)
-            ts = datetime(y, m, d, hh, mm, ss).timestamp()
-
-            exps.setdefault(typ, []).append(
-                dict(
-                    path=str(exp_dir),
-                    name=exp_dir.name,
-                    date_folder=dname,
-                    timestamp=ts,
-                )
-            )
-
-    for typ in exps:
-        exps[typ].sort(key=lambda e: e["timestamp"], reverse=True)
-    return exps
+    return get_index(base_path).refresh()
+
+def date_range_status(loaded: int = 0) -> str:
+    if not EXPERIMENT_SCAN_WINDOW:
+        return "Scanning every date folder."
+    msg = (f"Watching the newest {EXPERIMENT_SCAN_WINDOW} date folders – "
+           "pick an older range to load it.")
+    if loaded:
+        msg += f" Loaded {loaded} older date folder{'s' if loaded != 1 else ''}."
+    return msg
+
+# Debug‑panel explorer: built on demand, cached briefly, shown page by page
+TREE_TTL        = 30.0    # [s] a listing is reused for this long
+TREE_DIR_LIMIT  = 200     # entries listed per directory, the rest are summarised
+TREE_PAGE_LINES = 400     # lines shown per "Show more" click
+_tree_cache: dict[tuple[str, int], tuple[float, list[str]]] = {}
+_tree_lock = threading.Lock()
 
 def get_directory_tree(path, max_depth=3, current_depth=0):
     if current_depth >= max_depth or not os.path.exists(path):
         return []
     
     items = []
+    indent = "  " * current_depth
     try:
-        for item in sorted(os.listdir(path)):
-            item_path = os.path.join(path, item)
-            if os.path.isdir(item_path):
-                items.append(f"{'  ' * current_depth}📁 {item}/")
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in entries[:TREE_DIR_LIMIT]:
+            if entry.is_dir():
+                items.append(f"{indent}📁 {entry.name}/")
                 if current_depth < max_depth - 1:
-                    items.extend(get_directory_tree(item_path, max_depth, current_depth + 1))
+                    items.extend(get_directory_tree(entry.path, max_depth, current_depth + 1))
             else:
-                items.append(f"{'  ' * current_depth}📄 {item}")
+                items.append(f"{indent}📄 {entry.name}")
+        if len(entries) > TREE_DIR_LIMIT:
+            items.append(f"{indent}… {len(entries) - TREE_DIR_LIMIT} more entries")
     except PermissionError:
-        items.append(f"{'  ' * current_depth}❌ Permission denied")
+        items.append(f"{indent}❌ Permission denied")
     except Exception as e:
-        items.append(f"{'  ' * current_depth}❌ Error: {str(e)}")
+        items.append(f"{indent}❌ Error: {str(e)}")
     
     return items
 
+def cached_directory_tree(path: str, max_depth: int = 4) -> list[str]:
+    """get_directory_tree, reused for TREE_TTL seconds."""
+    key = (path, max_depth)
+    now = time.monotonic()
+    with _tree_lock:
+        hit = _tree_cache.get(key)
+        if hit is not None and now - hit[0] < TREE_TTL:
+            return hit[1]
+    lines = get_directory_tree(path, max_depth=max_depth)
+    with _tree_lock:
+        _tree_cache[key] = (now, lines)
+    return lines
+
+def explorer_page(path: str, pages: int):
+    """(tree text, 'Show more' button style) for the first ``pages`` pages."""
+    if not os.path.exists(path):
+        return f"❌ {os.path.basename(path) or path} directory not found", HIDDEN
+    lines = cached_directory_tree(path, max_depth=4)
+    shown = lines[:pages * TREE_PAGE_LINES]
+    if len(shown) < len(lines):
+        shown = shown + [f"… {len(lines) - len(shown)} more lines"]
+    more = len(lines) > pages * TREE_PAGE_LINES
+    return "\n".join(shown) or "(empty)", {} if more else HIDDEN
+
+def data_layer_stats() -> str:
+    """Dataset / figure cache, file‑opener and transport counters (only of parts in use)."""
+    lines = []
+    cache = sys.modules.get("experiments.data_cache")
+    if cache is not None:
+        st = cache.dataset_cache.stats()
+        lines.append(f"dataset cache : {st['entries']} entries, "
+                     f"{st['bytes'] / 2**20:.1f} / {st['max_bytes'] / 2**20:.0f} MB, "
+                     f"{st['hits']} hits, {st['misses']} misses, {st['evictions']} evictions")
+    figures = sys.modules.get("experiments.figure_cache")
+    if figures is not None:
+        st = figures.figure_cache.stats()
+        lines.append(f"figure cache  : {st['entries']} entries, "
+                     f"{st['bytes'] / 2**20:.1f} / {st['max_bytes'] / 2**20:.0f} MB, "
+                     f"{st['hits']} hits, {st['misses']} misses, {st['evictions']} evictions")
+    opener = sys.modules.get("experiments.dataset_io")
+    if opener is not None:
+        st = opener.opener_stats()
+        for eng, s in sorted(st["engines"].items()):
+            avg = s["seconds"] / max(1, s["opens"] + s["failures"]) * 1e3
+            lines.append(f"engine {eng:<9s}: {s['opens']} opens, {s['failures']} failures, "
+                         f"{avg:.1f} ms avg")
+        for sig, eng in st["formats"].items():
+            lines.append(f"format {sig} → {eng}")
+        h = st["handles"]
+        lines.append(f"open datasets : {h['open']} / {h['max_open']}, {h['held']} in use "
+                     f"({h['closed']} closed by the pool)")
+    metadata = sys.modules.get("experiments.metadata")
+    if metadata is not None:
+        st = metadata.metadata_stats()
+        lines.append(f"metadata      : {st['entries']} values cached, {st['hits']} hits, "
+                     f"{st['parses']} parses ({st['backend']})")
+    if prefetcher is not None:
+        st = prefetcher.stats()
+        lines.append(f"prefetch      : {st['loaded']} loaded, {st['queued']} queued, "
+                     f"{st['cancelled']} cancelled, {st['skipped']} over budget, "
+                     f"{st['failed']} failed")
+    if compressor is not None:
+        st = compressor.stats()
+        ratio = st["bytes_in"] / max(1, st["bytes_out"])
+        avg = st["seconds"] / max(1, st["responses"]) * 1e3
+        per = ", ".join(f"{e} {c['responses']}" for e, c in st["encodings"].items())
+        lines.append(f"compression   : {st['responses']} responses ({per}), "
+                     f"{st['bytes_in'] / 2**20:.1f} → {st['bytes_out'] / 2**20:.1f} MB "
+                     f"({ratio:.1f}×), {avg:.1f} ms avg, {st['static_hits']} bundle hits, "
+                     f"{st['skipped']} below {st['min_bytes']} B")
+    return "\n".join(lines) or "No experiment data loaded yet."
+
+HIDDEN = {"display": "none"}
+TREE_STYLE = {
+    "backgroundColor": "#1e1e1e",
+    "color": "#ffffff",
+    "padding": "10px",
+    "borderRadius": "5px",
+    "fontSize": "12px",
+    "maxHeight": "300px",
+    "overflowY": "auto"
+}
+
 # ────────────────────────────────────────────────────────────────────
 # 2. Layout
 # ────────────────────────────────────────────────────────────────────
 app.layout = dbc.Container(
     [
         dcc.Store(id="current-experiments", data={}),
+        dcc.Store(id="experiments-version", data=None),
         dcc.Interval(id="folder-check-interval", interval=5000, n_intervals=0),
 
         # ── Black top-bar with logo  ───────────────────────
@@ -294,6 +362,10 @@ app.layout = dbc.Container(
                         html.Code(str(Path(EXPERIMENT_BASE_PATH).exists()))
                     ]),
                     html.Hr(),
+
+                    html.H6("📊 Data Layer", className="text-info"),
+                    html.Pre("Loading…", id="data-layer-stats", style=TREE_STYLE),
+                    html.Hr(),
                     
                     html.H6("📂 Directory Explorer", className="text-info"),
                     dbc.Button(
@@ -305,18 +377,9 @@ app.layout = dbc.Container(
                         className="mb-2"
                     ),
                     dbc.Collapse([
-                        html.Pre(
-                            "\n".join(get_directory_tree(BASE, max_depth=4)),
-                            style={
-                                "backgroundColor": "#1e1e1e",
-                                "color": "#ffffff",
-                                "padding": "10px",
-                                "borderRadius": "5px",
-                                "fontSize": "12px",
-                                "maxHeight": "300px",
-                                "overflowY": "auto"
-                            }
-                        )
+                        html.Pre("Loading…", id="root-explore-tree", style=TREE_STYLE),
+                        dbc.Button("Show more", id="root-explore-more", color="info",
+                                   outline=True, size="sm", className="mb-2", style=HIDDEN),
                     ], id="root-explore-collapse", is_open=False),
                     
                     dbc.Button(
@@ -328,18 +391,9 @@ app.layout = dbc.Container(
                         className="mb-2"
                     ),
                     dbc.Collapse([
-                        html.Pre(
-                            "\n".join(get_directory_tree(os.path.join(BASE, "data"), max_depth=4)) if os.path.exists(os.path.join(BASE, "data")) else "❌ Data directory not found",
-                            style={
-                                "backgroundColor": "#1e1e1e",
-                                "color": "#ffffff",
-                                "padding": "10px",
-                                "borderRadius": "5px",
-                                "fontSize": "12px",
-                                "maxHeight": "300px",
-                                "overflowY": "auto"
-                            }
-                        )
+                        html.Pre("Loading…", id="data-explore-tree", style=TREE_STYLE),
+                        dbc.Button("Show more", id="data-explore-more", color="success",
+                                   outline=True, size="sm", className="mb-2", style=HIDDEN),
                     ], id="data-explore-collapse", is_open=False),
                 ])
             ], id="debug-collapse", is_open=False)
@@ -361,7 +415,8 @@ app.layout = dbc.Container(
                             dbc.Col(
                                 dcc.Dropdown(
                                     id="experiment-folder-dropdown",
-                                    placeholder="Select experiment folder",
+                                    placeholder="Select experiment folder "
+                                                "(type run id, date, time or qubit)",
                                     disabled=True,
                                 ),
                                 md=6,
@@ -369,6 +424,29 @@ app.layout = dbc.Container(
                         ],
                         className="g-2",
                     ),
+                    dbc.Row(
+                        [
+                            dbc.Col(
+                                dcc.DatePickerRange(
+                                    id="experiment-date-range",
+                                    display_format="YYYY-MM-DD",
+                                    start_date_placeholder_text="From",
+                                    end_date_placeholder_text="To",
+                                    clearable=True,
+                                ),
+                                width="auto",
+                            ),
+                            dbc.Col(
+                                html.Small(
+                                    date_range_status(),
+                                    id="date-range-status",
+                                    className="text-muted",
+                                ),
+                                className="d-flex align-items-center",
+                            ),
+                        ],
+                        className="g-2 mt-2",
+                    ),
                 ]
             ),
             className="mb-4",
@@ -382,28 +460,71 @@ app.layout = dbc.Container(
 # ────────────────────────────────────────────────────────────────────
 # 3. Callbacks
 # ────────────────────────────────────────────────────────────────────
+def experiments_patch(added, removed, current: dict[str, list]) -> Patch:
+    """
+    Patch turning the client's copy into ``current`` given the net delta:
+    every changed type's list is sent whole, so the patch is idempotent –
+    two callbacks (poll, date range) may both apply theirs.
+    """
+    patch = Patch()
+    for typ in {t for t, _ in added} | {t for t, _ in removed}:
+        patch[typ] = current.get(typ, [])
+    return patch
+
+def push_experiments(index: ExperimentIndex, client_token, announce: bool = True):
+    """(alert, current‑experiments data, token) bringing a client up to date."""
+    if index.token == client_token:         # nothing changed since the last push
+        return no_update, no_update, no_update
+
+    token, current, delta = index.sync(client_token)
+    if delta is None:                       # first poll, or a state this worker never had
+        return no_update, current, token
+
+    added, removed = delta
+    alert = no_update
+    for typ in experiment_modules if announce else ():
+        names = sorted(rec["name"] for t, rec in added if t == typ)
+        if names:
+            alert = dbc.Alert(
+                f"New {experiment_modules[typ]['title']} experiment found: "
+                f"{', '.join(names)}",
+                color="info",
+                dismissable=True,
+                duration=10000,
+            )
+            break
+    return alert, experiments_patch(added, removed, current), token
+
 @app.callback(
     [Output("alert-container", "children"),
-     Output("current-experiments", "data")],
+     Output("current-experiments", "data"),
+     Output("experiments-version", "data")],
     Input("folder-check-interval", "n_intervals"),
-    State("current-experiments", "data"),
+    State("experiments-version", "data"),
+)
+def poll_folder(_, client_token):
+    index = get_index(EXPERIMENT_BASE_PATH)
+    if get_watcher() is None:
+        index.refresh()
+    return push_experiments(index, client_token)
+
+@app.callback(
+    [Output("date-range-status", "children"),
+     Output("current-experiments", "data", allow_duplicate=True),
+     Output("experiments-version", "data", allow_duplicate=True)],
+    Input("experiment-date-range", "start_date"),
+    Input("experiment-date-range", "end_date"),
+    State("experiments-version", "data"),
+    prevent_initial_call=True,
 )
-def poll_folder(_, cur):
-    new = find_experiments(EXPERIMENT_BASE_PATH)
-    alert = None
-    if cur:
-        for typ, lst in new.items():
-            added = {e["name"] for e in lst} - {e["name"] for e in cur.get(typ, [])}
-            if added:
-                alert = dbc.Alert(
-                    f"New {experiment_modules[typ]['title']} experiment found: "
-                    f"{', '.join(sorted(added))}",
-                    color="info",
-                    dismissable=True,
-                    duration=10000,
-                )
-                break
-    return alert, new
+def widen_date_range(start, end, client_token):
+    """Backfill date folders outside the scan window once a range is picked."""
+    index = get_index(EXPERIMENT_BASE_PATH)
+    if start or end:
+        index.backfill(start, end)
+    _, data, token = push_experiments(index, client_token, announce=False)
+    older = max(0, len(index.loaded_dates()) - EXPERIMENT_SCAN_WINDOW) if EXPERIMENT_SCAN_WINDOW else 0
+    return date_range_status(older), data, token
 
 @app.callback(
     Output("debug-collapse", "is_open"),
@@ -435,6 +556,35 @@ def toggle_data_explore(n_clicks, is_open):
         return not is_open
     return is_open
 
+@app.callback(
+    Output("data-layer-stats", "children"),
+    Input("debug-collapse", "is_open"),
+)
+def show_data_layer_stats(is_open):
+    return data_layer_stats() if is_open else no_update
+
+@app.callback(
+    [Output("root-explore-tree", "children"),
+     Output("root-explore-more", "style")],
+    Input("root-explore-collapse", "is_open"),
+    Input("root-explore-more", "n_clicks"),
+)
+def load_root_tree(is_open, n_more):
+    if not is_open:
+        return no_update, no_update
+    return explorer_page(BASE, 1 + (n_more or 0))
+
+@app.callback(
+    [Output("data-explore-tree", "children"),
+     Output("data-explore-more", "style")],
+    Input("data-explore-collapse", "is_open"),
+    Input("data-explore-more", "n_clicks"),
+)
+def load_data_tree(is_open, n_more):
+    if not is_open:
+        return no_update, no_update
+    return explorer_page(os.path.join(BASE, "data"), 1 + (n_more or 0))
+
 @app.callback(
     [Output("experiment-type-dropdown", "options"),
      Output("experiment-type-dropdown", "value")],
@@ -456,57 +606,93 @@ def update_type_options(_, data, cur):
     return opts, cur if any(o["value"] == cur for o in opts) else None
 
 
+def _folder_option(e: dict, search: str = "") -> dict:
+    label = (
+        f"{e['name']} ({e['date_folder']} – "
+        f"{datetime.fromtimestamp(e['timestamp']).strftime('%H:%M:%S')})"
+    )
+    # server already matched the query → keep the option through the client filter
+    return dict(label=label, value=e["path"], search=f"{label} {search}")
+
+def _matches(e: dict, term: str) -> bool:
+    return (term in e["name"].lower() or term in e["date_folder"]
+            or term in datetime.fromtimestamp(e["timestamp"]).strftime("%H:%M:%S"))
+
+def _in_range(e: dict, start: str | None, end: str | None) -> bool:
+    key = date_key(e["date_folder"])
+    return not ((start and key < start[:10]) or (end and key > end[:10]))
+
+def search_experiments(typ: str, query: str | None, limit: int = FOLDER_OPTIONS_LIMIT,
+                       start: str | None = None, end: str | None = None) -> list[dict]:
+    """Newest ``limit`` runs of ``typ`` matching every word of ``query`` within [start, end]."""
+    terms = query.lower().split() if query else []
+    catalog = get_catalog()
+    if catalog is not None:
+        try:
+            return catalog.search(os.path.normpath(EXPERIMENT_BASE_PATH), typ, terms, limit,
+                                  start, end)
+        except Exception as e:
+            print(f"[main] catalog search failed, using index: {e}")
+    _, data = get_index(EXPERIMENT_BASE_PATH).snapshot()
+    hits = (e for e in data.get(typ, [])
+            if _in_range(e, start, end) and all(_matches(e, t) for t in terms))
+    return list(itertools.islice(hits, limit))
+
 @app.callback(
     [Output("experiment-folder-dropdown", "options"),
      Output("experiment-folder-dropdown", "disabled"),
      Output("experiment-folder-dropdown", "value")],
     Input("experiment-type-dropdown", "value"),
-    State("current-experiments", "data"),
+    Input("experiment-folder-dropdown", "search_value"),
+    Input("date-range-status", "children"),     # set once widen_date_range has backfilled
+    State("experiment-date-range", "start_date"),
+    State("experiment-date-range", "end_date"),
+    State("experiment-folder-dropdown", "value"),
 )
-def update_folder_options(typ, data):
-    if not typ or not data or typ not in data:
+def update_folder_options(typ, search, _, start, end, cur):
+    if not typ:
         return [], True, None
-    opts = [
-        dict(
-            label=(
-                f"{e['name']} ({e['date_folder']} – "
-                f"{datetime.fromtimestamp(e['timestamp']).strftime('%H:%M:%S')})"
-            ),
-            value=e["path"],
-        )
-        for e in data[typ]
-    ]
-    return opts, False, None
+    type_changed = ctx.triggered_id not in ("experiment-folder-dropdown", "date-range-status")
+    if type_changed:
+        search, cur = None, None
+
+    opts = [_folder_option(e, search or "")
+            for e in search_experiments(typ, search, start=start, end=end)]
+    if cur and all(o["value"] != cur for o in opts):   # keep the selection displayable
+        opts.insert(0, _folder_option(make_record(
+            cur, os.path.basename(cur), os.path.basename(os.path.dirname(cur))), search or ""))
+    prefetch_around(typ, [o["value"] for o in opts], cur)
+    if type_changed:
+        return opts, not opts, None
+    return opts, no_update, no_update
 
 
 @app.callback(
     Output("experiment-content", "children"),
     [Input("experiment-folder-dropdown", "value"),
      Input("experiment-type-dropdown", "value")],
+    State("experiment-folder-dropdown", "options"),
 )
-def display_experiment(path, typ):
+def display_experiment(path, typ, options):
     if not path or not typ:
         return html.Div(
             "Please select an experiment.",
             className="text-center text-muted mt-5",
         )
-    return experiment_modules[typ]["layout_func"](path)
+    if prefetcher is not None:
+        prefetcher.claim(path)              # drop / wait for a prefetch of this run
+    layout = load_layout(typ)(path)
+    prefetch_around(typ, [o["value"] for o in options or []], path)
+    return layout
 
 
 # ────────────────────────────────────────────────────────────────────
-# Register callbacks for each module (unchanged)
+# Register callbacks for each module (trampolines, modules load lazily)
 # ────────────────────────────────────────────────────────────────────
-register_tof_callbacks(app)
-register_res_callbacks(app)
-register_qspec_callbacks(app)
-register_prabi_callbacks(app)
-register_t1_callbacks(app)
-register_echo_callbacks(app)
-register_ramsey_callbacks(app)
-register_iq_callbacks(app)
-register_rpo_callbacks(app)
-register_drag_callbacks(app)
-register_rb_callbacks(app)
+for _typ in experiment_modules:
+    register_callbacks(app, _typ)
+if EXPERIMENT_PRELOAD:
+    preload()
 
 # ────────────────────────────────────────────────────────────────────
 # 4. Run
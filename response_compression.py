@@ -0,0 +1,154 @@
+# ======================================================================
+#  response_compression.py
+# ======================================================================
+"""
+gzip / brotli compression of the Dash server's responses
+========================================================
+* ``ResponseCompressor(encoding, level, min_bytes).install(server)`` adds
+  a Flask ``after_request`` hook that compresses callback results
+  (``/_dash-update-component``: layouts with their first figure, figure
+  JSON), the page and the JS / CSS bundles
+* Encoding : ``"br"`` (needs ``pip install brotli``), ``"gzip"`` (stdlib)
+  or ``"auto"`` → brotli if installed and accepted by the browser, else
+  gzip; the browser's ``Accept-Encoding`` always decides
+* Skipped  : bodies below ``min_bytes``, already encoded or streamed
+  responses (``send_file``), non‑text types (images, fonts)
+* Dash's component bundles (``ETag`` or fingerprinted, long ``max-age``)
+  are compressed once per version and encoding, then served from a small
+  cache
+* A compressed body gets its own validator: the ETag is suffixed with
+  the encoding (``"…-gz"`` / ``"…-br"``), so caches and ``If-None-Match``
+  never mix representations
+* ``stats()`` → bytes in / out, compression time and counts per encoding
+--------------------------------------------------------------------
+"""
+from __future__ import annotations
+import gzip, threading, time
+from collections import OrderedDict
+
+try:                                    # optional: pip install brotli
+    import brotli
+except ImportError:                     # pragma: no cover
+    brotli = None
+
+COMPRESSIBLE = ("text/", "application/json", "application/javascript",
+                "application/x-javascript", "image/svg+xml")
+# callback results are new bytes every time and float data barely compresses
+# beyond level 1 (gzip 6 costs ~5× the time for a few %); bundles are compressed
+# once, so they get a higher level
+DEFAULT_LEVEL = {"gzip": 1, "br": 1}
+BUNDLE_LEVEL = {"gzip": 6, "br": 6}
+STATIC_CACHE_ENTRIES = 32
+ETAG_SUFFIX = {"gzip": "gz", "br": "br"}
+
+
+def _compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=min(max(level, 1), 9), mtime=0)
+
+
+class ResponseCompressor:
+    """
+    Compress responses of at least ``min_bytes`` with ``encoding``.
+
+    ``level`` : compression level of responses (gzip 1–9, brotli 0–11;
+    None → 1); cached bundles always use ``BUNDLE_LEVEL``.
+    """
+
+    def __init__(self, encoding: str = "auto", level: int | None = None, min_bytes: int = 1400):
+        encoding = encoding.lower()
+        if encoding not in ("auto", "br", "gzip"):
+            raise ValueError(f"unknown response compression {encoding!r} (auto, br or gzip)")
+        if encoding == "br" and brotli is None:
+            print("[compression] brotli not installed – using gzip")
+            encoding = "gzip"
+        self.encodings = (["br"] if brotli is not None and encoding != "gzip" else []) + \
+                         (["gzip"] if encoding != "br" else [])
+        self.level = level
+        self.min_bytes = min_bytes
+        self._lock = threading.Lock()
+        self._static: OrderedDict = OrderedDict()      # (path, etag, encoding) → body
+        self._counts = {e: dict(responses=0, bytes_in=0, bytes_out=0, seconds=0.0)
+                        for e in self.encodings}
+        self.static_hits = self.skipped = 0
+
+    def install(self, server) -> "ResponseCompressor":
+        from flask import request
+
+        @server.after_request
+        def _compress_response(response):
+            return self.process(response, request)
+
+        return self
+
+    # ── per response ─────────────────────────────────────────────────
+    def _choose(self, request) -> str | None:
+        accepted = request.accept_encodings
+        for enc in self.encodings:
+            if accepted.quality(enc) > 0:
+                return enc
+        return None
+
+    def process(self, response, request):
+        if (response.direct_passthrough or response.is_streamed
+                or "Content-Encoding" in response.headers
+                or not 200 <= response.status_code < 300
+                or not (response.mimetype or "").startswith(COMPRESSIBLE)):
+            return response
+        response.vary.add("Accept-Encoding")
+        enc = self._choose(request)
+        if enc is None:
+            return response
+        body = response.get_data()
+        if len(body) < self.min_bytes:
+            with self._lock:
+                self.skipped += 1
+            return response
+
+        # bundles: an ETag, or a fingerprinted URL cached for a year → same bytes every time
+        etag, weak = response.get_etag()
+        if etag:
+            tag = f"{etag}-{ETAG_SUFFIX[enc]}"
+            if request.if_none_match.contains_weak(tag):    # browser has this encoding already
+                response.status_code = 304
+                response.set_data(b"")
+                response.set_etag(tag, weak)
+                response.headers.pop("Content-Length", None)
+                return response
+        key = (request.path, etag, enc) if etag or response.cache_control.max_age else None
+        with self._lock:
+            out = self._static.get(key) if key else None
+            if out is not None:
+                self._static.move_to_end(key)
+                self.static_hits += 1
+        if out is None:
+            t0 = time.perf_counter()
+            level = BUNDLE_LEVEL[enc] if key else \
+                self.level if self.level is not None else DEFAULT_LEVEL[enc]
+            out = _compress(body, enc, level)
+            dt = time.perf_counter() - t0
+            with self._lock:
+                c = self._counts[enc]
+                c["responses"] += 1
+                c["bytes_in"] += len(body)
+                c["bytes_out"] += len(out)
+                c["seconds"] += dt
+                if key:
+                    self._static[key] = out
+                    while len(self._static) > STATIC_CACHE_ENTRIES:
+                        self._static.popitem(last=False)
+
+        response.set_data(out)                  # also sets Content-Length
+        response.headers["Content-Encoding"] = enc
+        if etag:
+            response.set_etag(tag, weak)
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            per = {e: dict(c) for e, c in self._counts.items()}
+            total = {k: sum(c[k] for c in per.values()) for k in ("responses", "bytes_in",
+                                                                  "bytes_out", "seconds")}
+            return dict(total, encodings=per, static_hits=self.static_hits,
+                        skipped=self.skipped, level=self.level, min_bytes=self.min_bytes)
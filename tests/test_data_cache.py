@@ -0,0 +1,76 @@
+"""Loader result cache (``experiments/data_cache.py``)."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from experiments.data_cache import DatasetCache, cached_loader, dataset_cache   # noqa: E402
+
+
+def test_lru_is_bounded_by_bytes():
+    cache = DatasetCache(100)
+    cache.put("a", 1, 40)
+    cache.put("b", 2, 40)
+    assert cache.get("a") == 1                  # "a" is now the most recent
+    cache.put("c", 3, 40)                       # 120 > 100 → least recent ("b") goes
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["bytes"] == 80 and cache.stats()["evictions"] == 1
+
+
+def test_oversized_value_is_not_kept():
+    cache = DatasetCache(100)
+    cache.put("a", 1, 40)
+    cache.put("big", 2, 101)
+    assert cache.get("big") is None and cache.get("a") == 1
+
+
+def test_replacing_a_key_counts_its_bytes_once():
+    cache = DatasetCache(100)
+    cache.put("a", 1, 60)
+    cache.put("a", 2, 70)
+    assert cache.get("a") == 2 and cache.bytes == 70
+
+
+@pytest.fixture
+def loader(tmp_path):
+    dataset_cache.clear()
+    calls = []
+
+    @cached_loader
+    def load_x_data(folder, view="conf"):
+        calls.append(view)
+        data = (Path(folder) / "ds_fit.h5").read_bytes()
+        return dict(view=view, values=np.frombuffer(data, dtype=np.uint8)) if data else None
+
+    (tmp_path / "ds_fit.h5").write_bytes(b"\x01\x02")
+    yield load_x_data, calls, tmp_path
+    dataset_cache.clear()
+
+
+def test_hit_and_default_arguments_share_a_key(loader):
+    load, calls, folder = loader
+    first = load(folder)
+    assert load(str(folder), "conf") is not first         # a shallow copy …
+    assert load(folder, view="conf")["values"] is first["values"]   # … of the cached arrays
+    assert calls == ["conf"]
+    load(folder, "hist")
+    assert calls == ["conf", "hist"]
+
+
+def test_rewritten_file_is_a_miss_and_drops_the_old_entry(loader):
+    load, calls, folder = loader
+    load(folder)
+    (folder / "ds_fit.h5").write_bytes(b"\x01\x02\x03")   # new size → new folder signature
+    assert list(load(folder)["values"]) == [1, 2, 3]
+    assert calls == ["conf", "conf"]
+    assert dataset_cache.stats()["entries"] == 1
+
+
+def test_none_is_not_cached(loader):
+    load, calls, folder = loader
+    (folder / "ds_fit.h5").write_bytes(b"")
+    assert load(folder) is None and load(folder) is None
+    assert calls == ["conf", "conf"]
@@ -0,0 +1,126 @@
+"""SQLite experiment catalog (``experiment_catalog.py``)."""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from experiment_catalog import ExperimentCatalog        # noqa: E402
+from experiment_index import ExperimentIndex, make_record   # noqa: E402
+
+
+def make_run(base: Path, date: str, name: str, qubits=("q1",)) -> Path:
+    run = base / date / name
+    run.mkdir(parents=True)
+    (run / "ds_raw.h5").write_text("")
+    (run / "ds_fit.h5").write_text("")
+    (run / "node.json").write_text(json.dumps(dict(metadata=dict(
+        name=name.split("_", 1)[1], description=" a run ", run_start="s", run_end="e"))))
+    (run / "data.json").write_text(json.dumps(dict(fit_results={
+        q: dict(success=True, value=1.5) for q in qubits})))
+    return run
+
+
+def classify(name, path=None):
+    return "iq" if "iq" in name.lower() else None
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    cat = ExperimentCatalog(str(tmp_path / "catalog.sqlite3"))
+    yield cat
+    cat.close()
+
+
+def save(catalog, base: Path, runs):
+    """Store ``[(date, name, qubits)]`` in the catalog as the index would."""
+    entries = {}
+    for date, name, qubits in runs:
+        path = make_run(base, date, name, qubits)
+        entries.setdefault(date, (1, [], {}))[1].append(("iq", make_record(str(path), name, date)))
+    catalog.save_dates(str(base), entries)
+
+
+# ── persistence (user‑003) ──────────────────────────────────────────
+def test_index_restarts_from_the_catalog(tmp_path, catalog):
+    archive = tmp_path / "archive"
+    make_run(archive, "2025-06-24", "#3_iq_120000")
+    ExperimentIndex(str(archive), classify, catalog=catalog).refresh()
+
+    stored = catalog.load_dates(str(archive))
+    (mtime_ns, records, pending), = stored.values()
+    assert [(t, r["name"]) for t, r in records] == [("iq", "#3_iq_120000")]
+    assert pending == {}
+    restarted = ExperimentIndex(str(archive), classify, catalog=catalog)
+    assert [r["name"] for r in restarted.refresh()["iq"]] == ["#3_iq_120000"]
+
+
+def test_metadata_and_fit_results(tmp_path, catalog):
+    save(catalog, tmp_path, [("2025-06-24", "#3_iq_120000", ("q1", "q2"))])
+    row, = catalog.experiments(typ="iq")
+    assert (row["run_id"], row["node_name"], row["description"]) == (3, "iq_120000", "a run")
+    path = row["path"]
+    assert catalog.qubits(path) == ["q1", "q2"]
+    assert catalog.fit_results(path)["q2"] == {"success": True, "value": 1.5}
+    assert [r["name"] for r in catalog.experiments(qubit="q2")] == ["#3_iq_120000"]
+
+
+def test_removed_date_folder_is_dropped(tmp_path, catalog):
+    save(catalog, tmp_path, [("2025-06-24", "#3_iq_120000", ("q1",))])
+    catalog.save_dates(str(tmp_path), {}, removed=["2025-06-24"])
+    assert catalog.experiments() == []
+    assert catalog.load_dates(str(tmp_path)) == {}
+
+
+def test_classifier_change_resets_the_catalog(tmp_path):
+    db = str(tmp_path / "catalog.sqlite3")
+    cat = ExperimentCatalog(db, classifier="v1")
+    save(cat, tmp_path, [("2025-06-24", "#3_iq_120000", ("q1",))])
+    cat.close()
+    cat = ExperimentCatalog(db, classifier="v1")
+    assert len(cat.experiments()) == 1
+    cat.close()
+    cat = ExperimentCatalog(db, classifier="v2")
+    assert cat.experiments() == []
+    cat.close()
+
+
+# ── search (user‑006) ───────────────────────────────────────────────
+@pytest.fixture
+def searchable(tmp_path, catalog):
+    save(catalog, tmp_path, [
+        ("2025-06-20", "#1_iq_100%_100000", ("q1",)),
+        ("2025_06_23", "#2_iq_ab_110000", ("q2",)),
+        ("2025-06-24", "#3_iq_axb_120000", ("q1", "q3")),
+    ])
+    return lambda terms, **kw: [r["name"] for r in catalog.search(
+        str(tmp_path), "iq", terms, 10, **kw)]
+
+
+def test_search_is_newest_first_and_matches_every_term(searchable):
+    assert searchable([]) == ["#3_iq_axb_120000", "#2_iq_ab_110000", "#1_iq_100%_100000"]
+    assert searchable(["iq", "#3"]) == ["#3_iq_axb_120000"]
+    assert searchable(["q3"]) == ["#3_iq_axb_120000"]          # measured qubit
+    assert searchable(["11:00"]) == ["#2_iq_ab_110000"]        # HH:MM:SS of the run
+
+
+@pytest.mark.parametrize("term, expected", [
+    ("a_b", []),                                   # "_" is literal, not any character
+    ("_ab_", ["#2_iq_ab_110000"]),
+    ("100%", ["#1_iq_100%_100000"]),               # "%" is literal, not a wildcard
+    ("0%_1", ["#1_iq_100%_100000"]),
+    ("%", ["#1_iq_100%_100000"]),
+])
+def test_like_wildcards_are_escaped(searchable, term, expected):
+    assert searchable([term]) == expected
+
+
+@pytest.mark.parametrize("date_from, date_to, expected", [
+    ("2025-06-23", None, ["#3_iq_axb_120000", "#2_iq_ab_110000"]),
+    (None, "2025-06-23", ["#2_iq_ab_110000", "#1_iq_100%_100000"]),
+    ("2025-06-23", "2025-06-23T00:00:00", ["#2_iq_ab_110000"]),   # "_" date folder, inclusive
+    ("2025-06-21", "2025-06-22", []),
+])
+def test_search_date_range(searchable, date_from, date_to, expected):
+    assert searchable([], date_from=date_from, date_to=date_to) == expected
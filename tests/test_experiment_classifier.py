@@ -0,0 +1,34 @@
+"""Folder‑name classification (``experiment_classifier.py``)."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from experiment_classifier import ExperimentClassifier   # noqa: E402
+from experiments.registry import EXPERIMENTS             # noqa: E402
+
+classify = ExperimentClassifier(EXPERIMENTS)
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("#1101_IQ_blobs_120105", "iq"),
+    ("#1094_01b_time_of_flight_mw_fem_113139", "tof"),
+    ("#1099_readout_power_optimization_115238", "rpo"),
+    ("#1103_power_rabi_error_amplification_x90_120500", "prabi"),
+    ("#1106_T2echo_122028", "echo"),
+    ("#7_t1_relax", "t1"),
+    ("#8_tof", "tof"),
+])
+def test_patterns(name, expected):
+    assert classify(name) == expected
+
+
+@pytest.mark.parametrize("name", [
+    "#21_unique_thing",        # "iq"
+    "#3_stofler_run",          # "tof"
+    "#4_at1st_try",            # "t1"
+    "#5_irpo_x",               # "rpo"
+])
+def test_short_pattern_inside_a_word_is_no_match(name):
+    assert classify(name) is None
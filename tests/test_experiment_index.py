@@ -0,0 +1,102 @@
+"""Incremental archive index (``experiment_index.py``): tokens, deltas, backfill."""
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from experiment_index import ExperimentIndex   # noqa: E402
+
+
+def classify(name, path=None):
+    return "iq" if "iq" in name.lower() else "t1" if "t1" in name.lower() else None
+
+
+def make_run(base: Path, date: str, name: str, complete: bool = True) -> Path:
+    run = base / date / name
+    run.mkdir(parents=True)
+    for f in ("ds_raw.h5", "ds_fit.h5", "data.json", "node.json") if complete else ("node.json",):
+        (run / f).write_text("{}")
+    touch(base / date)
+    return run
+
+
+def touch(folder: Path):
+    """Move a folder's mtime forward (coarse‑mtime filesystems)."""
+    st = os.stat(folder)
+    os.utime(folder, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def archive(tmp_path):
+    make_run(tmp_path, "2025-06-20", "#1_iq_100000")
+    make_run(tmp_path, "2025-06-23", "#2_t1_110000")
+    make_run(tmp_path, "2025-06-24", "#3_iq_120000")
+    return tmp_path
+
+
+def names(data):
+    return {t: [r["name"] for r in lst] for t, lst in data.items()}
+
+
+def test_refresh_lists_complete_runs_newest_first(archive):
+    make_run(archive, "2025-06-24", "#4_iq_130000", complete=False)
+    data = ExperimentIndex(str(archive), classify).refresh()
+    assert names(data) == {"iq": ["#3_iq_120000", "#1_iq_100000"], "t1": ["#2_t1_110000"]}
+
+
+def test_token_is_the_same_in_every_process(archive):
+    a, b = ExperimentIndex(str(archive), classify), ExperimentIndex(str(archive), classify)
+    a.refresh(); b.refresh()
+    assert a.token == b.token
+    make_run(archive, "2025-06-24", "#4_iq_130000")
+    a.refresh()
+    assert a.token != b.token
+
+
+def test_sync_sends_the_net_delta(archive):
+    index = ExperimentIndex(str(archive), classify)
+    index.refresh()
+    token = index.token
+    assert index.sync(token)[2] == ([], [])
+
+    make_run(archive, "2025-06-24", "#4_iq_130000")
+    shutil.rmtree(archive / "2025-06-23" / "#2_t1_110000")
+    touch(archive / "2025-06-23")
+    index.refresh()
+    new_token, data, (added, removed) = index.sync(token)
+    assert new_token == index.token != token
+    assert [(t, r["name"]) for t, r in added] == [("iq", "#4_iq_130000")]
+    assert [(t, r["name"]) for t, r in removed] == [("t1", "#2_t1_110000")]
+    assert names(data) == {"iq": ["#4_iq_130000", "#3_iq_120000", "#1_iq_100000"]}
+
+
+def test_delta_served_by_another_process(archive):
+    a, b = ExperimentIndex(str(archive), classify), ExperimentIndex(str(archive), classify)
+    a.refresh(); b.refresh()
+    token = a.token
+    make_run(archive, "2025-06-24", "#4_iq_130000")
+    b.refresh()
+    _, _, (added, removed) = b.sync(token)
+    assert [r["name"] for _, r in added] == ["#4_iq_130000"] and removed == []
+
+
+@pytest.mark.parametrize("token", [None, "not-a-token"])
+def test_unknown_token_gets_full_data(archive, token):
+    index = ExperimentIndex(str(archive), classify)
+    index.refresh()
+    assert index.sync(token)[2] is None
+
+
+def test_window_and_backfill(archive):
+    index = ExperimentIndex(str(archive), classify, window=1)
+    assert names(index.refresh()) == {"iq": ["#3_iq_120000"]}
+
+    assert index.backfill("2025-06-22", "2025-06-23") == 1
+    assert index.loaded_dates() == ["2025-06-23", "2025-06-24"]
+    assert index.backfill("2025-06-22", "2025-06-23") == 0      # already loaded
+    assert index.backfill() == 1                                # open range → the rest
+    assert names(index.refresh()) == {"iq": ["#3_iq_120000", "#1_iq_100000"],
+                                      "t1": ["#2_t1_110000"]}
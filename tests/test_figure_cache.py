@@ -0,0 +1,86 @@
+"""Rendered‑figure cache (``experiments/figure_cache.py``)."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from experiments.figure_cache import cached_figure, figure_cache   # noqa: E402
+
+
+@pytest.fixture
+def plot(tmp_path):
+    figure_cache.clear()
+    calls = []
+
+    @cached_figure
+    def update_x_plot(view, page, store):
+        calls.append((view, page))
+        if view == "none":
+            return None
+        return go.Figure(go.Scatter(y=np.arange(3.0) * page), layout=dict(title=view))
+
+    (tmp_path / "ds_fit.h5").write_bytes(b"1")
+    yield update_x_plot, calls, {"folder": str(tmp_path)}
+    figure_cache.clear()
+
+
+def test_same_view_and_page_is_a_hit(plot):
+    update, calls, store = plot
+    miss = update("conf", 1, store)
+    hit = update("conf", 1, {"folder": store["folder"] + "/"})     # same folder, normalised
+    assert calls == [("conf", 1)]
+    assert hit == miss and hit["layout"]["title"]["text"] == "conf"
+
+
+@pytest.mark.parametrize("view, page", [("hist", 1), ("conf", 2)])
+def test_other_view_or_page_is_a_miss(plot, view, page):
+    update, calls, store = plot
+    update("conf", 1, store)
+    update(view, page, store)
+    assert calls == [("conf", 1), (view, page)]
+
+
+def test_rewritten_run_is_a_miss_and_drops_its_old_figures(plot, tmp_path):
+    update, calls, store = plot
+    update("conf", 1, store)
+    update("hist", 1, store)
+    (tmp_path / "ds_fit.h5").write_bytes(b"22")
+    update("conf", 1, store)
+    assert calls == [("conf", 1), ("hist", 1), ("conf", 1)]
+    assert figure_cache.stats()["entries"] == 1
+
+
+def test_functions_do_not_share_entries(plot):
+    update, calls, store = plot
+
+    @cached_figure
+    def update_y_plot(view, page, store):
+        return go.Figure(layout=dict(title="y"))
+
+    update("conf", 1, store)
+    assert update_y_plot("conf", 1, store)["layout"]["title"]["text"] == "y"
+
+
+@pytest.mark.parametrize("store", [None, {}, {"other": 1}])
+def test_without_a_folder_nothing_is_cached(plot, store):
+    update, calls, _ = plot
+    update("conf", 1, store)
+    update("conf", 1, store)
+    assert len(calls) == 2 and figure_cache.stats()["entries"] == 0
+
+
+def test_cache_can_be_switched_off(plot, monkeypatch):
+    update, calls, store = plot
+    monkeypatch.setattr(figure_cache, "max_bytes", 0)
+    update("conf", 1, store)
+    update("conf", 1, store)
+    assert len(calls) == 2 and figure_cache.stats()["entries"] == 0
+
+
+def test_non_figure_results_are_not_cached(plot):
+    update, calls, store = plot
+    assert update("none", 1, store) is None and update("none", 1, store) is None
+    assert len(calls) == 2
@@ -0,0 +1,93 @@
+"""Typed‑array figure JSON (``experiments/figure_json.py``)."""
+import base64
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from experiments import figure_json                                    # noqa: E402
+from experiments.figure_json import dumps, encode_arrays, typed_array   # noqa: E402
+
+
+def decode(spec) -> np.ndarray:
+    """What plotly.js reads back from a typed‑array dict."""
+    a = np.frombuffer(base64.b64decode(spec["bdata"]), dtype="<" + spec["dtype"])
+    if "shape" in spec:
+        a = a.reshape([int(n) for n in spec["shape"].split(",")])
+    return a
+
+
+def test_float64_within_tolerance_is_sent_as_float32():
+    a = np.linspace(-0.3, 0.7, 1001) * 1e-3             # mV‑scale shots
+    spec = typed_array(a)
+    assert spec["dtype"] == "f4"
+    span = a.max() - a.min()
+    assert np.abs(decode(spec) - a).max() <= figure_json.F32_TOLERANCE * span
+
+
+def test_float64_needing_precision_stays_float64():
+    a = 5e9 + np.arange(1000) * 1e3                     # GHz with kHz steps
+    spec = typed_array(a)
+    assert spec["dtype"] == "f8"
+    assert np.array_equal(decode(spec), a)
+
+
+def test_float32_can_be_switched_off(monkeypatch):
+    monkeypatch.setattr(figure_json, "FIGURE_FLOAT32", False)
+    assert typed_array(np.linspace(0, 1, 10))["dtype"] == "f8"
+
+
+def test_nan_and_inf_survive():
+    a = np.array([0.5, np.nan, np.inf, -1.25])
+    out = decode(typed_array(a))
+    assert np.array_equal(out, a, equal_nan=True)
+
+
+@pytest.mark.parametrize("values, dtype, name", [
+    ([-5, 5], "int64", "i1"),
+    ([0, 200], "int64", "i2"),
+    ([0, 200], "uint64", "u1"),
+    ([0, 70_000], "uint64", "u4"),
+    ([-40_000, 3], "int32", "i4"),
+])
+def test_integers_are_narrowed_exactly(values, dtype, name):
+    a = np.array(values, dtype=dtype)
+    spec = typed_array(a)
+    assert spec["dtype"] == name
+    assert np.array_equal(decode(spec), a)
+
+
+def test_integers_beyond_32_bit_stay_lists():
+    assert typed_array(np.array([0, 2**40])) == [0, 2**40]
+
+
+def test_big_endian_and_2d():
+    a = np.arange(6, dtype=">f4").reshape(2, 3)
+    spec = typed_array(a)
+    assert spec["shape"] == "2, 3"
+    assert np.array_equal(decode(spec), a)
+
+
+@pytest.mark.parametrize("a", [np.array([]), np.array([True, False]), np.array(["a", "b"])])
+def test_no_typed_form_gives_a_list(a):
+    assert typed_array(a) == a.tolist()
+
+
+def test_encode_arrays_keeps_ranges_plain():
+    fig = {"data": [{"x": np.arange(3.0), "marker": {"color": np.array([1, 2])}}],
+           "layout": {"xaxis": {"range": np.array([0.0, 1.0])}}}
+    encode_arrays(fig)
+    assert decode(fig["data"][0]["x"]).tolist() == [0.0, 1.0, 2.0]
+    assert decode(fig["data"][0]["marker"]["color"]).tolist() == [1, 2]
+    assert isinstance(fig["layout"]["xaxis"]["range"], np.ndarray)
+
+
+def test_dumps_round_trip():
+    fig = {"data": [{"type": "scatter", "y": np.array([1.5, 2.5]), "x": np.array([1, 2])}],
+           "layout": {"title": {"text": "t"}, "xaxis": {"range": np.array([0.0, 3.0])}}}
+    out = json.loads(dumps(fig))
+    assert decode(out["data"][0]["y"]).tolist() == [1.5, 2.5]
+    assert out["layout"]["xaxis"]["range"] == [0.0, 3.0]
@@ -0,0 +1,67 @@
+"""Plain‑dict subplot grids (``experiments/grid_figure.py``) against ``make_subplots``."""
+import sys
+from pathlib import Path
+
+import plotly.graph_objects as go
+import pytest
+from plotly.subplots import make_subplots
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from experiments.grid_figure import GridFigure   # noqa: E402
+
+GRIDS = [
+    dict(rows=1, cols=1),
+    dict(rows=3, cols=2, subplot_titles=["q1", "q2", "q3", "q4", "q5"]),
+    dict(rows=4, cols=2, vertical_spacing=0.05, horizontal_spacing=0.07,
+         subplot_titles=[f"q{i}" for i in range(8)]),
+    dict(rows=11, cols=2, vertical_spacing=0.02),
+    dict(rows=2, cols=5, horizontal_spacing=0.01),
+]
+
+
+def axes(layout: dict) -> dict:
+    return {k: (v["domain"], v["anchor"]) for k, v in layout.items()
+            if k.startswith(("xaxis", "yaxis"))}
+
+
+@pytest.mark.parametrize("grid", GRIDS)
+def test_domains_and_titles_match_make_subplots(grid):
+    ref = make_subplots(**grid).to_dict()["layout"]
+    ours = GridFigure(**grid).to_dict()["layout"]
+    assert axes(ours) == axes(ref)
+    assert ours.get("annotations", []) == ref.get("annotations", [])
+
+
+@pytest.mark.parametrize("rows, cols, kw", [
+    (3, 1, dict(vertical_spacing=0.6)),
+    (1, 3, dict(horizontal_spacing=-0.1)),
+])
+def test_spacing_limits_match_make_subplots(rows, cols, kw):
+    with pytest.raises(ValueError):
+        make_subplots(rows=rows, cols=cols, **kw)
+    with pytest.raises(ValueError):
+        GridFigure(rows=rows, cols=cols, **kw)
+
+
+def test_traces_lines_and_axes_match_go_figure():
+    ref = make_subplots(rows=1, cols=2)
+    ours = GridFigure(rows=1, cols=2)
+    for fig in (ref, ours):
+        trace = dict(type="scatter", x=[1, 2], y=[3, 4], marker_color="red")
+        fig.add_trace(go.Scatter(trace) if fig is ref else trace, row=1, col=2)
+        fig.add_vline(x=1.5, line=dict(color="black", dash="dash"), row=1, col=2)
+        fig.update_xaxes(title_text="I [mV]", row=1, col=2)
+        fig.update_layout(title="t", plot_bgcolor="red", paper_bgcolor="blue",
+                          title_font_size=12, template=None)
+    ref, ours = ref.to_dict(), ours.to_dict()
+    (r_tr,), (o_tr,) = ref["data"], ours["data"]
+    assert {k: o_tr[k] for k in ("xaxis", "yaxis", "marker")} == \
+           {k: r_tr[k] for k in ("xaxis", "yaxis", "marker")}
+    assert ours["layout"]["shapes"] == ref["layout"]["shapes"]
+    for key in ("xaxis2", "title", "plot_bgcolor", "paper_bgcolor"):
+        assert ours["layout"][key] == ref["layout"][key]
+
+
+def test_cell_outside_the_grid():
+    with pytest.raises(ValueError):
+        GridFigure(rows=2, cols=2).add_trace(dict(type="scatter"), row=3, col=1)
@@ -0,0 +1,60 @@
+"""Key‑selective JSON access (``experiments/metadata.py``)."""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from experiments.metadata import json_get, json_select, metadata_stats   # noqa: E402
+
+
+def parses() -> int:
+    return metadata_stats()["parses"]
+
+
+@pytest.fixture
+def data_json(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(dict(fit_results=dict(q1=dict(success=True, cm=[[1, 0], [0, 1]])),
+                                    qubits=["q1", "q2"])))
+    return path
+
+
+def test_select_parses_once_and_hits_afterwards(data_json):
+    n = parses()
+    assert json_select(data_json, ("fit_results", "q1", "success"), ("qubits", -1)) == [True, "q2"]
+    assert parses() == n + 1
+    assert json_get(data_json, "qubits", -1) == "q2"
+    assert parses() == n + 1
+
+
+@pytest.mark.parametrize("keys", [("fit_results", "q9"), ("qubits", 5), ("qubits", "x"),
+                                  ("fit_results", "q1", "cm", 0, 0, "deeper")])
+def test_missing_keys_give_the_default(data_json, keys):
+    assert json_get(data_json, *keys, default="none") == "none"
+
+
+def test_rewritten_file_is_parsed_again(data_json):
+    assert json_get(data_json, "qubits") == ["q1", "q2"]
+    data_json.write_text(json.dumps(dict(qubits=["q1", "q2", "q3"])))     # new size
+    assert json_get(data_json, "qubits") == ["q1", "q2", "q3"]
+
+
+def test_same_size_new_mtime_is_parsed_again(data_json):
+    assert json_get(data_json, "qubits") == ["q1", "q2"]
+    st = os.stat(data_json)
+    data_json.write_text(data_json.read_text().replace('"q2"', '"q7"'))    # same size
+    os.utime(data_json, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    n = parses()
+    assert json_get(data_json, "qubits") == ["q1", "q7"]
+    assert parses() == n + 1
+
+
+def test_unreadable_file_raises(tmp_path):
+    with pytest.raises(OSError):
+        json_get(tmp_path / "missing.json", "a")
+    (tmp_path / "bad.json").write_text("{")
+    with pytest.raises(ValueError):
+        json_get(tmp_path / "bad.json", "a")